@@ -5,10 +5,17 @@ Script for loading, processing, and validating data.
 Provides functions for ETL pipeline and data operations.
 """
 
+import os
+import glob
+import json
+import hashlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union, Iterable, Iterator, Callable
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,17 +25,117 @@ logger = logging.getLogger(__name__)
 # DATA LOADING
 # ============================================================================
 
+def _csv_cache_path(
+    filepath: Path,
+    cache_dir: Optional[Union[str, Path]],
+    read_options: Dict
+) -> Path:
+    """
+    Build the Arrow sidecar path for a CSV file.
+    
+    The name is <stem>.<path key>.<version key>.<options key>.feather. The
+    path key (resolved path) keeps same-named files of different directories
+    apart in a shared cache_dir; the version key (mtime, size) and options
+    key make a changed file or different parsing miss the cache.
+    """
+    def digest(value) -> str:
+        return hashlib.sha256(
+            json.dumps(value, sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+    
+    stat = filepath.stat()
+    path_key = digest(str(filepath.resolve()))
+    version_key = digest({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size})
+    options_key = digest(read_options)
+    
+    cache_dir = Path(cache_dir) if cache_dir is not None else filepath.parent / '.cache'
+    return cache_dir / f'{filepath.stem}.{path_key}.{version_key}.{options_key}.feather'
+
+
+def _read_csv_cached(
+    filepath: Path,
+    parse_dates: Optional[List[str]],
+    columns: Optional[List[str]],
+    cache_dir: Optional[Union[str, Path]],
+    **kwargs
+) -> Optional[pd.DataFrame]:
+    """
+    Read a CSV through its Arrow sidecar, creating the sidecar on first use.
+    
+    Returns None when the cache cannot be used (pyarrow missing or read
+    options that do not produce a plain RangeIndex frame). If the sidecar
+    cannot be written (read-only directory, disk full) the frame parsed from
+    the CSV is returned and the next call parses again.
+    
+    Cache hits skip CSV and date parsing; the sidecar is memory-mapped and
+    its columns are copied once into the returned DataFrame.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        logger.warning("pyarrow not installed, CSV cache disabled. Install with: pip install pyarrow")
+        return None
+    
+    if any(opt in kwargs for opt in ('index_col', 'chunksize', 'iterator')):
+        logger.debug("CSV cache skipped for index/chunked reads")
+        return None
+    
+    cache_path = _csv_cache_path(filepath, cache_dir, {'parse_dates': parse_dates, **kwargs})
+    
+    if not cache_path.exists():
+        df = pd.read_csv(filepath, parse_dates=parse_dates, **kwargs)
+        tmp_path = cache_path.with_suffix('.tmp')
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Drop sidecars of older versions of this exact file; sidecars of
+            # other read options and of other files are left alone
+            file_prefix, version_key, _, _ = cache_path.name.rsplit('.', 3)
+            for stale in cache_path.parent.glob(f'{glob.escape(file_prefix)}.*.*.feather'):
+                if stale.name.rsplit('.', 3)[1] != version_key:
+                    stale.unlink(missing_ok=True)
+            
+            # Uncompressed so the sidecar can be memory-mapped on later reads
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+            logger.info(f"CSV cache written to {cache_path}")
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"CSV cache not written to {cache_path}: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        
+        return df[columns] if columns is not None else df
+    
+    table = feather.read_table(cache_path, columns=columns, memory_map=True)
+    logger.info(f"Loaded from CSV cache {cache_path}")
+    return table.to_pandas()
+
+
 def load_csv_data(
     filepath: Union[str, Path],
     parse_dates: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    use_cache: bool = False,
+    cache_dir: Optional[Union[str, Path]] = None,
     **kwargs
 ) -> pd.DataFrame:
     """
     Load CSV file with standard options.
     
+    With use_cache=True the parsed frame (dates included) is written to an
+    Arrow/Feather sidecar on first load, keyed by path, mtime, size and read
+    options; later calls read the memory-mapped sidecar instead of re-parsing
+    the CSV (its columns are still copied once into the returned frame).
+    
     Args:
         filepath: Path to CSV file
         parse_dates: Columns to parse as datetime
+        columns: Only return these columns (read from the sidecar when cached)
+        use_cache: Read through the Arrow sidecar cache
+        cache_dir: Sidecar directory (default: .cache/ next to the CSV)
         **kwargs: Additional arguments for pd.read_csv
     
     Returns:
@@ -36,7 +143,18 @@ def load_csv_data(
     """
     logger.info(f"Loading data from {filepath}")
     
-    df = pd.read_csv(filepath, parse_dates=parse_dates, **kwargs)
+    df = None
+    if use_cache:
+        df = _read_csv_cached(Path(filepath), parse_dates, columns, cache_dir, **kwargs)
+    
+    if df is None:
+        if columns is not None:
+            kwargs['usecols'] = columns
+            if parse_dates is not None:
+                parse_dates = [col for col in parse_dates if col in columns]
+        df = pd.read_csv(filepath, parse_dates=parse_dates, **kwargs)
+        if columns is not None:
+            df = df[columns]
     
     logger.info(f"Data loaded successfully: {df.shape}")
     return df
@@ -44,28 +162,124 @@ def load_csv_data(
 
 def load_multiple_csv_files(
     directory: Union[str, Path],
-    pattern: str = "*.csv"
-) -> Dict[str, pd.DataFrame]:
+    pattern: str = "*.csv",
+    n_workers: int = 1,
+    executor: str = 'thread',
+    max_in_flight: Optional[int] = None,
+    concat: bool = False,
+    source_col: str = 'source',
+    **kwargs
+) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
     """
     Load multiple CSV files from a directory.
     
+    With n_workers > 1 files are parsed concurrently in a thread or process
+    pool. At most max_in_flight files are being read at any time, which bounds
+    peak memory when a directory holds many large exports.
+    
     Args:
         directory: Directory containing CSV files
         pattern: File pattern to match (default: all .csv files)
+        n_workers: Number of parallel workers (1 = sequential)
+        executor: 'thread' or 'process'
+        max_in_flight: Maximum files being read at once (default: n_workers)
+        concat: Return one DataFrame with a source column instead of a dict
+        source_col: Name of the source column when concat=True
+        **kwargs: Additional arguments for load_csv_data
     
     Returns:
-        Dictionary with filename (without extension) as key
+        Dictionary with filename (without extension) as key, or a single
+        concatenated DataFrame when concat=True
     """
     directory = Path(directory)
     files = sorted(directory.glob(pattern))
     
     data_dict = {}
-    for filepath in files:
-        name = filepath.stem
-        data_dict[name] = load_csv_data(filepath)
-        logger.info(f"Loaded {name}: {data_dict[name].shape}")
+    if n_workers <= 1:
+        for filepath in files:
+            name = filepath.stem
+            data_dict[name] = load_csv_data(filepath, **kwargs)
+            logger.info(f"Loaded {name}: {data_dict[name].shape}")
+    else:
+        if executor == 'thread':
+            pool_cls = ThreadPoolExecutor
+        elif executor == 'process':
+            pool_cls = ProcessPoolExecutor
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+        
+        max_in_flight = max(max_in_flight or n_workers, 1)
+        file_iter = iter(files)
+        
+        with pool_cls(max_workers=n_workers) as pool:
+            pending = {}
+            
+            def submit_next() -> None:
+                filepath = next(file_iter, None)
+                if filepath is not None:
+                    pending[pool.submit(load_csv_data, filepath, **kwargs)] = filepath.stem
+            
+            for _ in range(max_in_flight):
+                submit_next()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    data_dict[name] = future.result()
+                    logger.info(f"Loaded {name}: {data_dict[name].shape}")
+                    submit_next()
+        
+        # Keep file order regardless of completion order
+        data_dict = {filepath.stem: data_dict[filepath.stem] for filepath in files}
+    
+    if not concat:
+        return data_dict
+    
+    names = list(data_dict.keys())
+    lengths = [len(df) for df in data_dict.values()]
+    combined = pd.concat(data_dict.values(), ignore_index=True) if names else pd.DataFrame()
+    combined[source_col] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(names)), lengths), categories=names
+    )
+    
+    logger.info(f"Concatenated {len(names)} files: {combined.shape}")
+    return combined
+
+
+def iter_csv_chunks(
+    filepath: Union[str, Path],
+    chunksize: int = 100_000,
+    parse_dates: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV file in fixed-size chunks.
+    
+    The row index continues across chunks, so indices reported by the
+    chunk-aware functions refer to row positions in the whole file.
+    
+    Args:
+        filepath: Path to CSV file
+        chunksize: Rows per chunk
+        parse_dates: Columns to parse as datetime
+        columns: Only read these columns
+        **kwargs: Additional arguments for pd.read_csv
+    
+    Yields:
+        DataFrame chunks
+    """
+    logger.info(f"Streaming data from {filepath} in chunks of {chunksize}")
     
-    return data_dict
+    if columns is not None:
+        kwargs['usecols'] = columns
+        if parse_dates is not None:
+            parse_dates = [col for col in parse_dates if col in columns]
+    
+    with pd.read_csv(filepath, parse_dates=parse_dates, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield chunk[columns] if columns is not None else chunk
 
 
 # ============================================================================
@@ -279,9 +493,14 @@ def create_temporal_features(
     if features is None:
         features = list(all_features.keys())
     
+    # Evaluate on distinct timestamps only and broadcast back by position,
+    # so panel data (segments x dates) costs O(unique timestamps)
+    codes, uniques = pd.factorize(df[datetime_col], use_na_sentinel=False)
+    timestamps = pd.Series(uniques)
+    
     for feature in features:
         if feature in all_features:
-            df[feature] = all_features[feature](df[datetime_col])
+            df[feature] = all_features[feature](timestamps).array.take(codes)
     
     logger.info(f"Created {len(features)} temporal features")
     return df
@@ -413,25 +632,305 @@ def create_train_test_split(
     return train_df, val_df, test_df
 
 
+# ============================================================================
+# CHUNKED (OUT-OF-CORE) PROCESSING
+# ============================================================================
+
+class StreamingQuantiles:
+    """
+    Mergeable quantile sketch for columns that do not fit in memory.
+    
+    Exact (same as pandas' linear quantile) until more than `capacity` values
+    have been seen; after that, full levels are compacted KLL-style so memory
+    stays O(capacity * log n) with a rank error of roughly 1 / capacity.
+    """
+    
+    def __init__(self, capacity: int = 65536):
+        """
+        Initialize empty sketch.
+        
+        Args:
+            capacity: Values kept per level before compaction
+        """
+        self.capacity = capacity
+        self.levels = [np.empty(0)]  # items at level i carry weight 2**i
+        self.count = 0
+        self._offset = 0
+    
+    def update(self, values: Union[np.ndarray, pd.Series]) -> 'StreamingQuantiles':
+        """
+        Add values (NaN ignored).
+        
+        Args:
+            values: New observations
+        
+        Returns:
+            Self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        
+        level = 0
+        while len(self.levels[level]) > self.capacity:
+            items = np.sort(self.levels[level])
+            carry = items[len(items) - len(items) % 2:]
+            items = items[:len(items) - len(items) % 2]
+            
+            # Keep every other item at double weight (alternate offsets)
+            promoted = items[self._offset::2]
+            self._offset ^= 1
+            
+            self.levels[level] = carry
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+        
+        return self
+    
+    def quantile(self, q: Union[float, List[float]]) -> Union[float, np.ndarray]:
+        """
+        Estimate quantiles with linear interpolation.
+        
+        Args:
+            q: Quantile or list of quantiles in [0, 1]
+        
+        Returns:
+            Quantile value(s) (NaN if no values were seen)
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2.0 ** i) for i, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        
+        # Centre rank of each item; equals 0..n-1 while the sketch is exact
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        result = np.interp(np.asarray(q) * (self.count - 1), ranks, values)
+        return float(result) if np.ndim(q) == 0 else result
+
+
+def check_missing_values_chunked(chunks: Iterable[pd.DataFrame]) -> Dict[str, float]:
+    """
+    Chunk-aware version of check_missing_values.
+    
+    Args:
+        chunks: Iterable of DataFrame chunks (e.g. from iter_csv_chunks)
+    
+    Returns:
+        Dictionary with column names and missing percentages
+    """
+    missing_counts = None
+    n_rows = 0
+    
+    for chunk in chunks:
+        counts = chunk.isnull().sum()
+        missing_counts = counts if missing_counts is None else missing_counts.add(counts, fill_value=0)
+        n_rows += len(chunk)
+    
+    if missing_counts is None or n_rows == 0:
+        return {}
+    
+    missing_pct = (missing_counts / n_rows * 100).round(2)
+    return missing_pct[missing_pct > 0].to_dict()
+
+
+def _row_hashes(chunk: pd.DataFrame, subset: Optional[List[str]]) -> np.ndarray:
+    """64-bit hash per row, used to find duplicates across chunks."""
+    frame = chunk[subset] if subset is not None else chunk
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def detect_duplicates_chunked(
+    chunk_source: Callable[[], Iterable[pd.DataFrame]],
+    subset: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Chunk-aware version of detect_duplicates (two passes over the data).
+    
+    Args:
+        chunk_source: Callable returning a fresh iterable of chunks
+        subset: Columns to consider for duplicates
+    
+    Returns:
+        DataFrame containing all duplicate rows
+    """
+    # Pass 1: find hashes seen more than once
+    seen = np.empty(0, dtype=np.uint64)
+    duplicated = np.empty(0, dtype=np.uint64)
+    for chunk in chunk_source():
+        hashes = _row_hashes(chunk, subset)
+        repeated = np.concatenate([
+            hashes[pd.Series(hashes).duplicated().to_numpy()],
+            hashes[np.isin(hashes, seen)]
+        ])
+        duplicated = np.union1d(duplicated, repeated)
+        seen = np.union1d(seen, hashes)
+    del seen
+    
+    # Pass 2: collect the rows
+    parts = [
+        chunk[np.isin(_row_hashes(chunk, subset), duplicated)]
+        for chunk in chunk_source()
+    ]
+    duplicates = pd.concat(parts) if parts else pd.DataFrame()
+    
+    logger.info(f"Found {len(duplicates)} duplicate rows")
+    return duplicates
+
+
+def remove_duplicates_chunked(
+    chunks: Iterable[pd.DataFrame],
+    subset: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Chunk-aware version of remove_duplicates (keep='first').
+    
+    Only row hashes are kept between chunks, not the rows themselves.
+    
+    Args:
+        chunks: Iterable of DataFrame chunks
+        subset: Columns to consider for duplicates
+    
+    Yields:
+        Chunks without rows already seen earlier in the stream
+    """
+    seen = np.empty(0, dtype=np.uint64)
+    n_removed = 0
+    
+    for chunk in chunks:
+        hashes = _row_hashes(chunk, subset)
+        keep = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, seen)
+        seen = np.union1d(seen, hashes[keep])
+        n_removed += int((~keep).sum())
+        yield chunk[keep]
+    
+    logger.info(f"Removed {n_removed} duplicate rows")
+
+
+def detect_outliers_chunked(
+    chunk_source: Callable[[], Iterable[pd.DataFrame]],
+    method: str = 'iqr',
+    multiplier: float = 1.5,
+    columns: Optional[List[str]] = None,
+    capacity: int = 65536
+) -> Dict[str, list]:
+    """
+    Chunk-aware version of detect_outliers (two passes over the data).
+    
+    The first pass accumulates quantile sketches (iqr) or running moments
+    (zscore); the second collects outlier indices.
+    
+    Args:
+        chunk_source: Callable returning a fresh iterable of chunks
+        method: 'iqr' or 'zscore'
+        multiplier: IQR multiplier (1.5 standard)
+        columns: Columns to check (default: all numeric)
+        capacity: Quantile sketch capacity (exact below this many rows)
+    
+    Returns:
+        Dictionary with column names and outlier indices
+    """
+    # Pass 1: running statistics
+    sketches, moments = {}, {}
+    for chunk in chunk_source():
+        if columns is None:
+            columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+        for col in columns:
+            if method == 'iqr':
+                sketches.setdefault(col, StreamingQuantiles(capacity)).update(chunk[col])
+            elif method == 'zscore':
+                # Chan et al. parallel merge of (count, mean, M2)
+                values = chunk[col].dropna().to_numpy(dtype=np.float64)
+                if len(values) == 0:
+                    continue
+                n_a, mean_a, m2_a = moments.get(col, (0, 0.0, 0.0))
+                n_b, mean_b = len(values), values.mean()
+                m2_b = ((values - mean_b) ** 2).sum()
+                n = n_a + n_b
+                delta = mean_b - mean_a
+                moments[col] = (
+                    n,
+                    mean_a + delta * n_b / n,
+                    m2_a + m2_b + delta ** 2 * n_a * n_b / n
+                )
+    
+    bounds = {}
+    for col in columns or []:
+        if method == 'iqr':
+            Q1, Q3 = sketches[col].quantile([0.25, 0.75])
+            IQR = Q3 - Q1
+            bounds[col] = (Q1 - multiplier * IQR, Q3 + multiplier * IQR)
+        elif method == 'zscore':
+            n, mean, m2 = moments.get(col, (0, np.nan, np.nan))
+            std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+            bounds[col] = (mean - 3 * std, mean + 3 * std)
+    
+    # Pass 2: outlier indices
+    outliers_dict = {col: [] for col in columns or []}
+    for chunk in chunk_source():
+        for col, (lower, upper) in bounds.items():
+            outlier_mask = (chunk[col] < lower) | (chunk[col] > upper)
+            outliers_dict[col].extend(chunk.index[outlier_mask].tolist())
+    
+    for col, indices in outliers_dict.items():
+        logger.info(f"Found {len(indices)} outliers in {col}")
+    
+    return outliers_dict
+
+
 # ============================================================================
 # EXPORT & SAVING
 # ============================================================================
 
+def _partition_dir(root: Path, year: int, month: int) -> Path:
+    """Hive-style year/month partition directory under root."""
+    return root / f"year={year:04d}" / f"month={month:02d}"
+
+
 def save_data(
     df: pd.DataFrame,
     filepath: str,
     format: str = 'csv',
+    partition_col: Optional[str] = None,
+    mode: str = 'overwrite',
     **kwargs
 ) -> None:
     """
     Save DataFrame to file.
     
+    With format='parquet' and partition_col set, filepath is treated as a
+    dataset directory laid out as year=YYYY/month=MM/data.parquet. Only the
+    partitions present in df are written; in mode='append' rows of existing
+    partitions are kept, except rows for dates that df re-delivers, which
+    are replaced. Each partition is written to a temporary file and renamed
+    into place, so readers never see a half-written partition; in
+    mode='overwrite' partitions absent from df are removed only after all
+    new partitions are written. Rows without a partition_col date raise a
+    ValueError before anything is written.
+    
     Args:
         df: DataFrame to save
-        filepath: Output file path
+        filepath: Output file path (dataset directory when partitioned)
         format: 'csv', 'parquet', or 'json'
+        partition_col: Datetime column to partition by (parquet only)
+        mode: 'overwrite' or 'append' (partitioned parquet only)
         **kwargs: Additional arguments for save function
     """
+    if partition_col is not None:
+        if format != 'parquet':
+            raise ValueError("Partitioned output is only supported for format='parquet'")
+        if mode not in ('overwrite', 'append'):
+            raise ValueError(f"Unknown mode: {mode}")
+        _save_partitioned(df, Path(filepath), partition_col, mode, **kwargs)
+        return
+    
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
     
     if format == 'csv':
@@ -444,6 +943,111 @@ def save_data(
     logger.info(f"Data saved to {filepath}")
 
 
+def _save_partitioned(
+    df: pd.DataFrame,
+    root: Path,
+    partition_col: str,
+    mode: str,
+    **kwargs
+) -> None:
+    """Write df into year/month partitions under root (see save_data)."""
+    dates = pd.to_datetime(df[partition_col])
+    if dates.isna().any():
+        raise ValueError(
+            f"{int(dates.isna().sum())} rows have no {partition_col} and cannot be "
+            f"assigned to a partition; drop or fill them before saving"
+        )
+    root.mkdir(parents=True, exist_ok=True)
+    
+    written = set()
+    groups = df.groupby([dates.dt.year, dates.dt.month], sort=True)
+    for (year, month), part in groups:
+        part_dir = _partition_dir(root, int(year), int(month))
+        part_dir.mkdir(parents=True, exist_ok=True)
+        target = part_dir / "data.parquet"
+        
+        if mode == 'append' and target.exists():
+            existing = pd.read_parquet(target)
+            new_days = pd.to_datetime(part[partition_col]).dt.normalize().unique()
+            keep = ~pd.to_datetime(existing[partition_col]).dt.normalize().isin(new_days)
+            part = pd.concat([existing[keep.to_numpy()], part], ignore_index=True)
+        
+        part = part.sort_values(partition_col, kind='stable').reset_index(drop=True)
+        tmp = part_dir / f".data.parquet.{os.getpid()}.tmp"
+        part.to_parquet(tmp, index=False, **kwargs)
+        os.replace(tmp, target)
+        written.add(target)
+    
+    # Old partitions df does not cover go only once every new one is in place,
+    # so a failed overwrite leaves the previous data rather than a gap
+    if mode == 'overwrite':
+        for old in root.glob("year=*/month=*/data.parquet"):
+            if old not in written:
+                old.unlink()
+    
+    logger.info(f"Data saved to {root} ({groups.ngroups} partitions, mode={mode})")
+
+
+def load_partitioned_data(
+    directory: str,
+    date_col: str = 'date',
+    start: Optional[Union[str, pd.Timestamp]] = None,
+    end: Optional[Union[str, pd.Timestamp]] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Load a dataset written by save_data(..., partition_col=...).
+    
+    Partitions whose month lies entirely outside [start, end] are skipped
+    without being opened; rows of the boundary months are then filtered.
+    
+    Args:
+        directory: Dataset directory
+        date_col: Datetime column the dataset was partitioned by
+        start: Inclusive lower bound (None for unbounded)
+        end: Inclusive upper bound (None for unbounded)
+        columns: Subset of columns to read
+    
+    Returns:
+        DataFrame sorted by date_col
+    """
+    root = Path(directory)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns) + ([date_col] if date_col not in columns else [])
+    
+    frames = []
+    for path in sorted(root.glob("year=*/month=*/data.parquet")):
+        year = int(path.parent.parent.name.split('=')[1])
+        month = int(path.parent.name.split('=')[1])
+        month_start = pd.Timestamp(year=year, month=month, day=1)
+        month_end = month_start + pd.offsets.MonthBegin(1)
+        if start is not None and month_end <= start:
+            continue
+        if end is not None and month_start > end:
+            continue
+        frames.append(pd.read_parquet(path, columns=read_columns))
+    
+    if not frames:
+        raise FileNotFoundError(f"No partitions in {directory} match the requested range")
+    
+    df = pd.concat(frames, ignore_index=True)
+    dates = pd.to_datetime(df[date_col])
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (dates >= start).to_numpy()
+    if end is not None:
+        mask &= (dates <= end).to_numpy()
+    df = df[mask].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    
+    logger.info(f"Loaded {len(df)} rows from {len(frames)} partitions of {directory}")
+    return df
+
+
 if __name__ == "__main__":
     # Example usage
     print("Data loading and processing module loaded successfully")
@@ -9,12 +9,17 @@ Datasets:
 - Bangkok Weather Data (temperature, humidity, precipitation)
 """
 
+import os
+import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union, Iterable, Iterator, Callable
 from pathlib import Path
 import logging
 
+from calendar_table import calendar_lookup
+from rolling_stats import rolling_window_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,10 +27,40 @@ logger = logging.getLogger(__name__)
 # TRAFFIC DATA PREPROCESSING
 # ============================================================================
 
+# Season by month used for traffic data (Thailand: Dry, Rainy, Cool)
+TRAFFIC_SEASONS = {
+    3: 'dry', 4: 'dry', 5: 'dry', 6: 'rainy', 7: 'rainy', 8: 'rainy',
+    9: 'rainy', 10: 'rainy', 11: 'cool', 12: 'cool', 1: 'cool', 2: 'cool'
+}
+
+
+def _add_traffic_calendar_features(
+    df: pd.DataFrame,
+    datetime_col: str,
+    holidays: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Add date parts, holiday flag and season (shared by in-memory and chunked paths)."""
+    # Create temporal features
+    df['year'] = df[datetime_col].dt.year
+    df['month'] = df[datetime_col].dt.month
+    df['day'] = df[datetime_col].dt.day
+    df['dayofweek'] = df[datetime_col].dt.dayofweek
+    df['is_weekend'] = df['dayofweek'].isin([5, 6]).astype(int)
+    
+    # Bangkok holidays and season from the calendar table (vectorised lookup)
+    calendar = calendar_lookup(df[datetime_col], ['is_holiday', 'season'],
+                               holidays=holidays, season_by_month=TRAFFIC_SEASONS)
+    df['is_holiday'] = calendar['is_holiday']
+    df['season'] = calendar['season']
+    
+    return df
+
+
 def preprocess_traffic_data(
     df: pd.DataFrame,
     datetime_col: str = 'date',
-    congestion_col: str = 'congestion_index'
+    congestion_col: str = 'congestion_index',
+    holidays: Optional[pd.DataFrame] = None
 ) -> pd.DataFrame:
     """
     Preprocess Bangkok traffic congestion data.
@@ -34,6 +69,8 @@ def preprocess_traffic_data(
         df: Raw traffic DataFrame
         datetime_col: Name of datetime column
         congestion_col: Name of congestion index column
+        holidays: Dated holiday list from calendar_table.load_thai_holidays
+            (None for the fixed-date holidays)
     
     Returns:
         Preprocessed DataFrame
@@ -60,43 +97,125 @@ def preprocess_traffic_data(
     outlier_count = df['is_outlier'].sum()
     logger.info(f"Identified {outlier_count} outliers in traffic data")
     
-    # Create temporal features
-    df['year'] = df[datetime_col].dt.year
-    df['month'] = df[datetime_col].dt.month
-    df['day'] = df[datetime_col].dt.day
-    df['dayofweek'] = df[datetime_col].dt.dayofweek
-    df['is_weekend'] = df['dayofweek'].isin([5, 6]).astype(int)
-    
-    # Bangkok holidays (simplified)
-    holidays = {
-        (1, 1): 'New Year',
-        (4, 13): 'Songkran',
-        (4, 14): 'Songkran',
-        (4, 15): 'Songkran',
-        (5, 1): 'Labour Day',
-        (12, 5): 'King Birthday',
-        (12, 31): 'New Year Eve'
-    }
-    df['is_holiday'] = df.apply(
-        lambda x: (x['month'], x['day']) in holidays,
-        axis=1
-    ).astype(int)
-    
-    # Season (Thailand: Dry, Rainy, Cool)
-    def get_season(month):
-        if month in [3, 4, 5]:
-            return 'dry'
-        elif month in [6, 7, 8, 9, 10]:
-            return 'rainy'
-        else:
-            return 'cool'
-    
-    df['season'] = df['month'].apply(get_season)
+    df = _add_traffic_calendar_features(df, datetime_col, holidays)
     
     logger.info(f"Traffic data preprocessed: {df.shape}")
     return df
 
 
+def _interpolate_chunks(
+    chunks: Iterable[pd.DataFrame],
+    datetime_col: str,
+    congestion_col: str,
+    limit: int = 7
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream linear interpolation that matches interpolating the full series.
+    
+    Rows after the last valid value of a chunk are held back (together with
+    that value as left context) until the next valid value arrives, so gaps
+    spanning chunk boundaries are filled exactly as in memory.
+    """
+    carry = None          # held-back rows, first one already emitted if n_context
+    n_context = 0
+    last_timestamp = None
+    
+    for chunk in chunks:
+        chunk = chunk.copy()
+        chunk[datetime_col] = pd.to_datetime(chunk[datetime_col])
+        if len(chunk) == 0:
+            continue
+        
+        timestamps = chunk[datetime_col]
+        if not timestamps.is_monotonic_increasing or (
+            last_timestamp is not None and timestamps.iloc[0] < last_timestamp
+        ):
+            raise ValueError("Chunked preprocessing requires input sorted by "
+                             f"{datetime_col}; sort the source file first")
+        last_timestamp = timestamps.iloc[-1]
+        
+        frame = chunk if carry is None else pd.concat([carry, chunk])
+        valid = frame[congestion_col].notna().to_numpy()
+        
+        if not valid.any():
+            # No left anchor yet: leading NaNs stay NaN, emit as-is
+            yield frame
+            carry, n_context = None, 0
+            continue
+        
+        last_valid = int(np.flatnonzero(valid)[-1])
+        filled = frame[congestion_col].interpolate(method='linear', limit=limit)
+        
+        if last_valid >= n_context:
+            out = frame.iloc[n_context:last_valid + 1].copy()
+            out[congestion_col] = filled.iloc[n_context:last_valid + 1]
+            yield out
+        
+        carry, n_context = frame.iloc[last_valid:], 1
+    
+    # Trailing gap: forward-filled up to the limit, as pandas does
+    if carry is not None and len(carry) > n_context:
+        out = carry.iloc[n_context:].copy()
+        out[congestion_col] = (
+            carry[congestion_col].interpolate(method='linear', limit=limit).iloc[n_context:]
+        )
+        yield out
+
+
+def preprocess_traffic_data_chunked(
+    chunk_source: Callable[[], Iterable[pd.DataFrame]],
+    datetime_col: str = 'date',
+    congestion_col: str = 'congestion_index',
+    capacity: int = 65536,
+    holidays: Optional[pd.DataFrame] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Chunk-aware version of preprocess_traffic_data for out-of-core data.
+    
+    Makes two passes in bounded memory: the first accumulates a quantile
+    sketch for the IQR outlier bounds, the second interpolates, flags and
+    adds calendar features chunk by chunk. Input must already be sorted by
+    datetime_col (sensor exports usually are).
+    
+    Args:
+        chunk_source: Callable returning a fresh iterable of chunks,
+            e.g. lambda: iter_csv_chunks(path, chunksize=500_000)
+        datetime_col: Name of datetime column
+        congestion_col: Name of congestion index column
+        capacity: Quantile sketch capacity (exact below this many rows)
+        holidays: Dated holiday list (None for the fixed-date holidays)
+    
+    Yields:
+        Preprocessed DataFrame chunks
+    """
+    from data_loader import StreamingQuantiles
+    
+    # Pass 1: IQR bounds on the interpolated series
+    sketch = StreamingQuantiles(capacity)
+    n_missing = 0
+    for chunk in _interpolate_chunks(chunk_source(), datetime_col, congestion_col):
+        sketch.update(chunk[congestion_col])
+        n_missing += int(chunk[congestion_col].isnull().sum())
+    
+    Q1, Q3 = sketch.quantile([0.25, 0.75])
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    logger.info(f"Chunked IQR bounds for {congestion_col}: [{lower_bound:.2f}, {upper_bound:.2f}] "
+                f"over {sketch.count} rows ({n_missing} still missing after interpolation)")
+    
+    # Pass 2: flag and add features
+    outlier_count = 0
+    for chunk in _interpolate_chunks(chunk_source(), datetime_col, congestion_col):
+        chunk['is_outlier'] = (
+            (chunk[congestion_col] < lower_bound) | (chunk[congestion_col] > upper_bound)
+        )
+        outlier_count += int(chunk['is_outlier'].sum())
+        yield _add_traffic_calendar_features(chunk, datetime_col, holidays)
+    
+    logger.info(f"Identified {outlier_count} outliers in traffic data")
+
+
 # ============================================================================
 # WEATHER DATA PREPROCESSING
 # ============================================================================
@@ -245,13 +364,12 @@ def create_traffic_features(
     for lag in lags:
         df[f'{target_col}_lag_{lag}'] = df[target_col].shift(lag)
     
-    # Rolling statistics
+    # Rolling statistics (one kernel pass for all windows; full windows only)
     windows = [7, 14, 30]
+    rolling = rolling_window_stats(df[target_col], windows, min_periods=None)
     for window in windows:
-        df[f'{target_col}_rolling_mean_{window}'] = df[target_col].rolling(window=window).mean()
-        df[f'{target_col}_rolling_std_{window}'] = df[target_col].rolling(window=window).std()
-        df[f'{target_col}_rolling_min_{window}'] = df[target_col].rolling(window=window).min()
-        df[f'{target_col}_rolling_max_{window}'] = df[target_col].rolling(window=window).max()
+        for stat in ['mean', 'std', 'min', 'max']:
+            df[f'{target_col}_rolling_{stat}_{window}'] = rolling[(stat, window)]
     
     # Day of month features
     if datetime_col in df.columns:
@@ -328,6 +446,236 @@ def merge_datasets(
     return merged_df
 
 
+# ============================================================================
+# INCREMENTAL INGESTION
+# ============================================================================
+
+INCREMENTAL_STATE_DIR = '_state'
+
+
+def _load_incremental_state(
+    root: Path
+) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp], Optional[pd.DataFrame]]:
+    """Read (watermark, rewrite_from, carry) from a cleaned output directory."""
+    state_file = root / INCREMENTAL_STATE_DIR / 'watermark.json'
+    if not state_file.exists():
+        return None, None, None
+    
+    with open(state_file, 'r') as f:
+        state = json.load(f)
+    
+    carry_file = root / INCREMENTAL_STATE_DIR / 'carry.parquet'
+    carry = pd.read_parquet(carry_file) if carry_file.exists() else None
+    return pd.Timestamp(state['watermark']), pd.Timestamp(state['rewrite_from']), carry
+
+
+def _save_incremental_state(
+    root: Path,
+    watermark: pd.Timestamp,
+    rewrite_from: pd.Timestamp,
+    carry: pd.DataFrame
+) -> None:
+    """Persist the watermark and raw look-back rows (written after the data)."""
+    state_dir = root / INCREMENTAL_STATE_DIR
+    state_dir.mkdir(parents=True, exist_ok=True)
+    
+    tmp = state_dir / 'carry.parquet.tmp'
+    carry.to_parquet(tmp, index=False)
+    os.replace(tmp, state_dir / 'carry.parquet')
+    
+    tmp = state_dir / 'watermark.json.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'watermark': watermark.isoformat(),
+                   'rewrite_from': rewrite_from.isoformat()}, f, indent=2)
+    os.replace(tmp, state_dir / 'watermark.json')
+
+
+def _interpolation_lookback(
+    raw: pd.DataFrame,
+    datetime_col: str,
+    congestion_col: str
+) -> Tuple[pd.Timestamp, pd.DataFrame]:
+    """
+    Find the raw rows the next run must reprocess.
+    
+    Rows from the day of the last valid value onward may change once new
+    values arrive (the trailing gap gets interpolated instead of padded).
+    They are re-emitted as whole days, preceded by the last valid value
+    before that day as the left interpolation anchor.
+    """
+    dates = raw[datetime_col]
+    valid = raw[congestion_col].notna().to_numpy()
+    
+    last_valid = np.flatnonzero(valid)
+    pivot = last_valid[-1] if len(last_valid) else len(raw) - 1
+    rewrite_from = dates.iloc[pivot].normalize()
+    
+    first_row = int(dates.searchsorted(rewrite_from, side='left'))
+    anchors = np.flatnonzero(valid[:first_row])
+    start = anchors[-1] if len(anchors) else first_row
+    return rewrite_from, raw.iloc[start:].reset_index(drop=True)
+
+
+def preprocess_traffic_data_incremental(
+    new_df: pd.DataFrame,
+    output_dir: str,
+    datetime_col: str = 'date',
+    congestion_col: str = 'congestion_index',
+    holidays: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Preprocess only rows newer than the last run and append them.
+    
+    The cleaned output is a partitioned Parquet dataset (see
+    data_loader.save_data) with a watermark and the raw look-back rows kept
+    under output_dir/_state. Each run reprocesses the look-back rows together
+    with the new ones, recomputes the IQR bounds from the stored congestion
+    column plus the new values, and re-flags only the historical partitions
+    whose is_outlier flag actually changes. The stored dataset therefore
+    equals preprocess_traffic_data on the full history.
+    
+    Rows at or before the watermark are ignored; late corrections to older
+    days need a full rebuild.
+    
+    Args:
+        new_df: Raw traffic rows (may overlap the already processed range)
+        output_dir: Partitioned cleaned dataset directory
+        datetime_col: Name of datetime column
+        congestion_col: Name of congestion index column
+        holidays: Dated holiday list (None for the fixed-date holidays)
+    
+    Returns:
+        DataFrame of the rows written in this run (new, reprocessed and
+        re-flagged), suitable for merge_datasets_incremental
+    """
+    from data_loader import save_data, load_partitioned_data
+    
+    root = Path(output_dir)
+    watermark, rewrite_from, carry = _load_incremental_state(root)
+    
+    new_df = new_df.copy()
+    new_df[datetime_col] = pd.to_datetime(new_df[datetime_col])
+    if watermark is not None:
+        stale = new_df[datetime_col] <= watermark
+        if stale.any():
+            logger.info(f"Skipping {stale.sum()} rows at or before watermark {watermark}")
+        new_df = new_df[~stale]
+    
+    if new_df.empty:
+        logger.info("No new traffic rows since last run")
+        return new_df
+    
+    raw = new_df if carry is None else pd.concat([carry, new_df], ignore_index=True)
+    raw = raw.sort_values(datetime_col).reset_index(drop=True)
+    
+    # Interpolate the look-back + new rows; only whole days from rewrite_from are emitted
+    frame = raw.copy()
+    if frame[congestion_col].isnull().any():
+        frame[congestion_col] = frame[congestion_col].interpolate(method='linear', limit=7)
+    if rewrite_from is not None:
+        frame = frame[frame[datetime_col] >= rewrite_from]
+    
+    # IQR bounds over the whole interpolated history
+    history = None
+    if watermark is not None:
+        try:
+            history = load_partitioned_data(
+                root, datetime_col, end=rewrite_from - pd.Timedelta(1, 'ns'),
+                columns=[datetime_col, congestion_col, 'is_outlier']
+            )
+        except FileNotFoundError:
+            history = None
+    values = frame[congestion_col] if history is None else pd.concat(
+        [history[congestion_col], frame[congestion_col]], ignore_index=True
+    )
+    Q1 = values.quantile(0.25)
+    Q3 = values.quantile(0.75)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    
+    frame = frame.copy()
+    frame['is_outlier'] = (frame[congestion_col] < lower_bound) | (frame[congestion_col] > upper_bound)
+    frame = _add_traffic_calendar_features(frame, datetime_col, holidays)
+    updates = [frame]
+    
+    # Re-flag historical partitions whose flags moved with the new bounds
+    if history is not None and len(history):
+        flags = (history[congestion_col] < lower_bound) | (history[congestion_col] > upper_bound)
+        changed = history.loc[(flags != history['is_outlier']).to_numpy(), datetime_col]
+        for period in changed.dt.to_period('M').unique():
+            part = load_partitioned_data(
+                root, datetime_col,
+                start=period.start_time,
+                end=min(period.end_time, rewrite_from - pd.Timedelta(1, 'ns'))
+            )
+            part['is_outlier'] = (part[congestion_col] < lower_bound) | (part[congestion_col] > upper_bound)
+            updates.insert(0, part)
+        if len(changed):
+            logger.info(f"Re-flagged {len(changed)} historical rows after IQR bounds moved")
+    
+    written = pd.concat(updates, ignore_index=True)
+    save_data(written, str(root), format='parquet', partition_col=datetime_col,
+              mode='append' if watermark is not None else 'overwrite')
+    
+    next_rewrite_from, next_carry = _interpolation_lookback(raw, datetime_col, congestion_col)
+    _save_incremental_state(root, raw[datetime_col].iloc[-1], next_rewrite_from, next_carry)
+    
+    logger.info(f"Incremental traffic update: {len(new_df)} new rows, {len(written)} rows written, "
+                f"watermark {raw[datetime_col].iloc[-1]}")
+    return written
+
+
+def merge_datasets_incremental(
+    traffic_updates: pd.DataFrame,
+    output_dir: str,
+    weather_df: Optional[pd.DataFrame] = None,
+    accident_df: Optional[pd.DataFrame] = None,
+    date_col: str = 'date'
+) -> pd.DataFrame:
+    """
+    Merge only updated traffic rows and append them to the merged dataset.
+    
+    merge_datasets is a row-wise left join, so merging the rows returned by
+    preprocess_traffic_data_incremental against the weather and accident
+    rows of the same date range reproduces the full merge for those days.
+    
+    Args:
+        traffic_updates: Rows returned by preprocess_traffic_data_incremental
+        output_dir: Partitioned merged dataset directory
+        weather_df: Weather DataFrame (optional)
+        accident_df: Accident DataFrame (optional)
+        date_col: Common date column for merging
+    
+    Returns:
+        Merged rows written in this run
+    """
+    from data_loader import save_data
+    
+    if traffic_updates.empty:
+        logger.info("No traffic updates to merge")
+        return traffic_updates
+    
+    first = traffic_updates[date_col].min()
+    last = traffic_updates[date_col].max()
+    
+    if weather_df is not None:
+        weather_col = 'datetime' if 'datetime' in weather_df.columns else date_col
+        weather_dates = pd.to_datetime(weather_df[weather_col])
+        weather_df = weather_df[((weather_dates >= first) & (weather_dates <= last)).to_numpy()]
+    
+    if accident_df is not None and 'datetime' in accident_df.columns:
+        accident_days = pd.to_datetime(accident_df['datetime']).dt.normalize()
+        accident_df = accident_df[
+            ((accident_days >= first.normalize()) & (accident_days <= last)).to_numpy()
+        ].copy()
+    
+    merged = merge_datasets(traffic_updates, weather_df, accident_df, date_col=date_col)
+    save_data(merged, output_dir, format='parquet', partition_col=date_col,
+              mode='append' if Path(output_dir).exists() else 'overwrite')
+    return merged
+
+
 # ============================================================================
 # DATA SPLITTING
 # ============================================================================
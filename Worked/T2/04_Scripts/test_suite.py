@@ -0,0 +1,456 @@
+"""
+Test Suite for the T2 Data Cleaning and Preprocessing Scripts
+
+Checks that the cached, parallel, chunked, partitioned and incremental
+code paths give the same data as the plain in-memory functions.
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import tempfile
+from pathlib import Path
+import logging
+import sys
+from typing import Dict
+from datetime import datetime
+from unittest import mock
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+class TestResults:
+    """Container for test results."""
+    
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.errors = []
+    
+    def add_pass(self, test_name: str):
+        self.passed += 1
+        logger.info(f"  ✅ {test_name}")
+    
+    def add_fail(self, test_name: str, error: str):
+        self.failed += 1
+        self.errors.append((test_name, error))
+        logger.error(f"  ❌ {test_name}: {error}")
+    
+    def summary(self) -> str:
+        total = self.passed + self.failed
+        pct = (self.passed / total * 100) if total > 0 else 0
+        return f"{self.passed}/{total} tests passed ({pct:.1f}%)"
+
+
+def make_traffic_frame(n_days: int = 400, seed: int = 0) -> pd.DataFrame:
+    """Daily congestion series with gaps, a long gap and spikes."""
+    rng = np.random.default_rng(seed)
+    values = 50 + 10 * np.sin(np.arange(n_days) / 7) + rng.normal(0, 3, n_days)
+    values[rng.random(n_days) < 0.05] = np.nan
+    values[rng.choice(n_days, 5, replace=False)] += 60
+    values[100:112] = np.nan  # gap longer than the interpolation limit
+    return pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=n_days, freq='D'),
+        'congestion_index': values,
+        'speed_kmh': rng.normal(30, 5, n_days).round(1)
+    })
+
+
+def test_csv_cache() -> TestResults:
+    """Test the Arrow sidecar cache of load_csv_data."""
+    results = TestResults()
+    logger.info("\n🗃️  Testing CSV Sidecar Cache...")
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        results.add_pass("pyarrow not installed, cache falls back to read_csv (skipped)")
+        return results
+    
+    try:
+        from data_loader import load_csv_data
+        
+        df = make_traffic_frame()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            csv = root / 'traffic.csv'
+            df.to_csv(csv, index=False)
+            df = pd.read_csv(csv, parse_dates=['date'])
+            
+            first = load_csv_data(csv, parse_dates=['date'], use_cache=True)
+            sidecars = list((root / '.cache').glob('*.feather'))
+            
+            # A second read must not parse the CSV again
+            with mock.patch('pandas.read_csv', side_effect=AssertionError("CSV re-parsed")):
+                cached = load_csv_data(csv, parse_dates=['date'], use_cache=True)
+                projected = load_csv_data(csv, parse_dates=['date'], use_cache=True,
+                                          columns=['date', 'congestion_index'])
+            if len(sidecars) == 1 and first.equals(df) and cached.equals(df) \
+                    and projected.equals(df[['date', 'congestion_index']]):
+                results.add_pass("sidecar written once and read back unchanged")
+            else:
+                results.add_fail("sidecar round trip", f"{len(sidecars)} sidecars")
+            
+            # Rewriting the CSV invalidates its sidecar
+            df.iloc[:10].to_csv(csv, index=False)
+            os.utime(csv, ns=(0, 1))
+            reread = load_csv_data(csv, parse_dates=['date'], use_cache=True)
+            if len(reread) == 10 and not sidecars[0].exists():
+                results.add_pass("changed file re-parsed, old sidecar removed")
+            else:
+                results.add_fail("changed file", f"{len(reread)} rows, old sidecar kept")
+            
+            # A sidecar that cannot be written does not fail the load
+            failed_dir = root / 'unwritable'
+            with mock.patch('pyarrow.feather.write_feather', side_effect=OSError("disk full")):
+                uncached = load_csv_data(csv, parse_dates=['date'], use_cache=True, cache_dir=failed_dir)
+            if uncached.equals(reread) and not any(failed_dir.iterdir()):
+                results.add_pass("failed sidecar write falls back to the parsed CSV")
+            else:
+                results.add_fail("failed sidecar write", "Load changed or partial sidecar left")
+            
+            # Shared cache_dir: same-named files and sibling stems keep their own sidecars
+            cache_dir = root / 'shared'
+            for name, frame in [('a/traffic.csv', df.iloc[:5]), ('b/traffic.csv', df.iloc[5:8]),
+                                ('a/traffic.2024.csv', df.iloc[8:9])]:
+                (root / name).parent.mkdir(exist_ok=True)
+                frame.to_csv(root / name, index=False)
+            
+            def rows(name: str, **kwargs) -> int:
+                return len(load_csv_data(root / name, use_cache=True, cache_dir=cache_dir, **kwargs))
+            
+            counts = [rows('a/traffic.csv'), rows('b/traffic.csv'), rows('a/traffic.2024.csv'),
+                      rows('a/traffic.csv', parse_dates=['date'])]
+            counts += [rows('a/traffic.csv'), rows('b/traffic.csv'), rows('a/traffic.2024.csv')]
+            n_sidecars = len(list(cache_dir.glob('*.feather')))
+            if counts == [5, 3, 1, 5, 5, 3, 1] and n_sidecars == 4:
+                results.add_pass("no collisions in a shared cache_dir")
+            else:
+                results.add_fail("shared cache_dir", f"rows {counts}, {n_sidecars} sidecars")
+    
+    except Exception as e:
+        results.add_fail("CSV cache", str(e))
+    
+    return results
+
+
+def test_parallel_loading() -> TestResults:
+    """Test that parallel multi-file loading matches sequential loading."""
+    results = TestResults()
+    logger.info("\n🧵 Testing Parallel Multi-File Loading...")
+    
+    try:
+        from data_loader import load_multiple_csv_files
+        
+        df = make_traffic_frame()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(6):
+                df.iloc[i * 50:(i + 1) * 50 + i].to_csv(Path(temp_dir) / f'corridor_{i}.csv', index=False)
+            
+            expected = load_multiple_csv_files(temp_dir, parse_dates=['date'])
+            for executor in ['thread', 'process']:
+                loaded = load_multiple_csv_files(temp_dir, n_workers=3, executor=executor,
+                                                 max_in_flight=2, parse_dates=['date'])
+                if list(loaded) == list(expected) and all(loaded[k].equals(expected[k]) for k in expected):
+                    results.add_pass(f"{executor} pool matches sequential ({len(loaded)} files)")
+                else:
+                    results.add_fail(f"{executor} pool", "Files or contents differ")
+            
+            combined = load_multiple_csv_files(temp_dir, n_workers=2, concat=True, parse_dates=['date'])
+            sizes = combined['source'].value_counts(sort=False)
+            if len(combined) == sum(len(v) for v in expected.values()) \
+                    and sizes.to_dict() == {k: len(v) for k, v in expected.items()}:
+                results.add_pass("concat=True tags every row with its file")
+            else:
+                results.add_fail("concat=True", str(sizes.to_dict()))
+    
+    except Exception as e:
+        results.add_fail("Parallel loading", str(e))
+    
+    return results
+
+
+def test_chunked_pipeline() -> TestResults:
+    """Test that chunk-aware validation and preprocessing match the in-memory versions."""
+    results = TestResults()
+    logger.info("\n🧱 Testing Chunked Validation and Preprocessing...")
+    
+    try:
+        from data_loader import (
+            iter_csv_chunks, check_missing_values, check_missing_values_chunked,
+            detect_duplicates, detect_duplicates_chunked, remove_duplicates,
+            remove_duplicates_chunked, detect_outliers, detect_outliers_chunked
+        )
+        from preprocessing import preprocess_traffic_data, preprocess_traffic_data_chunked
+        
+        df = make_traffic_frame()
+        dup = pd.concat([df, df.iloc[[3, 50, 51, 399]]]).sort_values('date', kind='stable')
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # In-memory references are read from the same files as the chunks
+            csv = Path(temp_dir) / 'traffic.csv'
+            dup.to_csv(csv, index=False)
+            dup = pd.read_csv(csv, parse_dates=['date'])
+            clean_csv = Path(temp_dir) / 'traffic_clean.csv'
+            df.to_csv(clean_csv, index=False)
+            expected_clean = preprocess_traffic_data(
+                pd.read_csv(clean_csv, parse_dates=['date'])
+            ).reset_index(drop=True)
+            
+            for chunksize in [1, 7, 64, 1000]:
+                def source():
+                    return iter_csv_chunks(csv, chunksize=chunksize, parse_dates=['date'])
+                
+                mismatched = []
+                if check_missing_values_chunked(source()) != check_missing_values(dup):
+                    mismatched.append('missing values')
+                if not detect_duplicates_chunked(source).equals(detect_duplicates(dup)):
+                    mismatched.append('duplicates')
+                if not pd.concat(remove_duplicates_chunked(source())).equals(remove_duplicates(dup)):
+                    mismatched.append('remove duplicates')
+                for method in ['iqr', 'zscore']:
+                    if detect_outliers_chunked(source, method=method) != detect_outliers(dup, method=method):
+                        mismatched.append(f'{method} outliers')
+                
+                chunked = pd.concat(preprocess_traffic_data_chunked(
+                    lambda: iter_csv_chunks(clean_csv, chunksize=chunksize, parse_dates=['date'])
+                ), ignore_index=True)
+                if not chunked.equals(expected_clean):
+                    mismatched.append('preprocessing')
+                
+                if not mismatched:
+                    results.add_pass(f"chunks of {chunksize} rows match in-memory")
+                else:
+                    results.add_fail(f"chunks of {chunksize} rows", f"Mismatch in {mismatched}")
+    
+    except Exception as e:
+        results.add_fail("Chunked pipeline", str(e))
+    
+    return results
+
+
+def test_partitioned_parquet() -> TestResults:
+    """Test the year/month partitioned Parquet writer and reader."""
+    results = TestResults()
+    logger.info("\n🗂️  Testing Partitioned Parquet...")
+    
+    try:
+        from data_loader import save_data, load_partitioned_data
+        
+        df = make_traffic_frame()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / 'traffic'
+            save_data(df.iloc[:300], str(root), format='parquet', partition_col='date')
+            
+            # Append re-delivers the last 20 days with new values
+            redelivered = df.iloc[280:].copy()
+            redelivered['speed_kmh'] = -1.0
+            save_data(redelivered, str(root), format='parquet', partition_col='date', mode='append')
+            expected = pd.concat([df.iloc[:280], redelivered], ignore_index=True)
+            loaded = load_partitioned_data(str(root))
+            if loaded.equals(expected):
+                results.add_pass(f"append replaces re-delivered days "
+                                 f"({len(list(root.glob('year=*/month=*')))} partitions)")
+            else:
+                results.add_fail("append", "Dataset differs from the expected rows")
+            
+            # Range reads open only the overlapping partitions
+            with mock.patch('pandas.read_parquet', wraps=pd.read_parquet) as reader:
+                window = load_partitioned_data(str(root), start='2023-03-10', end='2023-04-05')
+            days = expected['date'].between('2023-03-10', '2023-04-05')
+            if window.equals(expected[days.to_numpy()].reset_index(drop=True)) and reader.call_count == 2:
+                results.add_pass("range read prunes partitions")
+            else:
+                results.add_fail("range read", f"{reader.call_count} partitions opened")
+            
+            # Rows without a date are rejected, not dropped
+            try:
+                save_data(df.assign(date=df['date'].where(df.index != 5)), str(root),
+                          format='parquet', partition_col='date')
+                results.add_fail("missing partition dates", "No error raised")
+            except ValueError:
+                if load_partitioned_data(str(root)).equals(expected):
+                    results.add_pass("missing partition dates rejected before writing")
+                else:
+                    results.add_fail("missing partition dates", "Dataset changed")
+            
+            # A failing overwrite keeps the previous dataset
+            write = pd.DataFrame.to_parquet
+            calls = []
+            
+            def failing_write(self, *args, **kwargs):
+                calls.append(1)
+                if len(calls) == 3:
+                    raise OSError("disk full")
+                return write(self, *args, **kwargs)
+            
+            with mock.patch.object(pd.DataFrame, 'to_parquet', failing_write):
+                try:
+                    save_data(df.iloc[::2], str(root), format='parquet', partition_col='date')
+                except OSError:
+                    pass
+            survived = load_partitioned_data(str(root))
+            months = survived['date'].dt.to_period('M')
+            untouched = (expected['date'] >= '2023-03-01').to_numpy()
+            if months.nunique() == expected['date'].dt.to_period('M').nunique() \
+                    and survived[(months >= '2023-03').to_numpy()].reset_index(drop=True).equals(
+                        expected[untouched].reset_index(drop=True)):
+                results.add_pass("failed overwrite leaves the previous data")
+            else:
+                results.add_fail("failed overwrite", f"{len(survived)} of {len(expected)} rows left")
+            
+            save_data(df.iloc[::2], str(root), format='parquet', partition_col='date')
+            if load_partitioned_data(str(root)).equals(df.iloc[::2].reset_index(drop=True)):
+                results.add_pass("overwrite replaces the whole dataset")
+            else:
+                results.add_fail("overwrite", "Stale rows left behind")
+    
+    except Exception as e:
+        results.add_fail("Partitioned Parquet", str(e))
+    
+    return results
+
+
+def test_incremental_preprocessing() -> TestResults:
+    """Test that incremental preprocessing equals a full rebuild."""
+    results = TestResults()
+    logger.info("\n⏩ Testing Incremental Preprocessing...")
+    
+    try:
+        from data_loader import load_partitioned_data
+        from preprocessing import preprocess_traffic_data, preprocess_traffic_data_incremental
+        
+        df = make_traffic_frame()
+        expected = preprocess_traffic_data(df).reset_index(drop=True)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / 'traffic_clean'
+            # Batches ending inside the long gap, daily runs and one batch
+            # overlapping the watermark
+            batches = [(0, 105), (105, 108), (108, 200), (200, 201), (201, 202),
+                       (195, 205), (205, 330), (330, 331), (331, 400)]
+            for start, end in batches:
+                preprocess_traffic_data_incremental(df.iloc[start:end], str(root))
+            
+            stored = load_partitioned_data(str(root))[expected.columns]
+            mismatched = [
+                col for col in expected.columns
+                if not stored[col].astype(object).equals(expected[col].astype(object))
+            ]
+            if len(stored) == len(expected) and not mismatched:
+                results.add_pass(f"{len(batches)} incremental runs equal a full rebuild")
+            else:
+                results.add_fail("incremental equals rebuild",
+                                 f"{len(stored)} vs {len(expected)} rows, mismatch in {mismatched}")
+            
+            # Nothing new: nothing written
+            if preprocess_traffic_data_incremental(df.iloc[-3:], str(root)).empty:
+                results.add_pass("rows at or before the watermark skipped")
+            else:
+                results.add_fail("watermark", "Old rows were reprocessed")
+    
+    except Exception as e:
+        results.add_fail("Incremental preprocessing", str(e))
+    
+    return results
+
+
+# Files kept identical between the T2 and T3 stages (path relative to Worked/)
+SHARED_FILES = [
+    ('T2/04_Scripts/rolling_stats.py', 'T3/05_Scripts/rolling_stats.py'),
+    ('T2/04_Scripts/calendar_table.py', 'T3/05_Scripts/calendar_table.py'),
+    ('T2/06_Configuration/thai_holidays.csv', 'T3/08_Configuration/thai_holidays.csv'),
+]
+
+
+def test_shared_files() -> TestResults:
+    """Test that the files copied between T2 and T3 have not drifted apart."""
+    results = TestResults()
+    logger.info("\n🔗 Testing Shared T2/T3 Files...")
+    
+    worked = Path(__file__).resolve().parent.parent.parent
+    for ours, theirs in SHARED_FILES:
+        try:
+            if (worked / ours).read_bytes() == (worked / theirs).read_bytes():
+                results.add_pass(f"{ours} matches {theirs}")
+            else:
+                results.add_fail(f"{ours} matches {theirs}", "Copies differ; apply the change to both")
+        except OSError as e:
+            results.add_fail(f"{ours} matches {theirs}", str(e))
+    
+    return results
+
+
+def run_all_tests() -> Dict[str, TestResults]:
+    """Run all test suites."""
+    logger.info("=" * 60)
+    logger.info("🧪 RUNNING TEST SUITE")
+    logger.info("=" * 60)
+    logger.info(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    all_results = {}
+    
+    # Run each test suite
+    test_suites = [
+        ('CSV Sidecar Cache', test_csv_cache),
+        ('Parallel Multi-File Loading', test_parallel_loading),
+        ('Chunked Validation and Preprocessing', test_chunked_pipeline),
+        ('Partitioned Parquet', test_partitioned_parquet),
+        ('Incremental Preprocessing', test_incremental_preprocessing),
+        ('Shared T2/T3 Files', test_shared_files),
+    ]
+    
+    for name, test_func in test_suites:
+        try:
+            all_results[name] = test_func()
+        except Exception as e:
+            results = TestResults()
+            results.add_fail(name, str(e))
+            all_results[name] = results
+    
+    # Summary
+    logger.info("\n" + "=" * 60)
+    logger.info("📊 TEST SUMMARY")
+    logger.info("=" * 60)
+    
+    total_passed = 0
+    total_failed = 0
+    
+    for name, results in all_results.items():
+        total_passed += results.passed
+        total_failed += results.failed
+        status = "✅" if results.failed == 0 else "❌"
+        logger.info(f"  {status} {name}: {results.summary()}")
+    
+    logger.info("-" * 60)
+    total = total_passed + total_failed
+    pct = (total_passed / total * 100) if total > 0 else 0
+    
+    if total_failed == 0:
+        logger.info(f"🎉 ALL TESTS PASSED ({total_passed}/{total})")
+    else:
+        logger.info(f"⚠️ {total_failed} tests failed ({total_passed}/{total} passed, {pct:.1f}%)")
+    
+    logger.info("=" * 60)
+    
+    return all_results
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    results = run_all_tests()
+    
+    # Exit with error code if any tests failed
+    total_failed = sum(r.failed for r in results.values())
+    exit(1 if total_failed > 0 else 0)
@@ -0,0 +1,86 @@
+"""
+Tree Evaluator Benchmark for Bangkok Traffic Flow Optimization Project
+
+Checks that the flat NumPy evaluator (tree_evaluator.py) reproduces the
+native predict of the pickled tree models in Trained_Models exactly, and
+times both across batch sizes, from single rows up to large batches.
+
+Usage:
+    python benchmark_tree_evaluator.py
+    python benchmark_tree_evaluator.py --batch-sizes 1 8 64 --repeats 200
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List
+
+from model_utils import load_model, TRAINED_MODEL_FEATURES
+from tree_evaluator import export_trees
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+TREE_MODELS = ['random_forest_model.pkl', 'xgboost_model.pkl']
+
+
+def make_inputs(n_rows: int, seed: int = 42) -> np.ndarray:
+    """Rows of features_engineered.csv, perturbed and repeated to n_rows, ~5% NaN."""
+    df = pd.read_csv(BASE_DIR / '02_Data' / 'Processed' / 'features_engineered.csv')
+    X = df[TRAINED_MODEL_FEATURES].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    X = X[rng.integers(0, len(X), n_rows)] * rng.normal(1, 0.05, (n_rows, X.shape[1]))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    return X
+
+
+def _time(func, X: np.ndarray, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(X)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(batch_sizes: List[int], repeats: int) -> pd.DataFrame:
+    """Parity check and per-call timings for every tree model; returns a results table."""
+    X = make_inputs(max(batch_sizes))
+    rows = []
+    for filename in TREE_MODELS:
+        path = BASE_DIR / '02_Model_Development' / 'Trained_Models' / filename
+        if not path.exists():
+            logger.warning(f"Skipping {filename}: not found")
+            continue
+        model = load_model(str(path))
+        flat = export_trees(model)
+        exact = np.array_equal(model.predict(X), flat.predict(X))
+        logger.info(f"{filename}: {flat.n_trees} trees, exact parity on {len(X)} rows: {exact}")
+        
+        for size in batch_sizes:
+            # Fewer repeats for large batches keeps the run time flat
+            n = max(3, repeats * min(batch_sizes) // size)
+            native = _time(model.predict, X[:size], n)
+            evaluated = _time(flat.predict, X[:size], n)
+            rows.append({'model': filename.replace('_model.pkl', ''), 'batch_size': size,
+                         'native_ms': native * 1000, 'flat_ms': evaluated * 1000,
+                         'speedup': native / evaluated, 'exact': exact})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('model_utils').setLevel(logging.WARNING)
+    
+    parser = argparse.ArgumentParser(description="Benchmark the flat tree evaluator")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=100,
+                        help="calls timed for the smallest batch size")
+    args = parser.parse_args()
+    
+    results = run_benchmark(args.batch_sizes, args.repeats)
+    print(results.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
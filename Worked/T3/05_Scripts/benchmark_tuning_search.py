@@ -0,0 +1,103 @@
+"""
+Tuning Search Benchmark for Bangkok Traffic Flow Optimization Project
+
+Times the tuners of hyperparameter_tuning.py with the fixed-budget random
+search and with successive halving (search_type='halving') on the same
+number of candidates, and compares the best CV RMSE and the hold-out RMSE
+of the refitted models. --fold-cache both also times every search with
+and without the fold-level data cache.
+
+Usage:
+    python benchmark_tuning_search.py
+    python benchmark_tuning_search.py --models xgboost --n-iter 50
+    python benchmark_tuning_search.py --models xgboost --search-types random tpe
+    python benchmark_tuning_search.py --models xgboost --search-types random --fold-cache both
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List
+
+from model_utils import TRAINED_MODEL_FEATURES
+from hyperparameter_tuning import tune_xgboost, tune_random_forest, tune_gradient_boosting
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+TUNERS = {
+    'xgboost': tune_xgboost,
+    'random_forest': tune_random_forest,
+    'gradient_boosting': tune_gradient_boosting
+}
+
+
+def run_benchmark(
+    models: List[str],
+    search_types: List[str],
+    n_iter: int = 30,
+    cv: int = 5,
+    test_fraction: float = 0.2,
+    fold_cache: List[bool] = (False,)
+) -> pd.DataFrame:
+    """
+    Tune every model with every search type on features_engineered.csv.
+    
+    Args:
+        models: Keys of TUNERS
+        search_types: Search types to compare ('random', 'halving', 'tpe', 'grid')
+        n_iter: Candidates per search
+        cv: Number of TimeSeriesSplit folds
+        test_fraction: Chronological hold-out share for the test RMSE
+        fold_cache: Fold cache settings to compare (fold_cache.py)
+    
+    Returns:
+        Results table (wall-clock, fits, best CV RMSE, test RMSE)
+    """
+    df = pd.read_csv(BASE_DIR / '02_Data' / 'Processed' / 'features_engineered.csv')
+    df = df.dropna(subset=TRAINED_MODEL_FEATURES + ['congestion_index'])
+    X = df[TRAINED_MODEL_FEATURES].to_numpy(dtype=np.float64)
+    y = df['congestion_index'].to_numpy(dtype=np.float64)
+    split = int(len(X) * (1 - test_fraction))
+    
+    rows = []
+    for name in models:
+        for search_type in search_types:
+            for cached in fold_cache:
+                start = time.perf_counter()
+                model, results = TUNERS[name](X[:split], y[:split], search_type=search_type,
+                                              n_iter=n_iter, cv=cv, verbose=0, fold_cache=cached)
+                elapsed = time.perf_counter() - start
+                test_rmse = np.sqrt(np.mean((y[split:] - model.predict(X[split:])) ** 2))
+                rows.append({'model': name, 'search': search_type, 'fold_cache': cached,
+                             'seconds': elapsed,
+                             'fits': results['n_candidates'] * cv,
+                             'cv_rmse': results['best_score'], 'test_rmse': test_rmse,
+                             'n_estimators': results['best_params'].get('n_estimators')})
+                logger.info(f"{name} {search_type} (fold cache {cached}): {elapsed:.1f}s, "
+                            f"CV RMSE {results['best_score']:.4f}")
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('hyperparameter_tuning').setLevel(logging.WARNING)
+    
+    parser = argparse.ArgumentParser(description="Benchmark random search vs successive halving")
+    parser.add_argument('--models', nargs='+', default=list(TUNERS), choices=list(TUNERS))
+    parser.add_argument('--search-types', nargs='+', default=['random', 'halving'])
+    parser.add_argument('--n-iter', type=int, default=30)
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--fold-cache', choices=['off', 'on', 'both'], default='off')
+    args = parser.parse_args()
+    
+    fold_cache = {'off': [False], 'on': [True], 'both': [False, True]}[args.fold_cache]
+    results = run_benchmark(args.models, args.search_types, args.n_iter, args.cv,
+                            fold_cache=fold_cache)
+    print(results.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
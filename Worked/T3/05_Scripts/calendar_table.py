@@ -0,0 +1,189 @@
+"""
+Calendar Dimension Module for Bangkok Traffic Flow Optimization Project
+
+This module builds a per-day calendar table (date parts, ISO week, Thai
+season, holiday flag and name) so calendar features can be looked up for
+whole columns at once instead of evaluated row by row with DataFrame.apply.
+
+Holidays default to the fixed-date list the feature pipeline has always
+used. The full Thai public holiday calendar, including lunar holidays
+(Makha Bucha, Visakha Bucha, Asarnha Bucha, Khao Phansa) whose dates move
+every year, is loaded from a CSV with columns date,name[,type]; see
+thai_holidays.csv in the stage's configuration folder (T2/06_Configuration,
+T3/08_Configuration).
+
+The same file lives in T2/04_Scripts and T3/05_Scripts, and the same
+holiday CSV in both configuration folders, so each stage runs on its own;
+change both copies together (both test suites check that they are
+identical).
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+# Fixed-date holidays used when no holiday file is given
+RECURRING_HOLIDAYS = {
+    (1, 1): 'New Year',
+    (4, 13): 'Songkran',
+    (4, 14): 'Songkran',
+    (4, 15): 'Songkran',
+    (5, 1): 'Labour Day',
+    (12, 5): 'King Birthday',
+    (12, 31): 'New Year Eve'
+}
+
+# Thai season by month (cool: Nov-Feb, hot: Mar-May, rainy: Jun-Oct)
+THAI_SEASONS = {
+    1: 'cool', 2: 'cool', 3: 'hot', 4: 'hot', 5: 'hot', 6: 'rainy',
+    7: 'rainy', 8: 'rainy', 9: 'rainy', 10: 'rainy', 11: 'cool', 12: 'cool'
+}
+
+
+def load_thai_holidays(filepath: Union[str, Path]) -> pd.DataFrame:
+    """
+    Load a dated holiday list.
+    
+    Args:
+        filepath: CSV with columns date,name (extra columns are kept)
+    
+    Returns:
+        DataFrame with one row per date; names of holidays falling on the
+        same date are joined with ' / '
+    """
+    holidays = pd.read_csv(filepath)
+    missing = {'date', 'name'} - set(holidays.columns)
+    if missing:
+        raise ValueError(f"Holiday file {filepath} is missing columns: {sorted(missing)}")
+    
+    holidays['date'] = pd.to_datetime(holidays['date']).dt.normalize()
+    holidays = (
+        holidays.groupby('date', sort=True)
+        .agg({'name': lambda names: ' / '.join(dict.fromkeys(names))})
+        .reset_index()
+    )
+    
+    logger.info(f"Loaded {len(holidays)} holiday dates from {filepath} "
+                f"({holidays['date'].dt.year.min()}-{holidays['date'].dt.year.max()})")
+    return holidays
+
+
+def build_calendar_table(
+    start: Union[str, pd.Timestamp],
+    end: Union[str, pd.Timestamp],
+    holidays: Optional[pd.DataFrame] = None,
+    season_by_month: Optional[Dict[int, str]] = None
+) -> pd.DataFrame:
+    """
+    Build the calendar dimension for every day in [start, end].
+    
+    Args:
+        start: First day
+        end: Last day
+        holidays: Output of load_thai_holidays (None for RECURRING_HOLIDAYS)
+        season_by_month: Month -> season label (default THAI_SEASONS)
+    
+    Returns:
+        DataFrame with one row per day, ordered by date
+    """
+    season_by_month = season_by_month or THAI_SEASONS
+    dates = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+    iso = dates.isocalendar()
+    
+    table = pd.DataFrame({
+        'date': dates,
+        'year': dates.year.astype(np.int64),
+        'month': dates.month.astype(np.int64),
+        'day': dates.day.astype(np.int64),
+        'dayofweek': dates.dayofweek.astype(np.int64),
+        'dayofyear': dates.dayofyear.astype(np.int64),
+        'iso_year': iso['year'].to_numpy(dtype=np.int64),
+        'weekofyear': iso['week'].to_numpy(dtype=np.int64),
+        'quarter': dates.quarter.astype(np.int64),
+        'is_month_start': dates.is_month_start.astype(np.int64),
+        'is_month_end': dates.is_month_end.astype(np.int64),
+    })
+    table['is_weekend'] = (table['dayofweek'] >= 5).astype(np.int64)
+    
+    seasons = np.empty(13, dtype=object)
+    for month, label in season_by_month.items():
+        seasons[month] = label
+    table['season'] = pd.array(seasons[table['month'].to_numpy()], dtype='str')
+    
+    if holidays is None:
+        month_day = table['month'].to_numpy() * 100 + table['day'].to_numpy()
+        names = {m * 100 + d: name for (m, d), name in RECURRING_HOLIDAYS.items()}
+        holiday_name = pd.Series(month_day).map(names)
+    else:
+        covered = holidays['date'].dt.year
+        if dates.year.min() < covered.min() or dates.year.max() > covered.max():
+            logger.warning(f"Holiday list covers {covered.min()}-{covered.max()}; "
+                           f"days outside it are treated as non-holidays")
+        holiday_name = pd.Series(dates).map(holidays.set_index('date')['name'])
+    
+    table['holiday_name'] = holiday_name.astype('str').where(holiday_name.notna(), None)
+    table['is_holiday'] = holiday_name.notna().astype(np.int64).to_numpy()
+    
+    return table
+
+
+def calendar_lookup(
+    dates: pd.Series,
+    columns: List[str],
+    holidays: Optional[pd.DataFrame] = None,
+    season_by_month: Optional[Dict[int, str]] = None,
+    table: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Look up calendar columns for a datetime column.
+    
+    Each row is mapped to its day's position in the calendar table by integer
+    day arithmetic, so the cost per row is a single array take. Timezone-aware
+    dates are looked up by their local calendar day. Rows with a missing date
+    get 0 in integer columns and a missing value elsewhere.
+    
+    Args:
+        dates: Datetime Series (any time of day, naive or timezone-aware)
+        columns: Calendar table columns to return
+        holidays: Output of load_thai_holidays (None for RECURRING_HOLIDAYS)
+        season_by_month: Month -> season label (default THAI_SEASONS)
+        table: Prebuilt calendar table covering dates (built if None)
+    
+    Returns:
+        DataFrame of the requested columns aligned to dates.index
+    """
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        # Local wall-clock day, not the UTC day
+        dates = dates.dt.tz_localize(None)
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    
+    if table is None:
+        # Without any date (empty or all missing) a one-day table still
+        # gives the columns their dtypes
+        span = (days[valid].min(), days[valid].max()) if valid.any() else ('1970-01-01',) * 2
+        table = build_calendar_table(*span, holidays=holidays, season_by_month=season_by_month)
+    
+    first_day = table['date'].iloc[0].to_datetime64().astype('datetime64[D]')
+    positions = (days - first_day).astype(np.int64)
+    if not valid.all():
+        positions[~valid] = 0
+    if len(positions) and (positions.min() < 0 or positions.max() >= len(table)):
+        raise ValueError("Calendar table does not cover the requested dates")
+    
+    result = {}
+    for col in columns:
+        values = table[col].take(positions).reset_index(drop=True)
+        if not valid.all():
+            fill = 0 if pd.api.types.is_integer_dtype(values.dtype) else None
+            values = values.where(valid, fill)
+        result[col] = values.array
+    return pd.DataFrame(result, index=dates.index)
@@ -8,11 +8,17 @@ Author: Data Science Team
 Date: November 2025
 """
 
+import re
+import copy
 import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union, Any, Callable
 from pathlib import Path
+from collections import deque
+
+from calendar_table import calendar_lookup
+from rolling_stats import rolling_window_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +31,8 @@ logger = logging.getLogger(__name__)
 
 def create_temporal_features(
     df: pd.DataFrame,
-    datetime_col: str = 'date'
+    datetime_col: str = 'date',
+    holidays: Optional[pd.DataFrame] = None
 ) -> pd.DataFrame:
     """
     Create temporal features from datetime column.
@@ -33,6 +40,8 @@ def create_temporal_features(
     Args:
         df: Input DataFrame
         datetime_col: Name of datetime column
+        holidays: Dated holiday list from calendar_table.load_thai_holidays
+            (None for the fixed-date holidays)
     
     Returns:
         DataFrame with temporal features added
@@ -42,51 +51,111 @@ def create_temporal_features(
     # Ensure datetime type
     df[datetime_col] = pd.to_datetime(df[datetime_col])
     
+    # Features depend only on the timestamp: compute them once per distinct
+    # value and broadcast back, so panel data costs O(unique timestamps)
+    codes, uniques = pd.factorize(df[datetime_col], use_na_sentinel=False)
+    timestamps = pd.Series(uniques)
+    dt = timestamps.dt
+    
     # Basic temporal features
-    df['year'] = df[datetime_col].dt.year
-    df['month'] = df[datetime_col].dt.month
-    df['day'] = df[datetime_col].dt.day
-    df['dayofweek'] = df[datetime_col].dt.dayofweek  # 0=Monday
-    df['dayofyear'] = df[datetime_col].dt.dayofyear
-    df['weekofyear'] = df[datetime_col].dt.isocalendar().week.astype(int)
-    df['quarter'] = df[datetime_col].dt.quarter
+    features = pd.DataFrame({
+        'year': dt.year,
+        'month': dt.month,
+        'day': dt.day,
+        'dayofweek': dt.dayofweek,  # 0=Monday
+        'dayofyear': dt.dayofyear,
+        'weekofyear': dt.isocalendar().week.astype(int),
+        'quarter': dt.quarter,
+    })
     
     # Binary features
-    df['is_weekend'] = (df['dayofweek'] >= 5).astype(int)
-    df['is_month_start'] = df[datetime_col].dt.is_month_start.astype(int)
-    df['is_month_end'] = df[datetime_col].dt.is_month_end.astype(int)
-    
-    # Thai season (simplified)
-    def get_thai_season(month):
-        if month in [11, 12, 1, 2]:
-            return 'cool'
-        elif month in [3, 4, 5]:
-            return 'hot'
-        else:
-            return 'rainy'
-    
-    df['season'] = df['month'].apply(get_thai_season)
-    
-    # Thai holidays (major ones)
-    thai_holidays = [
-        # (month, day): 'holiday_name'
-        (1, 1),   # New Year
-        (4, 13), (4, 14), (4, 15),  # Songkran
-        (5, 1),   # Labour Day
-        (12, 5),  # King's Birthday
-        (12, 31), # New Year's Eve
-    ]
+    features['is_weekend'] = (features['dayofweek'] >= 5).astype(int)
+    features['is_month_start'] = dt.is_month_start.astype(int)
+    features['is_month_end'] = dt.is_month_end.astype(int)
     
-    df['is_holiday'] = df.apply(
-        lambda x: int((x['month'], x['day']) in thai_holidays),
-        axis=1
-    )
+    # Thai season and holidays from the calendar table (vectorised lookup)
+    calendar = calendar_lookup(timestamps, ['season', 'is_holiday'], holidays=holidays)
+    features['season'] = calendar['season']
+    features['is_holiday'] = calendar['is_holiday']
+    
+    for col in features.columns:
+        df[col] = features[col].array.take(codes)
     
     logger.info(f"Created {12} temporal features")
     
     return df
 
 
+# ============================================================================
+# PANEL (MULTI-SEGMENT) HELPERS
+# ============================================================================
+
+def _group_layout(
+    df: pd.DataFrame,
+    group_col: str
+) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """
+    Row order and segment bounds for per-group computations.
+    
+    Rows are stably sorted by group, so every group is contiguous and keeps
+    its existing (time) order. order is None when groups are already
+    contiguous, e.g. after create_model_features has sorted the frame once.
+    
+    Returns:
+        Tuple of (order, group_start), where group_start[i] is the sorted
+        position at which row i's group begins
+    """
+    codes, _ = pd.factorize(df[group_col], use_na_sentinel=False)
+    n = len(codes)
+    if n == 0 or np.all(codes[1:] >= codes[:-1]):
+        order, sorted_codes = None, codes
+    else:
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+    
+    if n:
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    else:
+        starts = np.array([], dtype=np.int64)
+    group_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+    return order, group_start
+
+
+def _gather(series: pd.Series, order: Optional[np.ndarray]) -> np.ndarray:
+    """Series values as float64 in group-sorted order."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values if order is None else values[order]
+
+
+def _scatter(values: np.ndarray, order: Optional[np.ndarray]) -> np.ndarray:
+    """Inverse of _gather: put group-sorted results back in row order."""
+    if order is None:
+        return values
+    out = np.empty_like(values)
+    out[order] = values
+    return out
+
+
+def _shift_within_groups(values: np.ndarray, group_start: np.ndarray, periods: int) -> np.ndarray:
+    """Shift group-sorted values by periods, NaN where that crosses a group start."""
+    n = len(values)
+    out = np.full(n, np.nan)
+    if periods < n:
+        out[periods:] = values[:n - periods]
+    out[np.arange(n) - group_start < periods] = np.nan
+    return out
+
+
+def _ewm_within_groups(values: np.ndarray, group_start: np.ndarray, span: int) -> np.ndarray:
+    """adjust=False EWM of group-sorted values, restarted at each group."""
+    # groupby-ewm runs one compiled pass with per-group bounds
+    return (
+        pd.Series(values).groupby(group_start, sort=False)
+        .ewm(span=span, adjust=False).mean()
+        .to_numpy()
+    )
+
+
 # ============================================================================
 # LAG FEATURES
 # ============================================================================
@@ -94,7 +163,8 @@ def create_temporal_features(
 def create_lag_features(
     df: pd.DataFrame,
     target_col: str,
-    lag_periods: List[int] = [1, 7, 14, 30]
+    lag_periods: List[int] = [1, 7, 14, 30],
+    group_col: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Create lag features for time-series prediction.
@@ -103,15 +173,24 @@ def create_lag_features(
         df: Input DataFrame (must be sorted by date)
         target_col: Target column name
         lag_periods: List of lag periods to create
+        group_col: Column identifying independent series (e.g. road segment);
+            features are computed within each group, whose rows must be in
+            time order (None for a single series)
     
     Returns:
         DataFrame with lag features added
     """
     df = df.copy()
+    if group_col is not None:
+        order, group_start = _group_layout(df, group_col)
+        values = _gather(df[target_col], order)
     
     for lag in lag_periods:
         col_name = f'{target_col}_lag_{lag}'
-        df[col_name] = df[target_col].shift(lag)
+        if group_col is None:
+            df[col_name] = df[target_col].shift(lag)
+        else:
+            df[col_name] = _scatter(_shift_within_groups(values, group_start, lag), order)
         logger.info(f"Created lag feature: {col_name}")
     
     return df
@@ -120,7 +199,8 @@ def create_lag_features(
 def create_diff_features(
     df: pd.DataFrame,
     target_col: str,
-    diff_periods: List[int] = [1, 7]
+    diff_periods: List[int] = [1, 7],
+    group_col: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Create difference features (change from previous period).
@@ -129,15 +209,25 @@ def create_diff_features(
         df: Input DataFrame
         target_col: Target column name
         diff_periods: List of differencing periods
+        group_col: Column identifying independent series (e.g. road segment);
+            features are computed within each group, whose rows must be in
+            time order (None for a single series)
     
     Returns:
         DataFrame with difference features added
     """
     df = df.copy()
+    if group_col is not None:
+        order, group_start = _group_layout(df, group_col)
+        values = _gather(df[target_col], order)
     
     for period in diff_periods:
         col_name = f'{target_col}_diff_{period}'
-        df[col_name] = df[target_col].diff(period)
+        if group_col is None:
+            df[col_name] = df[target_col].diff(period)
+        else:
+            shifted = _shift_within_groups(values, group_start, period)
+            df[col_name] = _scatter(values - shifted, order)
         logger.info(f"Created diff feature: {col_name}")
     
     return df
@@ -150,41 +240,41 @@ def create_diff_features(
 def create_rolling_features(
     df: pd.DataFrame,
     target_col: str,
-    windows: List[int] = [7, 14, 30]
+    windows: List[int] = [7, 14, 30],
+    group_col: Optional[str] = None,
+    dtype: Union[str, np.dtype] = np.float64
 ) -> pd.DataFrame:
     """
     Create rolling window features (mean, std, min, max).
     
+    All windows and statistics come from one rolling_stats kernel pass
+    instead of a separate pandas rolling pass per statistic and window.
+    
     Args:
         df: Input DataFrame
         target_col: Target column name
         windows: List of window sizes
+        group_col: Column identifying independent series (e.g. road segment);
+            features are computed within each group, whose rows must be in
+            time order (None for a single series)
+        dtype: Output dtype of the rolling columns (np.float64 or np.float32)
     
     Returns:
         DataFrame with rolling features added
     """
     df = df.copy()
+    order, group_start = (None, None) if group_col is None else _group_layout(df, group_col)
+    
+    # Group-sorted values, windows clipped at segment boundaries
+    stats = rolling_window_stats(
+        _gather(df[target_col], order), windows,
+        group_start=group_start, dtype=dtype
+    )
     
     for window in windows:
-        # Rolling mean
-        df[f'{target_col}_rolling_mean_{window}'] = (
-            df[target_col].rolling(window=window, min_periods=1).mean()
-        )
-        
-        # Rolling std
-        df[f'{target_col}_rolling_std_{window}'] = (
-            df[target_col].rolling(window=window, min_periods=1).std()
-        )
-        
-        # Rolling min
-        df[f'{target_col}_rolling_min_{window}'] = (
-            df[target_col].rolling(window=window, min_periods=1).min()
-        )
-        
-        # Rolling max
-        df[f'{target_col}_rolling_max_{window}'] = (
-            df[target_col].rolling(window=window, min_periods=1).max()
-        )
+        # Rolling mean, std, min, max
+        for stat in ['mean', 'std', 'min', 'max']:
+            df[f'{target_col}_rolling_{stat}_{window}'] = _scatter(stats[(stat, window)], order)
         
         logger.info(f"Created rolling features for window={window}")
     
@@ -194,7 +284,8 @@ def create_rolling_features(
 def create_ewm_features(
     df: pd.DataFrame,
     target_col: str,
-    spans: List[int] = [7, 14, 30]
+    spans: List[int] = [7, 14, 30],
+    group_col: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Create exponentially weighted moving average features.
@@ -203,15 +294,24 @@ def create_ewm_features(
         df: Input DataFrame
         target_col: Target column name
         spans: List of span values for EWM
+        group_col: Column identifying independent series (e.g. road segment);
+            features are computed within each group, whose rows must be in
+            time order (None for a single series)
     
     Returns:
         DataFrame with EWM features added
     """
     df = df.copy()
+    if group_col is not None:
+        order, group_start = _group_layout(df, group_col)
+        values = _gather(df[target_col], order)
     
     for span in spans:
         col_name = f'{target_col}_ewm_{span}'
-        df[col_name] = df[target_col].ewm(span=span, adjust=False).mean()
+        if group_col is None:
+            df[col_name] = df[target_col].ewm(span=span, adjust=False).mean()
+        else:
+            df[col_name] = _scatter(_ewm_within_groups(values, group_start, span), order)
         logger.info(f"Created EWM feature: {col_name}")
     
     return df
@@ -286,7 +386,9 @@ def create_model_features(
     datetime_col: str = 'date',
     lag_periods: List[int] = [1, 7, 14, 30],
     rolling_windows: List[int] = [7, 14, 30],
-    include_cyclical: bool = True
+    include_cyclical: bool = True,
+    holidays: Optional[pd.DataFrame] = None,
+    group_col: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Main feature engineering pipeline.
@@ -298,6 +400,10 @@ def create_model_features(
         lag_periods: Lag periods to create
         rolling_windows: Rolling window sizes
         include_cyclical: Whether to include cyclical encoding
+        holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+        group_col: Column identifying independent series (e.g. road segment);
+            the frame is sorted once by (group_col, datetime_col) and every
+            lag/rolling/EWM feature is computed within its group
     
     Returns:
         DataFrame with all engineered features
@@ -305,19 +411,23 @@ def create_model_features(
     logger.info("Starting feature engineering pipeline...")
     
     # 1. Temporal features
-    df = create_temporal_features(df, datetime_col)
+    df = create_temporal_features(df, datetime_col, holidays)
+    
+    # Sort once so each segment is contiguous and in time order for steps 2-5
+    if group_col is not None:
+        df = df.sort_values([group_col, datetime_col], kind='stable')
     
     # 2. Lag features
-    df = create_lag_features(df, target_col, lag_periods)
+    df = create_lag_features(df, target_col, lag_periods, group_col)
     
     # 3. Difference features
-    df = create_diff_features(df, target_col, [1, 7])
+    df = create_diff_features(df, target_col, [1, 7], group_col)
     
     # 4. Rolling features
-    df = create_rolling_features(df, target_col, rolling_windows)
+    df = create_rolling_features(df, target_col, rolling_windows, group_col)
     
     # 5. EWM features
-    df = create_ewm_features(df, target_col, [7, 14])
+    df = create_ewm_features(df, target_col, [7, 14], group_col)
     
     # 6. Interaction features
     df = create_interaction_features(df)
@@ -338,6 +448,209 @@ def create_model_features(
     return df
 
 
+def get_model_feature_names(
+    target_col: str = 'congestion_index',
+    lag_periods: List[int] = [1, 7, 14, 30],
+    rolling_windows: List[int] = [7, 14, 30],
+    include_cyclical: bool = True
+) -> List[str]:
+    """
+    Get the columns create_model_features adds, in the order it adds them.
+    
+    Args:
+        target_col: Target column name
+        lag_periods: Lag periods to create
+        rolling_windows: Rolling window sizes
+        include_cyclical: Whether to include cyclical encoding
+    
+    Returns:
+        List of engineered column names
+    """
+    names = [
+        'year', 'month', 'day', 'dayofweek', 'dayofyear', 'weekofyear',
+        'quarter', 'is_weekend', 'is_month_start', 'is_month_end',
+        'season', 'is_holiday'
+    ]
+    names += [f'{target_col}_lag_{lag}' for lag in lag_periods]
+    names += [f'{target_col}_diff_{period}' for period in [1, 7]]
+    for window in rolling_windows:
+        names += [f'{target_col}_rolling_{stat}_{window}'
+                  for stat in ['mean', 'std', 'min', 'max']]
+    names += [f'{target_col}_ewm_{span}' for span in [7, 14]]
+    names += ['weekend_x_month', 'holiday_x_dayofweek']
+    if include_cyclical:
+        names += ['month_sin', 'month_cos', 'dayofweek_sin', 'dayofweek_cos']
+    return names
+
+
+def create_model_features_fused(
+    df: pd.DataFrame,
+    target_col: str = 'congestion_index',
+    datetime_col: str = 'date',
+    lag_periods: List[int] = [1, 7, 14, 30],
+    rolling_windows: List[int] = [7, 14, 30],
+    include_cyclical: bool = True,
+    holidays: Optional[pd.DataFrame] = None,
+    group_col: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Single-pass version of create_model_features.
+    
+    Produces the same columns in the same order as the chained pipeline, but
+    every engineered column is written once into a preallocated block instead
+    of copying the growing frame at each step. Integer calendar columns are
+    returned as int64.
+    
+    Args:
+        df: Input DataFrame
+        target_col: Target column name
+        datetime_col: Datetime column name
+        lag_periods: Lag periods to create
+        rolling_windows: Rolling window sizes
+        include_cyclical: Whether to include cyclical encoding
+        holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+        group_col: Column identifying independent series (e.g. road segment);
+            the frame is sorted once by (group_col, datetime_col) and every
+            lag/rolling/EWM feature is computed within its group
+    
+    Returns:
+        DataFrame with all engineered features
+    """
+    logger.info("Starting fused feature engineering pipeline...")
+    
+    n = len(df)
+    dates = pd.to_datetime(df[datetime_col])
+    group_start = None
+    if group_col is not None:
+        # Sort once so each segment is contiguous and in time order
+        df = df.assign(**{datetime_col: dates})
+        df = df.sort_values([group_col, datetime_col], kind='stable')
+        dates = df[datetime_col]
+        _, group_start = _group_layout(df, group_col)
+    values = df[target_col].to_numpy(dtype=np.float64)
+    target = pd.Series(values, index=df.index)
+    
+    # Column layout (mirrors the order of the chained pipeline)
+    int_cols = [
+        'year', 'month', 'day', 'dayofweek', 'dayofyear', 'weekofyear',
+        'quarter', 'is_weekend', 'is_month_start', 'is_month_end',
+        'is_holiday', 'weekend_x_month', 'holiday_x_dayofweek'
+    ]
+    float_cols = (
+        [f'{target_col}_lag_{lag}' for lag in lag_periods]
+        + [f'{target_col}_diff_{period}' for period in [1, 7]]
+        + [f'{target_col}_rolling_{stat}_{window}'
+           for window in rolling_windows
+           for stat in ['mean', 'std', 'min', 'max']]
+        + [f'{target_col}_ewm_{span}' for span in [7, 14]]
+    )
+    if include_cyclical:
+        float_cols += ['month_sin', 'month_cos', 'dayofweek_sin', 'dayofweek_cos']
+    
+    int_block = np.empty((n, len(int_cols)), dtype=np.int64)
+    float_block = np.empty((n, len(float_cols)), dtype=np.float64)
+    icol = {name: j for j, name in enumerate(int_cols)}
+    fcol = {name: j for j, name in enumerate(float_cols)}
+    
+    # 1. Temporal features (computed per distinct timestamp, then broadcast)
+    codes, uniques = pd.factorize(dates, use_na_sentinel=False)
+    timestamps = pd.Series(uniques)
+    dt = timestamps.dt
+    for name, part in [
+        ('year', dt.year), ('month', dt.month), ('day', dt.day),
+        ('dayofweek', dt.dayofweek), ('dayofyear', dt.dayofyear),
+        ('weekofyear', dt.isocalendar().week), ('quarter', dt.quarter),
+        ('is_month_start', dt.is_month_start), ('is_month_end', dt.is_month_end),
+    ]:
+        np.take(part.to_numpy(dtype=np.int64), codes, out=int_block[:, icol[name]])
+    
+    month = int_block[:, icol['month']]
+    dayofweek = int_block[:, icol['dayofweek']]
+    int_block[:, icol['is_weekend']] = dayofweek >= 5
+    
+    # Thai holidays and season from the calendar table
+    calendar = calendar_lookup(timestamps, ['is_holiday', 'season'], holidays=holidays)
+    np.take(calendar['is_holiday'].to_numpy(dtype=np.int64), codes,
+            out=int_block[:, icol['is_holiday']])
+    season = pd.Series(calendar['season'].array.take(codes), index=df.index, name='season')
+    
+    # 2. Lag features
+    for lag in lag_periods:
+        out = float_block[:, fcol[f'{target_col}_lag_{lag}']]
+        if group_col is not None:
+            out[:] = _shift_within_groups(values, group_start, lag)
+            continue
+        k = min(lag, n)
+        out[:k] = np.nan
+        out[k:] = values[:n - k]
+    
+    # 3. Difference features
+    for period in [1, 7]:
+        out = float_block[:, fcol[f'{target_col}_diff_{period}']]
+        if group_col is not None:
+            np.subtract(values, _shift_within_groups(values, group_start, period), out=out)
+            continue
+        k = min(period, n)
+        out[:k] = np.nan
+        np.subtract(values[k:], values[:n - k], out=out[k:])
+    
+    # 4. Rolling features (all windows in one kernel pass)
+    rolling = rolling_window_stats(values, rolling_windows, group_start=group_start)
+    for (stat, window), result in rolling.items():
+        float_block[:, fcol[f'{target_col}_rolling_{stat}_{window}']] = result
+    
+    # 5. EWM features
+    for span in [7, 14]:
+        float_block[:, fcol[f'{target_col}_ewm_{span}']] = (
+            target.ewm(span=span, adjust=False).mean() if group_col is None
+            else _ewm_within_groups(values, group_start, span)
+        )
+    
+    # 6. Interaction features
+    np.multiply(int_block[:, icol['is_weekend']], month,
+                out=int_block[:, icol['weekend_x_month']])
+    np.multiply(int_block[:, icol['is_holiday']], dayofweek,
+                out=int_block[:, icol['holiday_x_dayofweek']])
+    
+    # 7. Cyclical features
+    if include_cyclical:
+        for col, src, max_val in [('month', month, 12), ('dayofweek', dayofweek, 7)]:
+            angle = 2 * np.pi * src / max_val
+            np.sin(angle, out=float_block[:, fcol[f'{col}_sin']])
+            np.cos(angle, out=float_block[:, fcol[f'{col}_cos']])
+    
+    # Assemble once: original columns keep their position, new ones follow
+    new_cols = get_model_feature_names(
+        target_col, lag_periods, rolling_windows, include_cyclical
+    )
+    replaced = [col for col in new_cols + [datetime_col] if col in df.columns]
+    ordered = list(df.columns) + [col for col in new_cols if col not in df.columns]
+    
+    result = pd.concat(
+        [
+            df.drop(columns=replaced),
+            dates.rename(datetime_col),
+            pd.DataFrame(int_block, index=df.index, columns=int_cols, copy=False),
+            season,
+            pd.DataFrame(float_block, index=df.index, columns=float_cols, copy=False),
+        ],
+        axis=1
+    )
+    
+    # Drop rows with NaN from lagging (single row/column selection)
+    keep = ~np.isnan(float_block).any(axis=1)
+    keep &= dates.notna().to_numpy()
+    kept_original = [col for col in df.columns if col not in replaced]
+    if kept_original:
+        keep &= df[kept_original].notna().all(axis=1).to_numpy()
+    result = result.loc[keep, ordered]
+    
+    logger.info(f"Fused feature engineering complete. Created {len(result.columns)} features.")
+    logger.info(f"Dropped {n - len(result)} rows with NaN values.")
+    
+    return result
+
+
 def get_feature_columns(
     df: pd.DataFrame,
     target_col: str = 'congestion_index',
@@ -393,6 +706,496 @@ def prepare_train_test_data(
     return X_train, X_test, y_train, y_test
 
 
+# ============================================================================
+# LAZY FEATURE GRAPH
+# ============================================================================
+
+CALENDAR_FEATURES = [
+    'year', 'month', 'day', 'dayofweek', 'dayofyear', 'weekofyear',
+    'quarter', 'is_weekend', 'is_month_start', 'is_month_end',
+    'season', 'is_holiday'
+]
+
+# Period of each calendar column that can be cyclically encoded
+CYCLICAL_PERIODS = {'month': 12, 'dayofweek': 7}
+
+
+class FeatureGraph:
+    """
+    Declarative graph of the features create_model_features can produce.
+    
+    Every feature is a node naming the columns it depends on and how to
+    compute it from them. build() resolves a requested feature list (e.g. a
+    saved model's inputs) to the nodes it needs, in dependency order, and
+    computes only those. Parametric names are resolved by pattern, so any
+    lag/diff/rolling/EWM period works, not just the pipeline defaults.
+    
+    Columns already present in the input (weather, traffic volume, ...) are
+    leaf nodes and are passed through unchanged.
+    """
+    
+    def __init__(
+        self,
+        target_col: str = 'congestion_index',
+        datetime_col: str = 'date',
+        holidays: Optional[pd.DataFrame] = None,
+        group_col: Optional[str] = None
+    ):
+        """
+        Args:
+            target_col: Target column name
+            datetime_col: Datetime column name
+            holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+            group_col: Column identifying independent series (see create_model_features)
+        """
+        self.target_col = target_col
+        self.datetime_col = datetime_col
+        self.holidays = holidays
+        self.group_col = group_col
+        
+        prefix = re.escape(target_col)
+        self._patterns = [
+            (re.compile(rf'^{prefix}_lag_(\d+)$'), self._lag_node),
+            (re.compile(rf'^{prefix}_diff_(\d+)$'), self._diff_node),
+            (re.compile(rf'^{prefix}_rolling_(mean|std|min|max)_(\d+)$'), self._rolling_node),
+            (re.compile(rf'^{prefix}_ewm_(\d+)$'), self._ewm_node),
+            (re.compile(rf'^({"|".join(CYCLICAL_PERIODS)})_(sin|cos)$'), self._cyclical_node),
+        ]
+        self._nodes = {name: ((datetime_col,), self._calendar_value(name))
+                       for name in CALENDAR_FEATURES}
+        self._nodes['weekend_x_month'] = (
+            ('is_weekend', 'month'), lambda ctx: ctx['is_weekend'] * ctx['month']
+        )
+        self._nodes['holiday_x_dayofweek'] = (
+            ('is_holiday', 'dayofweek'), lambda ctx: ctx['is_holiday'] * ctx['dayofweek']
+        )
+    
+    # ------------------------------------------------------------------
+    # Node definitions
+    # ------------------------------------------------------------------
+    
+    def _calendar_value(self, name: str) -> Callable:
+        def compute(ctx):
+            # Calendar columns are evaluated once on the distinct timestamps
+            if '_calendar' not in ctx:
+                codes, uniques = pd.factorize(ctx[self.datetime_col], use_na_sentinel=False)
+                ctx['_calendar'] = (
+                    codes, create_temporal_features(pd.DataFrame({'ts': uniques}), 'ts', self.holidays)
+                )
+            codes, calendar = ctx['_calendar']
+            values = calendar[name].array.take(codes)
+            return values if name == 'season' else values.to_numpy()
+        return compute
+    
+    def _lag_node(self, lag: str):
+        lag = int(lag)
+        return (self.target_col,), lambda ctx: _shift_within_groups(
+            ctx['_values'], ctx['_group_start'], lag
+        )
+    
+    def _diff_node(self, period: str):
+        period = int(period)
+        return (self.target_col,), lambda ctx: ctx['_values'] - _shift_within_groups(
+            ctx['_values'], ctx['_group_start'], period
+        )
+    
+    def _rolling_node(self, stat: str, window: str):
+        # Filled in bulk by build(): one kernel pass for all requested windows
+        return (self.target_col,), None
+    
+    def _ewm_node(self, span: str):
+        span = int(span)
+        
+        def compute(ctx):
+            if self.group_col is None:
+                return pd.Series(ctx['_values']).ewm(span=span, adjust=False).mean().to_numpy()
+            return _ewm_within_groups(ctx['_values'], ctx['_group_start'], span)
+        return (self.target_col,), compute
+    
+    def _cyclical_node(self, col: str, func: str):
+        max_val = CYCLICAL_PERIODS[col]
+        trig = np.sin if func == 'sin' else np.cos
+        return (col,), lambda ctx: trig(2 * np.pi * ctx[col] / max_val)
+    
+    def node(self, name: str) -> Tuple[Tuple[str, ...], Optional[Callable]]:
+        """
+        Look up a feature's (dependencies, compute) definition.
+        
+        Raises:
+            KeyError: If the name is not a feature this graph can produce
+        """
+        if name in self._nodes:
+            return self._nodes[name]
+        for pattern, factory in self._patterns:
+            match = pattern.match(name)
+            if match:
+                return factory(*match.groups())
+        raise KeyError(name)
+    
+    # ------------------------------------------------------------------
+    # Planning and execution
+    # ------------------------------------------------------------------
+    
+    def plan(self, features: List[str], available: List[str]) -> List[str]:
+        """
+        Order the nodes needed for features (dependencies first).
+        
+        Args:
+            features: Requested feature names
+            available: Columns present in the input frame
+        
+        Returns:
+            Feature names to compute, in a valid evaluation order
+        """
+        available = set(available)
+        order, visiting, done = [], set(), set()
+        unresolved = []
+        
+        def visit(name):
+            if name in done or name in available:
+                return
+            if name in visiting:
+                raise ValueError(f"Feature graph has a cycle at {name}")
+            try:
+                deps, _ = self.node(name)
+            except KeyError:
+                if name not in available:
+                    unresolved.append(name)
+                return
+            visiting.add(name)
+            for dep in deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+        
+        # Columns already in the input are leaves and used as-is
+        for name in features:
+            visit(name)
+        
+        if unresolved:
+            raise ValueError(f"Cannot build features {unresolved}: not in the input "
+                             f"and not derivable by the feature graph")
+        return order
+    
+    def build(
+        self,
+        df: pd.DataFrame,
+        features: List[str],
+        dropna: bool = True
+    ) -> pd.DataFrame:
+        """
+        Compute only the requested features.
+        
+        With dropna, rows with NaN in any requested feature are dropped. This
+        can keep more rows than create_model_features, which also drops rows
+        made NaN by features the model does not use (e.g. a longer lag).
+        
+        Args:
+            df: Input DataFrame (raw or partially engineered)
+            features: Feature names in model input order
+            dropna: Drop rows with NaN in the requested features
+        
+        Returns:
+            DataFrame with exactly the requested columns, in that order
+        """
+        steps = self.plan(features, list(df.columns))
+        
+        if self.group_col is not None:
+            # Sort once, as create_model_features does
+            df = df.assign(**{self.datetime_col: pd.to_datetime(df[self.datetime_col])})
+            df = df.sort_values([self.group_col, self.datetime_col], kind='stable')
+        
+        ctx: Dict[str, Any] = {}
+        if self.datetime_col in df.columns:
+            ctx[self.datetime_col] = pd.to_datetime(df[self.datetime_col])
+        
+        if any(self.target_col in self.node(name)[0] for name in steps):
+            ctx['_values'] = _gather(df[self.target_col], None)
+            if self.group_col is None:
+                ctx['_group_start'] = np.zeros(len(df), dtype=np.int64)
+            else:
+                ctx['_group_start'] = _group_layout(df, self.group_col)[1]
+        
+        # All rolling nodes share one kernel pass
+        rolling = [name for name in steps if self.node(name)[1] is None]
+        if rolling:
+            specs = [name[len(self.target_col) + len('_rolling_'):].split('_') for name in rolling]
+            stats = rolling_window_stats(
+                ctx['_values'],
+                sorted({int(window) for _, window in specs}),
+                stats=sorted({stat for stat, _ in specs}),
+                group_start=None if self.group_col is None else ctx['_group_start']
+            )
+            for name, (stat, window) in zip(rolling, specs):
+                ctx[name] = stats[(stat, int(window))]
+        
+        for name in steps:
+            if name in ctx:
+                continue
+            deps, compute = self.node(name)
+            for dep in deps:
+                if dep not in ctx:
+                    ctx[dep] = df[dep].to_numpy()
+            ctx[name] = compute(ctx)
+        
+        result = pd.DataFrame(
+            {name: ctx[name] if name in ctx else df[name] for name in features},
+            index=df.index
+        )
+        if dropna:
+            result = result.dropna()
+        
+        logger.info(f"Feature graph built {len(features)} requested features "
+                    f"({len(steps)} computed nodes, {len(result)} rows)")
+        return result
+
+
+def create_features_for_model(
+    df: pd.DataFrame,
+    model: Any = None,
+    feature_names: Optional[List[str]] = None,
+    target_col: str = 'congestion_index',
+    datetime_col: str = 'date',
+    holidays: Optional[pd.DataFrame] = None,
+    group_col: Optional[str] = None,
+    dropna: bool = True
+) -> pd.DataFrame:
+    """
+    Build exactly the input columns a trained model consumes.
+    
+    Feature names come from feature_names (e.g. the get_feature_columns list
+    saved at training time) or from the model itself (feature_names_in_);
+    the count is checked against n_features_in_.
+    
+    Args:
+        df: Input DataFrame
+        model: Trained model (optional if feature_names is given)
+        feature_names: Model input columns in training order
+        target_col: Target column name
+        datetime_col: Datetime column name
+        holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+        group_col: Column identifying independent series
+        dropna: Drop rows with NaN in the requested features
+    
+    Returns:
+        DataFrame whose columns are the model inputs, in order
+    """
+    from model_utils import get_feature_names
+    
+    names = get_feature_names(model, feature_names) if model is not None else feature_names
+    if not names:
+        raise ValueError("Model does not record its feature names; pass feature_names "
+                         "(the get_feature_columns list used for training)")
+    
+    expected = getattr(model, 'n_features_in_', None)
+    if expected is not None and expected != len(names):
+        raise ValueError(f"Model expects {expected} features, got {len(names)} names")
+    
+    graph = FeatureGraph(target_col, datetime_col, holidays, group_col)
+    return graph.build(df, list(names), dropna=dropna)
+
+
+# ============================================================================
+# ONLINE (STREAMING) FEATURES
+# ============================================================================
+
+class OnlineFeatureState:
+    """
+    Incremental state for target-derived features on a streaming series.
+    
+    Holds a ring buffer for lags/diffs, running moments and monotonic deques
+    for rolling mean/std/min/max, and EWM accumulators, so each new reading
+    costs O(1) (amortised) instead of re-running the batch functions over the
+    whole history. Output matches create_lag_features, create_diff_features,
+    create_rolling_features (min_periods=1) and create_ewm_features row by row;
+    rolling mean/std agree to floating-point tolerance, everything else is
+    exact.
+    """
+    
+    def __init__(
+        self,
+        target_col: str = 'congestion_index',
+        lag_periods: List[int] = [1, 7, 14, 30],
+        diff_periods: List[int] = [1, 7],
+        rolling_windows: List[int] = [7, 14, 30],
+        ewm_spans: List[int] = [7, 14]
+    ):
+        """
+        Initialize empty feature state.
+        
+        Args:
+            target_col: Target column name (used for feature names)
+            lag_periods: Lag periods to track
+            diff_periods: Differencing periods to track
+            rolling_windows: Rolling window sizes to track
+            ewm_spans: Span values for EWM
+        """
+        self.target_col = target_col
+        self.lag_periods = list(lag_periods)
+        self.diff_periods = list(diff_periods)
+        self.rolling_windows = list(rolling_windows)
+        self.ewm_spans = list(ewm_spans)
+        
+        # Ring buffer of raw values (NaN included)
+        self._capacity = max(
+            self.lag_periods + self.diff_periods + self.rolling_windows + [1]
+        ) + 1
+        self._buffer = [np.nan] * self._capacity
+        self.n_seen = 0
+        self.last_timestamp = None
+        
+        # Rolling state per window: Welford moments + min/max deques of (t, value)
+        self._rolling = {
+            window: {'nobs': 0, 'mean': 0.0, 'm2': 0.0,
+                     'min': deque(), 'max': deque()}
+            for window in self.rolling_windows
+        }
+        
+        # EWM state per span (pandas adjust=False recursion)
+        self._ewm = {
+            span: {'alpha': 2.0 / (span + 1.0), 'weighted': np.nan, 'old_wt': 1.0}
+            for span in self.ewm_spans
+        }
+    
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the features returned by update(), in order."""
+        target_col = self.target_col
+        names = [f'{target_col}_lag_{lag}' for lag in self.lag_periods]
+        names += [f'{target_col}_diff_{period}' for period in self.diff_periods]
+        for window in self.rolling_windows:
+            names += [f'{target_col}_rolling_{stat}_{window}'
+                      for stat in ['mean', 'std', 'min', 'max']]
+        names += [f'{target_col}_ewm_{span}' for span in self.ewm_spans]
+        return names
+    
+    def copy(self) -> 'OnlineFeatureState':
+        """Independent copy of the state, e.g. to branch a forecast from it."""
+        clone = copy.copy(self)
+        clone._buffer = list(self._buffer)
+        clone._rolling = {
+            window: {**state, 'min': deque(state['min']), 'max': deque(state['max'])}
+            for window, state in self._rolling.items()
+        }
+        clone._ewm = {span: dict(state) for span, state in self._ewm.items()}
+        return clone
+    
+    def _value_at(self, lag: int) -> float:
+        """Return the value observed `lag` steps before the latest one."""
+        if lag >= self.n_seen:
+            return np.nan
+        return self._buffer[(self.n_seen - 1 - lag) % self._capacity]
+    
+    def _update_rolling(self, t: int, value: float) -> List[float]:
+        """Slide every rolling window forward by one observation."""
+        out = []
+        is_obs = value == value
+        for window, state in self._rolling.items():
+            # Drop the value leaving the window
+            if t >= window:
+                old = self._buffer[(t - window) % self._capacity]
+                if old == old:
+                    state['nobs'] -= 1
+                    if state['nobs'] == 0:
+                        state['mean'] = 0.0
+                        state['m2'] = 0.0
+                    else:
+                        delta = old - state['mean']
+                        state['mean'] -= delta / state['nobs']
+                        state['m2'] -= delta * (old - state['mean'])
+            
+            # Add the new value
+            if is_obs:
+                state['nobs'] += 1
+                delta = value - state['mean']
+                state['mean'] += delta / state['nobs']
+                state['m2'] += delta * (value - state['mean'])
+            
+            # Monotonic deques for min/max
+            mins, maxs = state['min'], state['max']
+            while mins and mins[0][0] <= t - window:
+                mins.popleft()
+            while maxs and maxs[0][0] <= t - window:
+                maxs.popleft()
+            if is_obs:
+                while mins and mins[-1][1] >= value:
+                    mins.pop()
+                mins.append((t, value))
+                while maxs and maxs[-1][1] <= value:
+                    maxs.pop()
+                maxs.append((t, value))
+            
+            nobs = state['nobs']
+            if nobs == 0:
+                out += [np.nan, np.nan, np.nan, np.nan]
+                continue
+            
+            w_min, w_max = mins[0][1], maxs[0][1]
+            if w_min == w_max:
+                # Constant window: avoid accumulated rounding error
+                mean, std = w_min, (0.0 if nobs > 1 else np.nan)
+            else:
+                mean = state['mean']
+                std = np.sqrt(max(state['m2'], 0.0) / (nobs - 1))
+            out += [mean, std, w_min, w_max]
+        return out
+    
+    def _update_ewm(self, value: float) -> List[float]:
+        """Advance every EWM accumulator by one observation."""
+        out = []
+        is_obs = value == value
+        for state in self._ewm.values():
+            weighted = state['weighted']
+            if weighted != weighted:
+                # First observation seeds the average
+                if is_obs:
+                    state['weighted'] = value
+            else:
+                alpha = state['alpha']
+                state['old_wt'] *= 1.0 - alpha
+                if is_obs:
+                    old_wt = state['old_wt']
+                    if weighted != value:
+                        state['weighted'] = (
+                            (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                        )
+                    state['old_wt'] = 1.0
+            out.append(state['weighted'])
+        return out
+    
+    def update(self, timestamp: Any, value: float) -> np.ndarray:
+        """
+        Add one observation and return its feature vector.
+        
+        Args:
+            timestamp: Observation timestamp (must be non-decreasing)
+            value: Target value (NaN allowed, treated like the batch functions)
+        
+        Returns:
+            Array of features ordered as feature_names
+        """
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(
+                f"Out-of-order observation: {timestamp} < {self.last_timestamp}"
+            )
+        
+        value = float(value)
+        t = self.n_seen
+        
+        features = [self._value_at(lag - 1) for lag in self.lag_periods]
+        features += [value - self._value_at(period - 1) for period in self.diff_periods]
+        features += self._update_rolling(t, value)
+        features += self._update_ewm(value)
+        
+        self._buffer[t % self._capacity] = value
+        self.n_seen += 1
+        self.last_timestamp = timestamp
+        
+        return np.array(features, dtype=np.float64)
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -0,0 +1,558 @@
+"""
+Feature Store Module for Bangkok Traffic Flow Optimization Project
+
+This module materialises engineered feature frames to Parquet so notebooks
+and scripts can reuse them instead of rebuilding features_engineered.csv
+from scratch with create_model_features.
+
+Entries are keyed by a hash of the input file fingerprints, the content of
+the input frame when one is passed, the holiday list and the feature
+configuration (lag_periods, rolling_windows, include_cyclical). When no exact
+entry exists, columns already materialised for the same inputs are reused and
+only the missing feature groups are computed. The store is bounded by total
+size and entry count, evicting least recently used entries first.
+
+Usage (CLI):
+    python feature_store.py list
+    python feature_store.py inspect <key>
+    python feature_store.py purge [<key> | --all | --older-than DAYS]
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import logging
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Union, Callable, Any
+
+from feature_engineering import (
+    create_temporal_features, create_lag_features, create_diff_features,
+    create_rolling_features, create_ewm_features, create_interaction_features,
+    create_cyclical_features, get_model_feature_names
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump when feature definitions change so stale entries are never reused
+# (2: calendar table holidays/seasons and the one-pass rolling kernel)
+FEATURE_STORE_VERSION = 2
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / '02_Data' / 'Feature_Store'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+
+# ============================================================================
+# KEYS & FINGERPRINTS
+# ============================================================================
+
+def fingerprint_files(filepaths: List[Union[str, Path]]) -> str:
+    """
+    Fingerprint input files by resolved path, size and modification time.
+    
+    Args:
+        filepaths: Input files the feature frame is derived from
+    
+    Returns:
+        Hex digest identifying the current state of the inputs
+    """
+    records = []
+    for filepath in sorted(str(Path(p).resolve()) for p in filepaths):
+        stat = os.stat(filepath)
+        records.append([filepath, stat.st_size, stat.st_mtime_ns])
+    
+    payload = json.dumps(records, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Fingerprint a DataFrame by its columns, dtypes, index and values.
+    
+    Args:
+        df: Frame to fingerprint
+    
+    Returns:
+        Hex digest that changes when any row, column or value changes
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def make_feature_key(
+    input_hash: str,
+    target_col: str,
+    datetime_col: str,
+    lag_periods: List[int],
+    rolling_windows: List[int],
+    include_cyclical: bool,
+    holidays_hash: Optional[str] = None
+) -> str:
+    """
+    Build the store key for one feature configuration.
+    
+    Args:
+        input_hash: Fingerprint of the inputs (see FeatureStore.get_model_features)
+        target_col: Target column name
+        datetime_col: Datetime column name
+        lag_periods: Lag periods
+        rolling_windows: Rolling window sizes
+        include_cyclical: Whether cyclical encoding is included
+        holidays_hash: Fingerprint of the holiday list (None for the fixed-date holidays)
+    
+    Returns:
+        Hex key for the entry
+    """
+    config = {
+        'version': FEATURE_STORE_VERSION,
+        'input_hash': input_hash,
+        'target_col': target_col,
+        'datetime_col': datetime_col,
+        'lag_periods': [int(x) for x in lag_periods],
+        'rolling_windows': [int(x) for x in rolling_windows],
+        'include_cyclical': bool(include_cyclical),
+        'holidays_hash': holidays_hash,
+    }
+    payload = json.dumps(config, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+# ============================================================================
+# FEATURE GROUPS
+# ============================================================================
+
+def _feature_groups(
+    target_col: str,
+    lag_periods: List[int],
+    rolling_windows: List[int],
+    include_cyclical: bool
+) -> Dict[str, List[str]]:
+    """Map each independently computable feature group to its columns."""
+    groups = {
+        'calendar': [
+            'year', 'month', 'day', 'dayofweek', 'dayofyear', 'weekofyear',
+            'quarter', 'is_weekend', 'is_month_start', 'is_month_end',
+            'season', 'is_holiday', 'weekend_x_month', 'holiday_x_dayofweek'
+        ],
+        'diff': [f'{target_col}_diff_{period}' for period in [1, 7]],
+        'ewm': [f'{target_col}_ewm_{span}' for span in [7, 14]],
+    }
+    for lag in lag_periods:
+        groups[f'lag_{lag}'] = [f'{target_col}_lag_{lag}']
+    for window in rolling_windows:
+        groups[f'rolling_{window}'] = [
+            f'{target_col}_rolling_{stat}_{window}'
+            for stat in ['mean', 'std', 'min', 'max']
+        ]
+    if include_cyclical:
+        groups['cyclical'] = ['month_sin', 'month_cos', 'dayofweek_sin', 'dayofweek_cos']
+    return groups
+
+
+def _compute_group(
+    name: str,
+    base: pd.DataFrame,
+    target_col: str,
+    datetime_col: str,
+    calendar: Optional[pd.DataFrame] = None,
+    holidays: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Compute one feature group (pre-dropna) from the date/target columns."""
+    src = base
+    if name == 'calendar':
+        df = create_interaction_features(create_temporal_features(src, datetime_col, holidays))
+    elif name == 'cyclical':
+        src = calendar[['month', 'dayofweek']]
+        df = create_cyclical_features(src, 'month', 12)
+        df = create_cyclical_features(df, 'dayofweek', 7)
+    elif name == 'diff':
+        df = create_diff_features(src, target_col, [1, 7])
+    elif name == 'ewm':
+        df = create_ewm_features(src, target_col, [7, 14])
+    elif name.startswith('lag_'):
+        df = create_lag_features(src, target_col, [int(name[4:])])
+    elif name.startswith('rolling_'):
+        df = create_rolling_features(src, target_col, [int(name[8:])])
+    else:
+        raise ValueError(f"Unknown feature group: {name}")
+    
+    return df.drop(columns=src.columns)
+
+
+# ============================================================================
+# FEATURE STORE
+# ============================================================================
+
+class FeatureStore:
+    """
+    Versioned on-disk store of engineered feature frames.
+    
+    The input frame is stored once per input fingerprint; each entry holds the
+    engineered (pre-dropna) feature columns for one configuration as a Parquet
+    file, described in a JSON index with its key, configuration, columns, size
+    and last access time.
+    """
+    
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_STORE_DIR,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize feature store.
+        
+        Args:
+            root: Store directory
+            max_bytes: Evict LRU entries when total size exceeds this
+            max_entries: Evict LRU entries when entry count exceeds this
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.index_path = self.root / 'index.json'
+    
+    # ------------------------------------------------------------------
+    # Index management
+    # ------------------------------------------------------------------
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, 'r') as f:
+            return json.load(f)
+    
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f'{key}.parquet'
+    
+    def _source_path(self, input_hash: str) -> Path:
+        return self.root / f'source_{input_hash}.parquet'
+    
+    def _read_parquet(self, path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        try:
+            return pd.read_parquet(path, columns=columns)
+        except ImportError:
+            logger.error("Parquet support not installed. Install with: pip install pyarrow")
+            raise
+    
+    def _write_parquet(self, df: pd.DataFrame, path: Path) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            df.to_parquet(path)
+        except ImportError:
+            logger.error("Parquet support not installed. Install with: pip install pyarrow")
+            raise
+    
+    def _touch(self, index: Dict[str, Dict[str, Any]], key: str) -> None:
+        index[key]['last_access'] = time.time()
+        index[key]['hits'] = index[key].get('hits', 0) + 1
+    
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    
+    def get_model_features(
+        self,
+        data: Union[pd.DataFrame, Callable[[], pd.DataFrame]],
+        source_files: List[Union[str, Path]],
+        target_col: str = 'congestion_index',
+        datetime_col: str = 'date',
+        lag_periods: List[int] = [1, 7, 14, 30],
+        rolling_windows: List[int] = [7, 14, 30],
+        include_cyclical: bool = True,
+        holidays: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Cached equivalent of create_model_features.
+        
+        A DataFrame passed as data is fingerprinted by content, so a filtered
+        or edited frame from the same files gets its own entry. A callable is
+        trusted to load the same frame whenever source_files are unchanged.
+        
+        Args:
+            data: Input DataFrame, or a callable that loads it (only called
+                when the inputs are not already in the store)
+            source_files: Files the input DataFrame is derived from
+            target_col: Target column name
+            datetime_col: Datetime column name
+            lag_periods: Lag periods to create
+            rolling_windows: Rolling window sizes
+            include_cyclical: Whether to include cyclical encoding
+            holidays: Dated holiday list from calendar_table.load_thai_holidays
+                (None for the fixed-date holidays)
+        
+        Returns:
+            DataFrame with all engineered features (same as create_model_features)
+        """
+        input_hash = fingerprint_files(source_files)
+        frame = None
+        if not callable(data):
+            frame = data
+            content_hash = fingerprint_frame(frame)
+            input_hash = hashlib.sha256(f'{input_hash}:{content_hash}'.encode()).hexdigest()[:16]
+        holidays_hash = fingerprint_frame(holidays) if holidays is not None else None
+        key = make_feature_key(
+            input_hash, target_col, datetime_col,
+            lag_periods, rolling_windows, include_cyclical, holidays_hash
+        )
+        feature_cols = get_model_feature_names(
+            target_col, lag_periods, rolling_windows, include_cyclical
+        )
+        index = self._load_index()
+        source_path = self._source_path(input_hash)
+        
+        # Source frame is stored once per input fingerprint
+        if frame is None and source_path.exists():
+            frame = self._read_parquet(source_path)
+        else:
+            frame = data() if frame is None else frame
+            if not source_path.exists():
+                self._write_parquet(frame, source_path)
+        frame = frame.assign(**{datetime_col: pd.to_datetime(frame[datetime_col])})
+        
+        # 1. Exact hit
+        if key in index and self._entry_path(key).exists():
+            logger.info(f"Feature store hit: {key}")
+            features = self._read_parquet(self._entry_path(key))
+            self._touch(index, key)
+            self._save_index(index)
+            return self._assemble(frame, features, feature_cols)
+        
+        # 2. Reuse feature groups materialised for the same inputs
+        siblings = [
+            k for k, meta in index.items()
+            if meta['input_hash'] == input_hash
+            and meta['target_col'] == target_col
+            and meta['datetime_col'] == datetime_col
+            and meta['version'] == FEATURE_STORE_VERSION
+            and meta.get('holidays_hash') == holidays_hash
+            and self._entry_path(k).exists()
+        ]
+        groups = _feature_groups(target_col, lag_periods, rolling_windows, include_cyclical)
+        
+        computed = {}
+        missing_groups = []
+        for name, cols in groups.items():
+            owner = next(
+                (k for k in siblings if set(cols) <= set(index[k]['feature_columns'])),
+                None
+            )
+            if owner is not None:
+                computed[name] = self._read_parquet(self._entry_path(owner), columns=cols)
+                self._touch(index, owner)
+            else:
+                missing_groups.append(name)
+        
+        if computed:
+            logger.info(f"Feature store partial hit: reusing {len(computed)} groups, "
+                        f"computing {len(missing_groups)}")
+        else:
+            logger.info(f"Feature store miss: computing {len(missing_groups)} groups")
+        
+        base = frame[[datetime_col, target_col]]
+        # Cyclical encoding depends on the calendar group
+        for name in sorted(missing_groups, key=lambda g: g == 'cyclical'):
+            computed[name] = _compute_group(
+                name, base, target_col, datetime_col, calendar=computed.get('calendar'),
+                holidays=holidays
+            )
+        
+        features = pd.concat(computed.values(), axis=1)[feature_cols]
+        entry_path = self._entry_path(key)
+        self._write_parquet(features, entry_path)
+        
+        now = time.time()
+        index[key] = {
+            'key': key,
+            'version': FEATURE_STORE_VERSION,
+            'input_hash': input_hash,
+            'source_files': [str(Path(p).resolve()) for p in source_files],
+            'target_col': target_col,
+            'datetime_col': datetime_col,
+            'lag_periods': [int(x) for x in lag_periods],
+            'rolling_windows': [int(x) for x in rolling_windows],
+            'include_cyclical': bool(include_cyclical),
+            'holidays_hash': holidays_hash,
+            'feature_columns': feature_cols,
+            'n_rows': len(features),
+            'size_bytes': entry_path.stat().st_size,
+            'created': now,
+            'last_access': now,
+            'hits': 0,
+        }
+        self._evict(index, keep=key)
+        self._save_index(index)
+        
+        logger.info(f"Feature store saved entry {key} ({index[key]['size_bytes'] / 1e6:.2f} MB)")
+        return self._assemble(frame, features, feature_cols)
+    
+    @staticmethod
+    def _assemble(
+        frame: pd.DataFrame,
+        features: pd.DataFrame,
+        feature_cols: List[str]
+    ) -> pd.DataFrame:
+        """Combine source and feature columns as create_model_features does."""
+        features = features.set_axis(frame.index)
+        replaced = [col for col in feature_cols if col in frame.columns]
+        ordered = list(frame.columns) + [c for c in feature_cols if c not in frame.columns]
+        result = pd.concat([frame.drop(columns=replaced), features], axis=1)[ordered]
+        return result.dropna()
+    
+    def list_entries(self) -> pd.DataFrame:
+        """
+        List store entries, most recently used first.
+        
+        Returns:
+            DataFrame with one row per entry
+        """
+        index = self._load_index()
+        columns = ['key', 'n_rows', 'size_bytes', 'lag_periods', 'rolling_windows',
+                   'include_cyclical', 'hits', 'created', 'last_access']
+        if not index:
+            return pd.DataFrame(columns=columns)
+        
+        entries = pd.DataFrame([
+            {col: meta.get(col) for col in columns} for meta in index.values()
+        ])
+        for col in ['created', 'last_access']:
+            entries[col] = pd.to_datetime(entries[col], unit='s')
+        return entries.sort_values('last_access', ascending=False).reset_index(drop=True)
+    
+    def inspect(self, key: str) -> Dict[str, Any]:
+        """
+        Get the metadata of one entry.
+        
+        Args:
+            key: Entry key (a unique prefix is accepted)
+        
+        Returns:
+            Entry metadata dictionary
+        """
+        index = self._load_index()
+        matches = [k for k in index if k.startswith(key)]
+        if len(matches) != 1:
+            raise KeyError(f"No unique feature store entry for key: {key}")
+        return index[matches[0]]
+    
+    def purge(
+        self,
+        key: Optional[str] = None,
+        older_than_days: Optional[float] = None
+    ) -> int:
+        """
+        Delete entries from the store.
+        
+        Args:
+            key: Entry key to delete (default: all entries)
+            older_than_days: Only delete entries not used for this many days
+        
+        Returns:
+            Number of entries deleted
+        """
+        index = self._load_index()
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        
+        to_delete = [
+            k for k, meta in index.items()
+            if (key is None or k.startswith(key))
+            and (cutoff is None or meta['last_access'] < cutoff)
+        ]
+        for k in to_delete:
+            self._entry_path(k).unlink(missing_ok=True)
+            del index[k]
+        
+        self._remove_orphan_sources(index)
+        self._save_index(index)
+        logger.info(f"Purged {len(to_delete)} feature store entries")
+        return len(to_delete)
+    
+    def _remove_orphan_sources(self, index: Dict[str, Dict[str, Any]]) -> None:
+        """Delete source frames no longer referenced by any entry."""
+        live = {meta['input_hash'] for meta in index.values()}
+        for path in self.root.glob('source_*.parquet'):
+            if path.stem[len('source_'):] not in live:
+                path.unlink(missing_ok=True)
+    
+    def _evict(self, index: Dict[str, Dict[str, Any]], keep: Optional[str] = None) -> None:
+        """Evict least recently used entries until size/count limits hold."""
+        def total_bytes() -> int:
+            sources = {self._source_path(meta['input_hash']) for meta in index.values()}
+            return (
+                sum(meta['size_bytes'] for meta in index.values())
+                + sum(path.stat().st_size for path in sources if path.exists())
+            )
+        
+        def over_limit() -> bool:
+            return (
+                (self.max_bytes is not None and total_bytes() > self.max_bytes)
+                or (self.max_entries is not None and len(index) > self.max_entries)
+            )
+        
+        for k in sorted(index, key=lambda k: index[k]['last_access']):
+            if not over_limit():
+                break
+            if k == keep:
+                continue
+            self._entry_path(k).unlink(missing_ok=True)
+            del index[k]
+            logger.info(f"Evicted feature store entry {k}")
+        
+        self._remove_orphan_sources(index)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the on-disk feature store")
+    parser.add_argument('--root', default=str(DEFAULT_STORE_DIR), help="Store directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    subparsers.add_parser('list', help="List entries")
+    
+    inspect_parser = subparsers.add_parser('inspect', help="Show entry metadata")
+    inspect_parser.add_argument('key', help="Entry key or unique prefix")
+    
+    purge_parser = subparsers.add_parser('purge', help="Delete entries")
+    purge_parser.add_argument('key', nargs='?', help="Entry key or prefix")
+    purge_parser.add_argument('--all', action='store_true', help="Delete all entries")
+    purge_parser.add_argument('--older-than', type=float, metavar='DAYS',
+                              help="Only delete entries unused for DAYS days")
+    
+    args = parser.parse_args()
+    store = FeatureStore(args.root)
+    
+    if args.command == 'list':
+        entries = store.list_entries()
+        if entries.empty:
+            print("Feature store is empty")
+        else:
+            print(entries.to_string(index=False))
+            print(f"\nTotal size: {entries['size_bytes'].sum() / 1e6:.2f} MB")
+    
+    elif args.command == 'inspect':
+        print(json.dumps(store.inspect(args.key), indent=2))
+    
+    elif args.command == 'purge':
+        if args.key is None and not args.all and args.older_than is None:
+            parser.error("purge needs a key, --all or --older-than")
+        n_deleted = store.purge(args.key, older_than_days=args.older_than)
+        print(f"Deleted {n_deleted} entries")
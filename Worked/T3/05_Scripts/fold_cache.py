@@ -0,0 +1,372 @@
+"""
+Fold-Level Data Cache for Bangkok Traffic Flow Optimization Project
+
+Cross-validated searches re-slice X_train for every candidate and fold, and
+XGBoost re-quantizes the slice into histogram bins on every fit. FoldCache
+prepares each fold once and shares it across all candidates:
+
+    - X is converted once to a C-contiguous float32 array (the dtype the
+      tree learners use internally) in a memory-mapped file, on /dev/shm
+      when available. Worker processes open the same file read-only, so
+      the data is in memory once however many workers run.
+    - Folds whose rows are a contiguous range (every TimeSeriesSplit fold)
+      are views of that array; other folds are materialized once.
+    - For XGBoost, each process builds the binned QuantileDMatrix of each
+      training fold (and the DMatrix of its validation fold) the first time
+      it needs it and reuses it for every later candidate. A process keeps
+      the matrices of one cache only: reusable joblib workers outlive a
+      search, so matrices of an earlier cache are dropped as soon as the
+      worker serves the next one.
+
+CachedSearchCV runs grid and random searches on the cache with the same
+candidates (ParameterGrid / ParameterSampler with the same seed) and the
+same cv_results_ layout as GridSearchCV / RandomizedSearchCV.
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import os
+import time
+import uuid
+import shutil
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Binned XGBoost matrices of this process, for one cache at a time:
+# (cache id, fold) -> (dtrain, dvalid)
+_PROCESS_DMATRICES: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+
+
+# ============================================================================
+# FOLD CACHE
+# ============================================================================
+
+class FoldCache:
+    """
+    Training and validation matrices of every CV fold, built once.
+    """
+    
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        cv: Any,
+        max_bin: int = 256,
+        max_bytes: Optional[int] = None,
+        cache_dir: Optional[str] = None
+    ):
+        """
+        Build the cache.
+        
+        Args:
+            X: Features
+            y: Targets
+            cv: Cross-validator (e.g. TimeSeriesSplit) or list of (train, test)
+            max_bin: Histogram bins of the XGBoost matrices
+            max_bytes: Refuse to build a cache larger than this (MemoryError)
+            cache_dir: Directory of the memory-mapped arrays (default: a new
+                directory under /dev/shm, else the system temp directory)
+        """
+        X = np.asarray(X)
+        y = np.asarray(y, dtype=np.float64)
+        splits = list(cv.split(X, y) if hasattr(cv, 'split') else cv)
+        self.cache_id = uuid.uuid4().hex
+        self.max_bin = max_bin
+        self.n_splits = len(splits)
+        
+        # Contiguous row ranges are views; other folds are stored once each
+        self._n_base = len(X)
+        self.folds = []
+        gathered = []
+        for train, test in splits:
+            self.folds.append({'train': self._as_range(train, gathered),
+                               'test': self._as_range(test, gathered)})
+        
+        n_gathered = sum(len(idx) for idx in gathered)
+        self.nbytes = (len(X) + n_gathered) * X.shape[1] * 4 + (len(y) + n_gathered) * 8
+        if max_bytes is not None and self.nbytes > max_bytes:
+            raise MemoryError(f"Fold cache needs {self.nbytes / 1e6:.1f} MB, "
+                              f"above max_bytes={max_bytes / 1e6:.1f} MB")
+        
+        default_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        self.cache_dir = cache_dir or tempfile.mkdtemp(prefix='fold_cache_', dir=default_dir)
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        self._owner_pid = os.getpid()
+        
+        rows = np.concatenate([np.arange(len(X))] + gathered)
+        self._write('X', X[rows] if gathered else X, np.float32)
+        self._write('y', y[rows] if gathered else y, np.float64)
+        self._open()
+        
+        logger.info(f"Fold cache: {self.n_splits} folds, {self.nbytes / 1e6:.2f} MB float32 "
+                    f"in {self.cache_dir} ({n_gathered} materialized rows; "
+                    f"uncached searches copy {self._copy_bytes(X) / 1e6:.2f} MB per candidate)")
+    
+    def _as_range(self, idx: np.ndarray, gathered: List[np.ndarray]) -> Tuple[int, int]:
+        """Row range of a fold in the cached arrays, appending it if not contiguous."""
+        idx = np.asarray(idx)
+        if len(idx) and np.array_equal(idx, np.arange(idx[0], idx[0] + len(idx))):
+            return int(idx[0]), int(idx[0] + len(idx))
+        start = self._n_base + sum(len(g) for g in gathered)
+        gathered.append(idx)
+        return start, start + len(idx)
+    
+    def _copy_bytes(self, X: np.ndarray) -> int:
+        """Bytes an uncached search copies per candidate (all folds, original dtype)."""
+        rows = sum((f['train'][1] - f['train'][0]) + (f['test'][1] - f['test'][0])
+                   for f in self.folds)
+        return rows * X.shape[1] * X.dtype.itemsize
+    
+    def _write(self, name: str, array: np.ndarray, dtype: type) -> None:
+        out = np.lib.format.open_memmap(Path(self.cache_dir) / f'{name}.npy', mode='w+',
+                                        dtype=dtype, shape=array.shape)
+        out[:] = array
+        out.flush()
+        del out
+    
+    def _open(self) -> None:
+        self.X = np.load(Path(self.cache_dir) / 'X.npy', mmap_mode='r')
+        self.y = np.load(Path(self.cache_dir) / 'y.npy', mmap_mode='r')
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers get the file paths, not the data
+        state = self.__dict__.copy()
+        del state['X'], state['y']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._open()
+    
+    def fold(self, i: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Arrays of fold i (read-only views of the cache).
+        
+        Returns:
+            Tuple of (X_train, y_train, X_test, y_test)
+        """
+        (a, b), (c, d) = self.folds[i]['train'], self.folds[i]['test']
+        return self.X[a:b], self.y[a:b], self.X[c:d], self.y[c:d]
+    
+    def dmatrices(self, i: int) -> Tuple[Any, Any]:
+        """
+        Binned XGBoost training matrix and validation matrix of fold i,
+        built on first use in each process.
+        """
+        key = (self.cache_id, i)
+        if key not in _PROCESS_DMATRICES:
+            import xgboost as xgb
+            for stale in [k for k in _PROCESS_DMATRICES if k[0] != self.cache_id]:
+                del _PROCESS_DMATRICES[stale]
+            X_train, y_train, X_test, _ = self.fold(i)
+            dtrain = xgb.QuantileDMatrix(X_train, y_train, max_bin=self.max_bin)
+            _PROCESS_DMATRICES[key] = (dtrain, xgb.DMatrix(X_test))
+        return _PROCESS_DMATRICES[key]
+    
+    def memory_usage(self) -> pd.DataFrame:
+        """
+        Rows and bytes per fold; views of the shared array cost nothing extra.
+        
+        dmatrix_built refers to the calling process only; worker processes
+        hold their own copies (see CachedSearchCV.fold_cache_usage_).
+        """
+        rows = []
+        for i, fold in enumerate(self.folds):
+            n_train = fold['train'][1] - fold['train'][0]
+            n_test = fold['test'][1] - fold['test'][0]
+            rows.append({
+                'fold': i,
+                'train_rows': n_train,
+                'test_rows': n_test,
+                'float32_bytes': (n_train + n_test) * self.X.shape[1] * 4,
+                # uint8 bin indices (max_bin <= 256) per training value
+                'dmatrix_bytes_est': n_train * self.X.shape[1] * (1 if self.max_bin <= 256 else 2),
+                'dmatrix_built': (self.cache_id, i) in _PROCESS_DMATRICES
+            })
+        return pd.DataFrame(rows)
+    
+    def close(self) -> None:
+        """Drop this process's matrices; the creating process also deletes the files."""
+        for i in range(self.n_splits):
+            _PROCESS_DMATRICES.pop((self.cache_id, i), None)
+        if os.getpid() == self._owner_pid:
+            self.X = self.y = None
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def __enter__(self) -> 'FoldCache':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def score(self, estimator: Any, params: Dict[str, Any], i: int) -> float:
+        """
+        Fit a candidate on fold i and return its negative validation RMSE.
+        
+        XGBoost regressors train on the cached binned matrix with
+        xgboost.train (identical to XGBRegressor.fit); other estimators are
+        fitted on the cached float32 arrays.
+        
+        Args:
+            estimator: Unfitted base estimator
+            params: Candidate parameters
+            i: Fold number
+        
+        Returns:
+            Negative RMSE (greater is better, as sklearn scorers)
+        """
+        from sklearn.base import clone
+        
+        model = clone(estimator).set_params(**params)
+        _, _, X_test, y_test = self.fold(i)
+        if type(model).__name__ == 'XGBRegressor':
+            import xgboost as xgb
+            dtrain, dvalid = self.dmatrices(i)
+            booster = xgb.train(model.get_xgb_params(), dtrain,
+                                num_boost_round=model.get_params()['n_estimators'])
+            predictions = booster.predict(dvalid)
+        else:
+            X_train, y_train, _, _ = self.fold(i)
+            predictions = model.fit(X_train, y_train).predict(X_test)
+        return -float(np.sqrt(np.mean((y_test - predictions) ** 2)))
+
+
+# ============================================================================
+# CACHED SEARCH
+# ============================================================================
+
+def _score_candidate(
+    cache: FoldCache,
+    estimator: Any,
+    params: Dict[str, Any],
+    i: int
+) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    score = cache.score(estimator, params, i)
+    return score, time.perf_counter() - start, os.getpid()
+
+
+class CachedSearchCV:
+    """
+    Grid or random search whose candidates are scored on a FoldCache.
+    
+    Same candidates and cv_results_ layout as GridSearchCV (param_grid) or
+    RandomizedSearchCV (param_distributions + n_iter + random_state);
+    scoring is the negative RMSE.
+    """
+    
+    def __init__(
+        self,
+        estimator: Any,
+        param_distributions: Dict[str, Any],
+        n_iter: Optional[int] = 10,
+        cv: Any = None,
+        n_jobs: int = 1,
+        verbose: int = 0,
+        refit: bool = True,
+        random_state: Optional[int] = 42,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Initialize search.
+        
+        Args:
+            estimator: Base estimator
+            param_distributions: Param grid (lists and scipy distributions)
+            n_iter: Random candidates (None: every combination of a list grid)
+            cv: Cross-validator
+            n_jobs: Parallel jobs over candidates x folds
+            verbose: Verbosity level
+            refit: Refit the best parameters on the whole data
+            random_state: Seed of the candidate sampler
+            max_bytes: Memory limit of the fold cache
+        """
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.refit = refit
+        self.random_state = random_state
+        self.max_bytes = max_bytes
+    
+    def _candidates(self) -> List[Dict[str, Any]]:
+        from sklearn.model_selection import ParameterGrid, ParameterSampler
+        if self.n_iter is None:
+            return list(ParameterGrid(self.param_distributions))
+        return list(ParameterSampler(self.param_distributions, self.n_iter,
+                                     random_state=self.random_state))
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'CachedSearchCV':
+        """
+        Score every candidate on every cached fold, then refit the best.
+        
+        Args:
+            X: Training features
+            y: Training targets
+        
+        Returns:
+            Self
+        """
+        from joblib import Parallel, delayed
+        from sklearn.base import clone
+        
+        candidates = self._candidates()
+        with FoldCache(X, y, self.cv, max_bytes=self.max_bytes) as cache:
+            if self.verbose:
+                logger.info(f"Fitting {cache.n_splits} cached folds for each of "
+                            f"{len(candidates)} candidates")
+            tasks = [(c, i) for c in range(len(candidates)) for i in range(cache.n_splits)]
+            scored = Parallel(n_jobs=self.n_jobs)(
+                delayed(_score_candidate)(cache, self.estimator, candidates[c], i)
+                for c, i in tasks
+            )
+            usage = cache.memory_usage()
+            n_splits = cache.n_splits
+        
+        # Processes that built each fold's XGBoost matrices during the search
+        if type(self.estimator).__name__ == 'XGBRegressor':
+            pids = [{pid for (_, i), (_, _, pid) in zip(tasks, scored) if i == fold}
+                    for fold in range(n_splits)]
+            usage['dmatrix_processes'] = [len(p) for p in pids]
+        else:
+            usage['dmatrix_processes'] = 0
+        self.fold_cache_usage_ = usage.drop(columns='dmatrix_built')
+        
+        scores = np.array([score for score, _, _ in scored]).reshape(len(candidates), n_splits)
+        fit_times = np.array([seconds for _, seconds, _ in scored]).reshape(len(candidates), n_splits)
+        mean = scores.mean(axis=1)
+        
+        self.cv_results_ = {
+            'mean_fit_time': fit_times.mean(axis=1),
+            'std_fit_time': fit_times.std(axis=1),
+            'params': candidates,
+            'mean_test_score': mean,
+            'std_test_score': scores.std(axis=1),
+            'rank_test_score': pd.Series(-mean).rank(method='min').astype(int).to_numpy()
+        }
+        for name in self.param_distributions:
+            self.cv_results_[f'param_{name}'] = np.array([c[name] for c in candidates],
+                                                         dtype=object)
+        for i in range(n_splits):
+            self.cv_results_[f'split{i}_test_score'] = scores[:, i]
+        
+        self.best_index_ = int(np.argmax(mean))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(mean[self.best_index_])
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+            self.best_estimator_.fit(X, y)
+        return self
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict with the refitted best estimator."""
+        return self.best_estimator_.predict(X)
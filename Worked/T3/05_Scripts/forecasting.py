@@ -0,0 +1,487 @@
+"""
+Multi-Horizon Forecasting Module for Bangkok Traffic Flow Optimization Project
+
+The models in modeling.py predict one step ahead. This module turns them
+into 1-14 day-ahead forecasters with two strategies:
+
+- direct: one model per horizon h, trained on features at the forecast
+  origin t against the target h steps later (t + h)
+- recursive: one next-step model whose predictions are fed back as
+  history; RecursiveForecaster updates the lag/rolling/EWM features
+  incrementally instead of rebuilding them for every step
+
+Targets are shifted forward to the origin rather than shifting the feature
+lags, so every feature of an origin row only uses values observed up to t
+and no future lag leaks into training. Horizon models are trained in
+parallel and prediction returns an (n_samples x n_horizons) matrix.
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from joblib import Parallel, delayed
+
+from feature_engineering import (
+    FeatureGraph, OnlineFeatureState, get_model_feature_names, _gather, _group_layout
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORECAST_STRATEGIES = ('direct', 'recursive')
+
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+def default_forecast_features(target_col: str = 'congestion_index') -> List[str]:
+    """
+    Numeric columns of create_model_features used as forecast inputs.
+    
+    Args:
+        target_col: Target column name
+    
+    Returns:
+        List of feature names ('season' is categorical and left out)
+    """
+    return [name for name in get_model_feature_names(target_col) if name != 'season']
+
+
+def make_horizon_targets(
+    df: pd.DataFrame,
+    target_col: str = 'congestion_index',
+    horizons: Sequence[int] = range(1, 15),
+    group_col: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Create the value `h` rows after each row for every horizon.
+    
+    Rows must be in time order (within each group if group_col is set).
+    The last h rows of each series have no target and are NaN.
+    
+    Args:
+        df: Input DataFrame
+        target_col: Target column name
+        horizons: Steps ahead
+        group_col: Column identifying independent series
+    
+    Returns:
+        DataFrame with one '{target_col}_lead_{h}' column per horizon
+    """
+    target = df[target_col] if group_col is None else df.groupby(group_col, sort=False)[target_col]
+    return pd.DataFrame(
+        {f'{target_col}_lead_{h}': target.shift(-h) for h in horizons},
+        index=df.index
+    )
+
+
+# ============================================================================
+# MULTI-HORIZON FORECASTER
+# ============================================================================
+
+def _sort_history(
+    df: pd.DataFrame,
+    datetime_col: str,
+    group_col: Optional[str]
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Sort rows by (group, time); also return each sorted row's input position."""
+    keys = [datetime_col] if group_col is None else [group_col, datetime_col]
+    df = df.assign(**{datetime_col: pd.to_datetime(df[datetime_col])})
+    df = df.reset_index(drop=True).sort_values(keys, kind='stable')
+    return df.reset_index(drop=True), df.index.to_numpy()
+
+
+def _train_model(
+    model_type: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    config: Dict
+) -> Any:
+    """Train one horizon model with the modeling.py trainer for model_type."""
+    from modeling import train_xgboost_model, train_random_forest_model
+    
+    trainers = {
+        'xgboost': train_xgboost_model,
+        'random_forest': train_random_forest_model
+    }
+    if model_type not in trainers:
+        raise ValueError(f"Unknown model_type '{model_type}'. Use one of {list(trainers)}")
+    model, _ = trainers[model_type](X, y, config=config)
+    return model
+
+
+class MultiHorizonForecaster:
+    """
+    Forecast several steps ahead with direct or recursive models.
+    
+    Features are built with FeatureGraph, so only the columns the models
+    consume are computed. Columns in feature_names that the graph cannot
+    derive (e.g. weather) are taken from the input as-is; in recursive
+    forecasts they are held at their value at the origin.
+    """
+    
+    def __init__(
+        self,
+        horizons: Sequence[int] = range(1, 15),
+        strategy: str = 'direct',
+        model_type: str = 'xgboost',
+        config: Optional[Dict] = None,
+        feature_names: Optional[List[str]] = None,
+        target_col: str = 'congestion_index',
+        datetime_col: str = 'date',
+        holidays: Optional[pd.DataFrame] = None,
+        group_col: Optional[str] = None,
+        freq: str = '1D',
+        n_jobs: int = -1
+    ):
+        """
+        Initialize forecaster.
+        
+        Args:
+            horizons: Steps ahead to forecast (1 = next row)
+            strategy: 'direct' (one model per horizon) or 'recursive'
+            model_type: 'xgboost' or 'random_forest'
+            config: Model configuration passed to the modeling.py trainer
+            feature_names: Model inputs (default: default_forecast_features)
+            target_col: Target column name
+            datetime_col: Datetime column name
+            holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+            group_col: Column identifying independent series
+            freq: Spacing of the series, used to date recursive steps
+            n_jobs: Horizon models trained concurrently (-1 = all CPUs)
+        """
+        if strategy not in FORECAST_STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'. Use one of {FORECAST_STRATEGIES}")
+        if min(horizons) < 1:
+            raise ValueError(f"Horizons must be positive, got {list(horizons)}")
+        
+        self.horizons = sorted(set(horizons))
+        self.strategy = strategy
+        self.model_type = model_type
+        self.config = config
+        self.feature_names = feature_names or default_forecast_features(target_col)
+        self.target_col = target_col
+        self.datetime_col = datetime_col
+        self.holidays = holidays
+        self.group_col = group_col
+        self.freq = freq
+        self.n_jobs = n_jobs
+        self.models_: Dict[int, Any] = {}
+    
+    def _graph(self, group_col: Optional[str]) -> FeatureGraph:
+        return FeatureGraph(self.target_col, self.datetime_col, self.holidays, group_col)
+    
+    def _sort(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        return _sort_history(df, self.datetime_col, self.group_col)
+    
+    def _features(self, df: pd.DataFrame) -> np.ndarray:
+        """Feature matrix aligned with the (sorted) rows of df, NaN where incomplete."""
+        features = self._graph(self.group_col).build(df, self.feature_names, dropna=False)
+        return features.loc[df.index].to_numpy(dtype=np.float64)
+    
+    def fit(self, df: pd.DataFrame) -> 'MultiHorizonForecaster':
+        """
+        Train the horizon models.
+        
+        Args:
+            df: History with datetime, target and any raw feature columns
+        
+        Returns:
+            Self
+        """
+        df, _ = self._sort(df)
+        X = self._features(df)
+        complete = ~np.isnan(X).any(axis=1)
+        
+        fit_horizons = [1] if self.strategy == 'recursive' else self.horizons
+        targets = make_horizon_targets(df, self.target_col, fit_horizons, self.group_col).to_numpy()
+        
+        # Split the CPUs between concurrently trained horizon models
+        cpus = os.cpu_count() or 1
+        workers = min(len(fit_horizons), cpus if self.n_jobs == -1 else max(1, self.n_jobs))
+        config = {'n_jobs': max(1, cpus // workers), **(self.config or {})}
+        
+        def fit_one(column: int) -> Any:
+            rows = complete & ~np.isnan(targets[:, column])
+            return _train_model(self.model_type, X[rows], targets[rows, column], config)
+        
+        logger.info(f"Training {len(fit_horizons)} {self.strategy} {self.model_type} "
+                    f"model(s) on {int(complete.sum())} rows with {workers} worker(s)...")
+        models = Parallel(n_jobs=workers, prefer='threads')(
+            delayed(fit_one)(column) for column in range(len(fit_horizons))
+        )
+        self.models_ = dict(zip(fit_horizons, models))
+        return self
+    
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Forecast every horizon from every row of df.
+        
+        Args:
+            df: History; each row is a forecast origin
+        
+        Returns:
+            Array of shape (len(df), n_horizons) in input row order; rows
+            whose features are incomplete are NaN
+        """
+        if not self.models_:
+            raise ValueError("Forecaster is not fitted. Call fit() first.")
+        
+        df, positions = self._sort(df)
+        X = self._features(df)
+        complete = np.flatnonzero(~np.isnan(X).any(axis=1))
+        
+        forecasts = np.full((len(df), len(self.horizons)), np.nan)
+        if len(complete):
+            if self.strategy == 'direct':
+                for column, h in enumerate(self.horizons):
+                    forecasts[complete, column] = self.models_[h].predict(X[complete])
+            else:
+                forecasts[complete] = self._predict_recursive(df, complete)
+        
+        result = np.empty_like(forecasts)
+        result[positions] = forecasts
+        return result
+    
+    def _predict_recursive(self, df: pd.DataFrame, origins: np.ndarray) -> np.ndarray:
+        """Roll the next-step model forward from each origin (see RecursiveForecaster)."""
+        forecaster = RecursiveForecaster(
+            self.models_[1], self.feature_names, self.horizons, self.target_col,
+            self.datetime_col, self.holidays, self.group_col, self.freq
+        )
+        return forecaster.predict(df)[origins]
+    
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score forecasts from every origin in df against the observed values.
+        
+        Args:
+            df: History covering the origins and the horizons after them
+        
+        Returns:
+            DataFrame of metrics with one row per horizon
+        """
+        from evaluation import calculate_all_metrics
+        
+        forecasts = self.predict(df)
+        sorted_df, positions = self._sort(df)
+        actual = np.empty((len(df), len(self.horizons)))
+        actual[positions] = make_horizon_targets(
+            sorted_df, self.target_col, self.horizons, self.group_col
+        ).to_numpy()
+        
+        rows = []
+        for column, h in enumerate(self.horizons):
+            scored = ~np.isnan(forecasts[:, column]) & ~np.isnan(actual[:, column])
+            metrics = calculate_all_metrics(actual[scored, column], forecasts[scored, column])
+            rows.append({'horizon': h, 'n_samples': int(scored.sum()), **metrics})
+        return pd.DataFrame(rows).set_index('horizon')
+
+
+# ============================================================================
+# RECURSIVE FORECASTER (INCREMENTAL FEATURES)
+# ============================================================================
+
+class RecursiveForecaster:
+    """
+    Recursive multi-step forecasts with incremental feature updates.
+    
+    Rebuilding the features for every predicted step costs O(horizon x
+    history). Here the target-derived features (lags, diffs, rolling windows,
+    EWMs) live in an OnlineFeatureState seeded by one pass over the history;
+    each predicted value is then fed back with an O(1) update. Calendar
+    features of the future rows are built in one FeatureGraph call for all
+    origins and steps, and other columns (e.g. weather) are held at their
+    value at the origin. Every step is one batched model.predict call over
+    all origins.
+    
+    model must predict the next value from the features of the current row,
+    e.g. MultiHorizonForecaster(strategy='recursive').models_[1]. Any
+    estimator with predict(X) works: XGBRegressor, RandomForestRegressor or
+    WeightedEnsembleRegressor trained on such targets.
+    """
+    
+    def __init__(
+        self,
+        model: Any,
+        feature_names: List[str],
+        horizons: Sequence[int] = range(1, 15),
+        target_col: str = 'congestion_index',
+        datetime_col: str = 'date',
+        holidays: Optional[pd.DataFrame] = None,
+        group_col: Optional[str] = None,
+        freq: str = '1D'
+    ):
+        """
+        Initialize forecaster.
+        
+        Args:
+            model: Fitted next-step model
+            feature_names: Model inputs in training order
+            horizons: Steps ahead to forecast (1 = next row)
+            target_col: Target column name
+            datetime_col: Datetime column name
+            holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+            group_col: Column identifying independent series
+            freq: Spacing of the series, used to date future steps
+        """
+        if min(horizons) < 1:
+            raise ValueError(f"Horizons must be positive, got {list(horizons)}")
+        
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.horizons = sorted(set(horizons))
+        self.target_col = target_col
+        self.datetime_col = datetime_col
+        self.holidays = holidays
+        self.group_col = group_col
+        self.freq = freq
+        
+        # Split the inputs into target-derived (online state) and the rest
+        pattern = re.compile(
+            rf'{re.escape(target_col)}_(?:(lag|diff|ewm)_(\d+)|rolling_(?:mean|std|min|max)_(\d+))$'
+        )
+        periods = {'lag': set(), 'diff': set(), 'rolling': set(), 'ewm': set()}
+        self._target_slots, self._other_slots = [], []
+        for slot, name in enumerate(self.feature_names):
+            match = pattern.match(name)
+            if match:
+                periods[match.group(1) or 'rolling'].add(int(match.group(2) or match.group(3)))
+                self._target_slots.append(slot)
+            else:
+                self._other_slots.append(slot)
+        
+        self._state_args = {
+            'target_col': target_col,
+            'lag_periods': sorted(periods['lag']),
+            'diff_periods': sorted(periods['diff']),
+            'rolling_windows': sorted(periods['rolling']),
+            'ewm_spans': sorted(periods['ewm'])
+        }
+        state_names = OnlineFeatureState(**self._state_args).feature_names
+        self._state_columns = [state_names.index(self.feature_names[slot]) for slot in self._target_slots]
+        self._other_names = [self.feature_names[slot] for slot in self._other_slots]
+    
+    def _future_features(
+        self,
+        df: pd.DataFrame,
+        origins: np.ndarray,
+        dates: np.ndarray
+    ) -> np.ndarray:
+        """Non-target features of every future row, shape (n_origins, n_steps, n_other)."""
+        if not self._other_names:
+            return np.empty(dates.shape + (0,))
+        
+        graph = FeatureGraph(self.target_col, self.datetime_col, self.holidays)
+        held = {}
+        for name in self._other_names:
+            try:
+                graph.node(name)
+            except KeyError:
+                held[name] = np.repeat(df[name].to_numpy()[origins], dates.shape[1])
+        
+        frame = pd.DataFrame({self.datetime_col: dates.ravel(), **held})
+        features = graph.build(frame, self._other_names, dropna=False)
+        return features.to_numpy(dtype=np.float64).reshape(dates.shape + (-1,))
+    
+    def predict(self, df: pd.DataFrame, last_only: bool = False) -> np.ndarray:
+        """
+        Forecast every horizon from the rows of df.
+        
+        Args:
+            df: History with datetime, target and any raw feature columns
+            last_only: Forecast only from the last row of each series
+        
+        Returns:
+            Array of shape (len(df), n_horizons) in input row order; rows that
+            are not origins or whose features are incomplete are NaN
+        """
+        df, positions = _sort_history(df, self.datetime_col, self.group_col)
+        n = len(df)
+        if self.group_col is None:
+            group_start = np.zeros(n, dtype=np.int64)
+        else:
+            group_start = _group_layout(df, self.group_col)[1]
+        
+        if last_only and n:
+            origins = np.flatnonzero(np.r_[group_start[1:] != group_start[:-1], True])
+        else:
+            origins = np.arange(n)
+        slot_of = np.full(n, -1)
+        slot_of[origins] = np.arange(len(origins))
+        
+        # Seed: one pass over the history, branching a state at each origin
+        values = _gather(df[self.target_col], None)
+        timestamps = df[self.datetime_col].to_numpy()
+        target_features = np.empty((len(origins), len(self._target_slots)))
+        states: List[OnlineFeatureState] = [None] * len(origins)
+        state = None
+        for row in range(n):
+            if row == group_start[row]:
+                state = OnlineFeatureState(**self._state_args)
+            features = state.update(timestamps[row], values[row])
+            slot = slot_of[row]
+            if slot >= 0:
+                target_features[slot] = features[self._state_columns]
+                states[slot] = state.copy()
+        
+        n_steps = max(self.horizons)
+        step = pd.Timedelta(self.freq).to_timedelta64()
+        dates = timestamps[origins][:, None] + np.arange(n_steps) * step
+        other_features = self._future_features(df, origins, dates)
+        
+        X = np.empty((len(origins), len(self.feature_names)))
+        X[:, self._other_slots] = other_features[:, 0]
+        X[:, self._target_slots] = target_features
+        active = np.flatnonzero(~np.isnan(X).any(axis=1))
+        
+        forecasts = np.full((len(origins), n_steps), np.nan)
+        for k in range(n_steps):
+            if len(active) == 0:
+                break
+            forecasts[active, k] = self.model.predict(X[active])
+            if k + 1 == n_steps:
+                break
+            # Feed the predictions back: O(1) per origin
+            for slot in active:
+                features = states[slot].update(dates[slot, k + 1], forecasts[slot, k])
+                X[slot, self._target_slots] = features[self._state_columns]
+            X[:, self._other_slots] = other_features[:, k + 1]
+        
+        result = np.full((n, len(self.horizons)), np.nan)
+        result[origins] = forecasts[:, [h - 1 for h in self.horizons]]
+        unsorted = np.empty_like(result)
+        unsorted[positions] = result
+        return unsorted
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    logger.info("Forecasting module loaded successfully")
+    
+    # Example usage
+    print("""
+    Example Usage:
+    --------------
+    from forecasting import MultiHorizonForecaster
+    
+    # One XGBoost model per day ahead, trained in parallel
+    forecaster = MultiHorizonForecaster(horizons=range(1, 15), strategy='direct')
+    forecaster.fit(train_df)
+    
+    # (n_samples x 14) matrix of forecasts
+    forecasts = forecaster.predict(test_df)
+    print(forecaster.evaluate(test_df)[['RMSE', 'MAE']])
+    """)
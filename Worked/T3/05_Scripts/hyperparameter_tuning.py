@@ -13,16 +13,26 @@ import pandas as pd
 import logging
 from typing import Dict, List, Tuple, Optional, Any, Callable
 from pathlib import Path
+import os
 import pickle
+import json
+import time
+import shutil
+import hashlib
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 warnings.filterwarnings('ignore')
 
+from sklearn.base import BaseEstimator, RegressorMixin, clone
 from sklearn.model_selection import TimeSeriesSplit, GridSearchCV, RandomizedSearchCV
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import make_scorer, mean_squared_error, r2_score, mean_absolute_error
 
+from tpe_search import TPESearchCV
+from fold_cache import CachedSearchCV
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,6 +67,8 @@ def get_xgboost_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
     
     Args:
         search_type: 'grid' for GridSearchCV, 'random' for RandomizedSearchCV
+            and TPESearchCV ('tpe'), 'halving' for successive halving over
+            n_estimators
     
     Returns:
         Parameter grid dictionary
@@ -75,7 +87,7 @@ def get_xgboost_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
         }
     else:  # random search - wider ranges
         from scipy.stats import uniform, randint
-        return {
+        space = {
             'n_estimators': randint(100, 500),
             'max_depth': randint(3, 12),
             'learning_rate': uniform(0.01, 0.19),
@@ -86,6 +98,9 @@ def get_xgboost_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
             'reg_alpha': uniform(0, 2),
             'reg_lambda': uniform(0.5, 3)
         }
+        if search_type == 'halving':
+            space.pop('n_estimators')
+        return space
 
 
 def get_random_forest_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
@@ -93,7 +108,8 @@ def get_random_forest_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
     Get Random Forest hyperparameter search space.
     
     Args:
-        search_type: 'grid' or 'random'
+        search_type: 'grid', 'random' or 'tpe', 'halving' (random space
+            without n_estimators, which is the halving budget)
     
     Returns:
         Parameter grid dictionary
@@ -109,7 +125,7 @@ def get_random_forest_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
         }
     else:
         from scipy.stats import uniform, randint
-        return {
+        space = {
             'n_estimators': randint(100, 600),
             'max_depth': randint(5, 30),
             'min_samples_split': randint(2, 20),
@@ -117,6 +133,9 @@ def get_random_forest_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
             'max_features': ['sqrt', 'log2', 0.3, 0.5, 0.7],
             'bootstrap': [True, False]
         }
+        if search_type == 'halving':
+            space.pop('n_estimators')
+        return space
 
 
 def get_gradient_boosting_param_grid(search_type: str = 'grid') -> Dict[str, Any]:
@@ -124,7 +143,8 @@ def get_gradient_boosting_param_grid(search_type: str = 'grid') -> Dict[str, Any
     Get Gradient Boosting hyperparameter search space.
     
     Args:
-        search_type: 'grid' or 'random'
+        search_type: 'grid', 'random' or 'tpe', 'halving' (random space
+            without n_estimators, which is the halving budget)
     
     Returns:
         Parameter grid dictionary
@@ -141,7 +161,7 @@ def get_gradient_boosting_param_grid(search_type: str = 'grid') -> Dict[str, Any
         }
     else:
         from scipy.stats import uniform, randint
-        return {
+        space = {
             'n_estimators': randint(100, 400),
             'max_depth': randint(3, 10),
             'learning_rate': uniform(0.01, 0.19),
@@ -150,6 +170,9 @@ def get_gradient_boosting_param_grid(search_type: str = 'grid') -> Dict[str, Any
             'min_samples_leaf': randint(1, 10),
             'max_features': ['sqrt', 'log2', 0.3, 0.5, 0.7]
         }
+        if search_type == 'halving':
+            space.pop('n_estimators')
+        return space
 
 
 # ============================================================================
@@ -175,6 +198,438 @@ def create_time_series_cv(
     return TimeSeriesSplit(n_splits=n_splits, gap=gap, test_size=test_size)
 
 
+# ============================================================================
+# CHECKPOINTING
+# ============================================================================
+
+# Parameters that do not change a fitted model, left out of the params hash
+CHECKPOINT_IGNORED_PARAMS = {'n_jobs', 'verbose', 'verbosity'}
+CHECKPOINT_PREFIX = 'estimator__'
+
+
+def params_hash(estimator: Any) -> str:
+    """Stable hash of an estimator's class and hyperparameters."""
+    params = {k: v for k, v in estimator.get_params(deep=False).items()
+              if k not in CHECKPOINT_IGNORED_PARAMS}
+    payload = json.dumps([type(estimator).__name__, params], sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _array_hash(*arrays: np.ndarray) -> str:
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.shape, array.dtype.str)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class CheckpointedEstimator(BaseEstimator, RegressorMixin):
+    """
+    Estimator wrapper that records every completed CV fit on disk.
+    
+    A fit is identified by the params hash of the wrapped estimator and a
+    hash of its training data; the record holds the predictions made with
+    it, keyed by a hash of the prediction inputs. Fitting again with a
+    recorded params/data pair skips training and serves the recorded
+    predictions, so a search resumed over the same folds only trains the
+    candidates it had not finished. The wrapped parameters are searched as
+    estimator__<name>.
+    """
+    
+    def __init__(self, estimator: Any = None, checkpoint_dir: Optional[str] = None):
+        """
+        Initialize wrapper.
+        
+        Args:
+            estimator: Estimator to wrap
+            checkpoint_dir: Directory of the fit records
+        """
+        self.estimator = estimator
+        self.checkpoint_dir = checkpoint_dir
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'CheckpointedEstimator':
+        """
+        Fit the wrapped estimator unless this fit is already recorded.
+        
+        Args:
+            X: Training features
+            y: Training targets
+        
+        Returns:
+            Self
+        """
+        self.record_path_ = (Path(self.checkpoint_dir) /
+                             f"{params_hash(self.estimator)}-{_array_hash(X, y)}.pkl")
+        self.estimator_ = None
+        self.record_ = None
+        
+        if self.record_path_.exists():
+            with open(self.record_path_, 'rb') as f:
+                self.record_ = pickle.load(f)
+            # Kept for a lazy fit if asked to predict unrecorded inputs
+            self._train_data = (X, y)
+            return self
+        
+        start = time.perf_counter()
+        self.estimator_ = clone(self.estimator).fit(X, y)
+        self.record_ = {
+            'params_hash': params_hash(self.estimator),
+            'params': self.estimator.get_params(deep=False),
+            'fit_seconds': time.perf_counter() - start,
+            'predictions': {}
+        }
+        return self
+    
+    def fitted_estimator(self) -> Any:
+        """The wrapped estimator, fitted (trained now if the fit was restored)."""
+        if self.estimator_ is None:
+            self.estimator_ = clone(self.estimator).fit(*self._train_data)
+        return self.estimator_
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Recorded predictions if any, else predict and record them.
+        
+        Args:
+            X: Features
+        
+        Returns:
+            Predictions
+        """
+        key = _array_hash(X)
+        if key in self.record_['predictions']:
+            return self.record_['predictions'][key]
+        
+        predictions = self.fitted_estimator().predict(X)
+        self.record_['predictions'][key] = predictions
+        
+        # Write-then-rename: parallel workers never see a partial record
+        self.record_path_.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.record_path_.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.record_, f)
+        os.replace(tmp_path, self.record_path_)
+        return predictions
+
+
+def checkpoint_search_space(
+    base_model: Any,
+    param_grid: Dict[str, Any],
+    checkpoint_dir: str
+) -> Tuple[CheckpointedEstimator, Dict[str, Any]]:
+    """
+    Wrap a search's base model and prefix its param grid for checkpointing.
+    
+    Args:
+        base_model: Base estimator of the search
+        param_grid: Its param grid
+        checkpoint_dir: Directory of the fit records
+    
+    Returns:
+        Tuple of (wrapped_model, prefixed_param_grid)
+    """
+    Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+    wrapped = CheckpointedEstimator(base_model, str(checkpoint_dir))
+    return wrapped, {CHECKPOINT_PREFIX + name: values for name, values in param_grid.items()}
+
+
+def search_outcome(search: Any) -> Tuple[Any, Dict[str, Any], pd.DataFrame]:
+    """
+    Best model, best params and cv_results of a fitted search, unwrapped
+    if it ran on a CheckpointedEstimator.
+    
+    Args:
+        search: Fitted search object
+    
+    Returns:
+        Tuple of (best_model, best_params, cv_results)
+    """
+    best_model = search.best_estimator_
+    best_params = search.best_params_
+    cv_results = pd.DataFrame(search.cv_results_)
+    
+    if isinstance(best_model, CheckpointedEstimator):
+        def strip(params: Dict[str, Any]) -> Dict[str, Any]:
+            return {k.replace(CHECKPOINT_PREFIX, '', 1): v for k, v in params.items()}
+        
+        best_model = best_model.fitted_estimator()
+        best_params = strip(best_params)
+        cv_results['params'] = cv_results['params'].map(strip)
+        cv_results.columns = [c.replace('param_' + CHECKPOINT_PREFIX, 'param_', 1)
+                              for c in cv_results.columns]
+    return best_model, best_params, cv_results
+
+
+class TuningCheckpoint:
+    """
+    Run directory of run_full_tuning_pipeline.
+    
+    Layout: run.json (fingerprint of the data and settings, finished
+    stages), stages/<stage>.pkl (result of each finished stage),
+    fits/<model>/ (CheckpointedEstimator records of every CV fit) and
+    tpe_trials.db (TPE studies).
+    """
+    
+    def __init__(self, run_dir: str, resume: bool = False, fingerprint: str = ''):
+        """
+        Open a run directory.
+        
+        Args:
+            run_dir: Run directory
+            resume: Keep the checkpoints of an earlier run with the same
+                fingerprint (otherwise they are deleted)
+            fingerprint: Hash of the pipeline inputs and settings
+        """
+        self.run_dir = Path(run_dir)
+        self.manifest_path = self.run_dir / 'run.json'
+        
+        if resume and self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest['fingerprint'] != fingerprint:
+                raise ValueError(f"Run {run_dir} was started with different data or settings; "
+                                 "resume=False starts it over")
+            logger.info(f"Resuming run {run_dir} (finished stages: {list(self.manifest['stages'])})")
+            return
+        
+        for sub in ['stages', 'fits']:
+            if (self.run_dir / sub).exists():
+                shutil.rmtree(self.run_dir / sub)
+        for path in self.run_dir.glob('tpe_trials.db*'):
+            path.unlink()
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = {'created': pd.Timestamp.now().isoformat(), 'fingerprint': fingerprint,
+                         'stages': {}}
+        self._write_manifest()
+    
+    def _write_manifest(self) -> None:
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def load(self, stage: str) -> Optional[Any]:
+        """Result of a finished stage, or None."""
+        if stage not in self.manifest['stages']:
+            return None
+        with open(self.run_dir / 'stages' / f'{stage}.pkl', 'rb') as f:
+            return pickle.load(f)
+    
+    def save(self, stage: str, result: Any) -> None:
+        """Store a stage result, then mark the stage finished."""
+        path = self.run_dir / 'stages' / f'{stage}.pkl'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix('.tmp'), 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(path.with_suffix('.tmp'), path)
+        self.manifest['stages'][stage] = pd.Timestamp.now().isoformat()
+        self._write_manifest()
+    
+    def tuner_kwargs(self, model_name: str) -> Dict[str, str]:
+        """Checkpoint arguments of a tune_* function."""
+        return {
+            'checkpoint_dir': str(self.run_dir / 'fits' / model_name),
+            'tpe_storage': str(self.run_dir / 'tpe_trials.db')
+        }
+
+
+# ============================================================================
+# SUCCESSIVE HALVING
+# ============================================================================
+
+# Full budget of a halving search: the largest n_estimators of each random space
+HALVING_MAX_ESTIMATORS = {
+    'xgboost': 500,
+    'random_forest': 600,
+    'gradient_boosting': 400
+}
+
+
+def create_halving_search(
+    base_model: Any,
+    param_distributions: Dict[str, Any],
+    max_resources: int,
+    n_iter: int = 50,
+    cv: Any = None,
+    scoring: str = 'neg_root_mean_squared_error',
+    n_jobs: int = -1,
+    verbose: int = 1,
+    factor: int = 3
+) -> Any:
+    """
+    Successive-halving random search with n_estimators as the budget.
+    
+    All n_iter candidates are cross-validated with few trees (boosting
+    rounds for XGBoost and Gradient Boosting); only the best 1/factor go
+    on to the next rung with factor times more trees, up to max_resources
+    for the last rung.
+    
+    Args:
+        base_model: Estimator with an n_estimators parameter (possibly
+            wrapped in a CheckpointedEstimator)
+        param_distributions: Search space without n_estimators
+        max_resources: n_estimators of the last rung
+        n_iter: Number of candidates of the first rung
+        cv: Cross-validator
+        scoring: Scoring metric
+        n_jobs: Number of parallel jobs
+        verbose: Verbosity level
+        factor: Fraction of candidates kept (1/factor) and budget growth per rung
+    
+    Returns:
+        HalvingRandomSearchCV object
+    """
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingRandomSearchCV
+    
+    resource = 'n_estimators'
+    if isinstance(base_model, CheckpointedEstimator):
+        resource = CHECKPOINT_PREFIX + resource
+    
+    return HalvingRandomSearchCV(
+        base_model,
+        param_distributions,
+        n_candidates=n_iter,
+        resource=resource,
+        max_resources=max_resources,
+        min_resources='exhaust',
+        factor=factor,
+        cv=cv,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        verbose=verbose,
+        refit=True,
+        random_state=42
+    )
+
+
+# ============================================================================
+# CPU BUDGET
+# ============================================================================
+
+# Relative cost of each family's default random search (benchmark_tuning_search.py:
+# 15 s XGBoost, 77 s Random Forest, 54 s Gradient Boosting), used to share the cores
+TUNING_COST_WEIGHTS = {
+    'xgboost': 1.0,
+    'random_forest': 5.0,
+    'gradient_boosting': 3.5
+}
+
+# Families whose estimator can use threads; Gradient Boosting fits on one core
+THREADED_ESTIMATORS = {'xgboost', 'random_forest'}
+
+
+def _use_fold_cache(fold_cache: bool, search_type: str, scoring: str) -> bool:
+    """Whether a tuner can score its candidates on a FoldCache."""
+    if not fold_cache:
+        return False
+    # Halving changes the resource per rung; the cache scores RMSE only
+    if search_type == 'halving' or scoring != 'neg_root_mean_squared_error':
+        logger.warning(f"fold_cache ignored (search_type={search_type}, scoring={scoring})")
+        return False
+    return True
+
+
+def _estimator_threads(n_jobs: int, estimator_n_jobs: Optional[int]) -> int:
+    if estimator_n_jobs is not None:
+        return estimator_n_jobs
+    return -1 if n_jobs == 1 else 1
+
+
+def _release_threads(model: Any, n_jobs: int) -> Any:
+    """
+    Give a tuned model the whole core budget back.
+    
+    During a parallel search every fit runs on one thread; the model the
+    search returns is used (predicted, refitted) on its own, so it gets
+    n_jobs threads, or all cores when the search ran serially.
+    """
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=-1 if n_jobs == 1 else n_jobs)
+    return model
+
+
+def _model_threads(model: Any, total_cores: int) -> int:
+    """Threads a model's fit uses out of total_cores (joblib n_jobs semantics)."""
+    n_jobs = model.get_params().get('n_jobs') or 1
+    return min(n_jobs if n_jobs > 0 else max(total_cores + 1 + n_jobs, 1), total_cores)
+
+
+def plan_cpu_budget(
+    families: List[str],
+    total_cores: Optional[int] = None,
+    estimator_threads: int = 1,
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Share a core budget between concurrently tuned model families.
+    
+    Each family gets at least one core, the rest is split in proportion
+    to its weight (largest remainder). Within a family, the cores are split
+    between the search (candidates x folds, which are independent and scale
+    best) and estimator_threads threads per fit, so that
+    n_jobs * estimator_n_jobs never exceeds the family's cores.
+    
+    Args:
+        families: Model families to tune (keys of TUNING_COST_WEIGHTS)
+        total_cores: Core budget (None: all cores)
+        estimator_threads: Threads per fit for threaded estimators
+        weights: Relative cost per family (default: TUNING_COST_WEIGHTS)
+    
+    Returns:
+        Dictionary of family -> {'cores', 'n_jobs', 'estimator_n_jobs'}
+    """
+    total_cores = total_cores or os.cpu_count() or 1
+    weights = weights or TUNING_COST_WEIGHTS
+    
+    # Fewer cores than families: one core each, families run in turns
+    spare = max(total_cores - len(families), 0)
+    share = np.array([weights.get(family, 1.0) for family in families])
+    share = spare * share / share.sum()
+    cores = 1 + np.floor(share).astype(int)
+    for i in np.argsort(-(share - np.floor(share)), kind='stable')[:spare - (cores - 1).sum()]:
+        cores[i] += 1
+    
+    plan = {}
+    for family, family_cores in zip(families, cores.tolist()):
+        threads = min(estimator_threads, family_cores) if family in THREADED_ESTIMATORS else 1
+        plan[family] = {
+            'cores': family_cores,
+            'n_jobs': max(family_cores // threads, 1),
+            'estimator_n_jobs': threads
+        }
+    return plan
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and its finished child processes."""
+    try:
+        import resource
+    except ImportError:  # Windows: own process only
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _run_tuning_stage(
+    tuner: Callable,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    kwargs: Dict[str, Any]
+) -> Tuple[Any, Dict[str, Any], Dict[str, float]]:
+    """Run one tuner in a worker process and measure its wall and CPU time."""
+    from joblib.externals.loky import get_reusable_executor
+    
+    cpu_start, wall_start = _cpu_seconds(), time.perf_counter()
+    model, tuning = tuner(X_train, y_train, **kwargs)
+    # Stop the search's worker processes so their CPU time is counted
+    get_reusable_executor().shutdown(wait=True)
+    usage = {'wall_s': time.perf_counter() - wall_start, 'cpu_s': _cpu_seconds() - cpu_start}
+    return model, tuning, usage
+
+
 # ============================================================================
 # HYPERPARAMETER TUNING
 # ============================================================================
@@ -187,7 +642,11 @@ def tune_xgboost(
     cv: int = 5,
     scoring: str = 'neg_root_mean_squared_error',
     n_jobs: int = -1,
-    verbose: int = 1
+    verbose: int = 1,
+    tpe_storage: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    estimator_n_jobs: Optional[int] = None,
+    fold_cache: bool = False
 ) -> Tuple[Any, Dict[str, Any]]:
     """
     Tune XGBoost hyperparameters using cross-validation.
@@ -195,12 +654,22 @@ def tune_xgboost(
     Args:
         X_train: Training features
         y_train: Training targets
-        search_type: 'grid' or 'random'
-        n_iter: Number of iterations for random search
+        search_type: 'grid', 'random', 'halving' or 'tpe'
+        n_iter: Number of iterations for random search (first-rung
+            candidates for halving)
         cv: Number of CV folds
         scoring: Scoring metric
-        n_jobs: Number of parallel jobs
+        n_jobs: Number of parallel jobs of the search (candidates x folds)
         verbose: Verbosity level
+        tpe_storage: SQLite file of the 'tpe' trials; rerunning with the same
+            file resumes the study (None: temporary)
+        checkpoint_dir: Directory recording every CV fit; rerunning with the
+            same directory skips the recorded fits (None: no checkpoints)
+        estimator_n_jobs: Threads per model fit (None: 1 when the search runs
+            in parallel, so the two levels do not oversubscribe the cores;
+            all cores otherwise; the returned model gets n_jobs threads back)
+        fold_cache: Build every CV fold once and share it across candidates
+            (grid, random and TPE searches; see fold_cache.py)
     
     Returns:
         Tuple of (best_model, tuning_results)
@@ -216,17 +685,31 @@ def tune_xgboost(
     base_model = xgb.XGBRegressor(
         objective='reg:squarederror',
         random_state=42,
-        n_jobs=n_jobs
+        n_jobs=_estimator_threads(n_jobs, estimator_n_jobs)
     )
     
     # Parameter grid
     param_grid = get_xgboost_param_grid(search_type)
+    if checkpoint_dir:
+        base_model, param_grid = checkpoint_search_space(base_model, param_grid, checkpoint_dir)
     
     # Time series CV
     tscv = create_time_series_cv(n_splits=cv)
     
     # Search
-    if search_type == 'grid':
+    use_cache = _use_fold_cache(fold_cache, search_type, scoring)
+    if use_cache and search_type in ('grid', 'random'):
+        search = CachedSearchCV(
+            base_model,
+            param_grid,
+            n_iter=None if search_type == 'grid' else n_iter,
+            cv=tscv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            refit=True,
+            random_state=42
+        )
+    elif search_type == 'grid':
         search = GridSearchCV(
             base_model,
             param_grid,
@@ -236,6 +719,31 @@ def tune_xgboost(
             verbose=verbose,
             refit=True
         )
+    elif search_type == 'halving':
+        search = create_halving_search(
+            base_model,
+            param_grid,
+            max_resources=HALVING_MAX_ESTIMATORS['xgboost'],
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose
+        )
+    elif search_type == 'tpe':
+        search = TPESearchCV(
+            base_model,
+            param_grid,
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            storage=tpe_storage,
+            fold_cache=use_cache,
+            study_name='xgboost',
+            random_state=42
+        )
     else:
         search = RandomizedSearchCV(
             base_model,
@@ -251,19 +759,22 @@ def tune_xgboost(
     
     # Fit
     search.fit(X_train, y_train)
+    best_model, best_params, cv_results = search_outcome(search)
+    if estimator_n_jobs is None:
+        best_model = _release_threads(best_model, n_jobs)
     
     # Results
     results = {
-        'best_params': search.best_params_,
+        'best_params': best_params,
         'best_score': -search.best_score_,  # Convert back to positive RMSE
-        'cv_results': pd.DataFrame(search.cv_results_),
-        'n_candidates': len(search.cv_results_['mean_test_score'])
+        'cv_results': cv_results,
+        'n_candidates': len(cv_results)
     }
     
     logger.info(f"Best XGBoost RMSE: {results['best_score']:.4f}")
     logger.info(f"Best params: {results['best_params']}")
     
-    return search.best_estimator_, results
+    return best_model, results
 
 
 def tune_random_forest(
@@ -274,7 +785,11 @@ def tune_random_forest(
     cv: int = 5,
     scoring: str = 'neg_root_mean_squared_error',
     n_jobs: int = -1,
-    verbose: int = 1
+    verbose: int = 1,
+    tpe_storage: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    estimator_n_jobs: Optional[int] = None,
+    fold_cache: bool = False
 ) -> Tuple[Any, Dict[str, Any]]:
     """
     Tune Random Forest hyperparameters using cross-validation.
@@ -282,12 +797,22 @@ def tune_random_forest(
     Args:
         X_train: Training features
         y_train: Training targets
-        search_type: 'grid' or 'random'
-        n_iter: Number of iterations for random search
+        search_type: 'grid', 'random', 'halving' or 'tpe'
+        n_iter: Number of iterations for random search (first-rung
+            candidates for halving)
         cv: Number of CV folds
         scoring: Scoring metric
-        n_jobs: Number of parallel jobs
+        n_jobs: Number of parallel jobs of the search (candidates x folds)
         verbose: Verbosity level
+        tpe_storage: SQLite file of the 'tpe' trials; rerunning with the same
+            file resumes the study (None: temporary)
+        checkpoint_dir: Directory recording every CV fit; rerunning with the
+            same directory skips the recorded fits (None: no checkpoints)
+        estimator_n_jobs: Threads per model fit (None: 1 when the search runs
+            in parallel, so the two levels do not oversubscribe the cores;
+            all cores otherwise; the returned model gets n_jobs threads back)
+        fold_cache: Build every CV fold once and share it across candidates
+            (grid, random and TPE searches; see fold_cache.py)
     
     Returns:
         Tuple of (best_model, tuning_results)
@@ -295,16 +820,32 @@ def tune_random_forest(
     logger.info("Starting Random Forest hyperparameter tuning...")
     
     # Base model
-    base_model = RandomForestRegressor(random_state=42, n_jobs=n_jobs)
+    base_model = RandomForestRegressor(
+        random_state=42, n_jobs=_estimator_threads(n_jobs, estimator_n_jobs)
+    )
     
     # Parameter grid
     param_grid = get_random_forest_param_grid(search_type)
+    if checkpoint_dir:
+        base_model, param_grid = checkpoint_search_space(base_model, param_grid, checkpoint_dir)
     
     # Time series CV
     tscv = create_time_series_cv(n_splits=cv)
     
     # Search
-    if search_type == 'grid':
+    use_cache = _use_fold_cache(fold_cache, search_type, scoring)
+    if use_cache and search_type in ('grid', 'random'):
+        search = CachedSearchCV(
+            base_model,
+            param_grid,
+            n_iter=None if search_type == 'grid' else n_iter,
+            cv=tscv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            refit=True,
+            random_state=42
+        )
+    elif search_type == 'grid':
         search = GridSearchCV(
             base_model,
             param_grid,
@@ -314,6 +855,31 @@ def tune_random_forest(
             verbose=verbose,
             refit=True
         )
+    elif search_type == 'halving':
+        search = create_halving_search(
+            base_model,
+            param_grid,
+            max_resources=HALVING_MAX_ESTIMATORS['random_forest'],
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose
+        )
+    elif search_type == 'tpe':
+        search = TPESearchCV(
+            base_model,
+            param_grid,
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            storage=tpe_storage,
+            fold_cache=use_cache,
+            study_name='random_forest',
+            random_state=42
+        )
     else:
         search = RandomizedSearchCV(
             base_model,
@@ -329,19 +895,22 @@ def tune_random_forest(
     
     # Fit
     search.fit(X_train, y_train)
+    best_model, best_params, cv_results = search_outcome(search)
+    if estimator_n_jobs is None:
+        best_model = _release_threads(best_model, n_jobs)
     
     # Results
     results = {
-        'best_params': search.best_params_,
+        'best_params': best_params,
         'best_score': -search.best_score_,
-        'cv_results': pd.DataFrame(search.cv_results_),
-        'n_candidates': len(search.cv_results_['mean_test_score'])
+        'cv_results': cv_results,
+        'n_candidates': len(cv_results)
     }
     
     logger.info(f"Best Random Forest RMSE: {results['best_score']:.4f}")
     logger.info(f"Best params: {results['best_params']}")
     
-    return search.best_estimator_, results
+    return best_model, results
 
 
 def tune_gradient_boosting(
@@ -352,7 +921,10 @@ def tune_gradient_boosting(
     cv: int = 5,
     scoring: str = 'neg_root_mean_squared_error',
     n_jobs: int = -1,
-    verbose: int = 1
+    verbose: int = 1,
+    tpe_storage: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    fold_cache: bool = False
 ) -> Tuple[Any, Dict[str, Any]]:
     """
     Tune Gradient Boosting hyperparameters using cross-validation.
@@ -360,12 +932,19 @@ def tune_gradient_boosting(
     Args:
         X_train: Training features
         y_train: Training targets
-        search_type: 'grid' or 'random'
-        n_iter: Number of iterations for random search
+        search_type: 'grid', 'random', 'halving' or 'tpe'
+        n_iter: Number of iterations for random search (first-rung
+            candidates for halving)
         cv: Number of CV folds
         scoring: Scoring metric
         n_jobs: Number of parallel jobs
         verbose: Verbosity level
+        tpe_storage: SQLite file of the 'tpe' trials; rerunning with the same
+            file resumes the study (None: temporary)
+        checkpoint_dir: Directory recording every CV fit; rerunning with the
+            same directory skips the recorded fits (None: no checkpoints)
+        fold_cache: Build every CV fold once and share it across candidates
+            (grid, random and TPE searches; see fold_cache.py)
     
     Returns:
         Tuple of (best_model, tuning_results)
@@ -377,12 +956,26 @@ def tune_gradient_boosting(
     
     # Parameter grid
     param_grid = get_gradient_boosting_param_grid(search_type)
+    if checkpoint_dir:
+        base_model, param_grid = checkpoint_search_space(base_model, param_grid, checkpoint_dir)
     
     # Time series CV
     tscv = create_time_series_cv(n_splits=cv)
     
     # Search
-    if search_type == 'grid':
+    use_cache = _use_fold_cache(fold_cache, search_type, scoring)
+    if use_cache and search_type in ('grid', 'random'):
+        search = CachedSearchCV(
+            base_model,
+            param_grid,
+            n_iter=None if search_type == 'grid' else n_iter,
+            cv=tscv,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            refit=True,
+            random_state=42
+        )
+    elif search_type == 'grid':
         search = GridSearchCV(
             base_model,
             param_grid,
@@ -392,6 +985,31 @@ def tune_gradient_boosting(
             verbose=verbose,
             refit=True
         )
+    elif search_type == 'halving':
+        search = create_halving_search(
+            base_model,
+            param_grid,
+            max_resources=HALVING_MAX_ESTIMATORS['gradient_boosting'],
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose
+        )
+    elif search_type == 'tpe':
+        search = TPESearchCV(
+            base_model,
+            param_grid,
+            n_iter=n_iter,
+            cv=tscv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            verbose=verbose,
+            storage=tpe_storage,
+            fold_cache=use_cache,
+            study_name='gradient_boosting',
+            random_state=42
+        )
     else:
         search = RandomizedSearchCV(
             base_model,
@@ -407,19 +1025,20 @@ def tune_gradient_boosting(
     
     # Fit
     search.fit(X_train, y_train)
+    best_model, best_params, cv_results = search_outcome(search)
     
     # Results
     results = {
-        'best_params': search.best_params_,
+        'best_params': best_params,
         'best_score': -search.best_score_,
-        'cv_results': pd.DataFrame(search.cv_results_),
-        'n_candidates': len(search.cv_results_['mean_test_score'])
+        'cv_results': cv_results,
+        'n_candidates': len(cv_results)
     }
     
     logger.info(f"Best Gradient Boosting RMSE: {results['best_score']:.4f}")
     logger.info(f"Best params: {results['best_params']}")
     
-    return search.best_estimator_, results
+    return best_model, results
 
 
 # ============================================================================
@@ -566,17 +1185,35 @@ def run_full_tuning_pipeline(
     X_test: np.ndarray,
     y_test: np.ndarray,
     n_iter: int = 30,
-    save_dir: Optional[str] = None
+    save_dir: Optional[str] = None,
+    search_type: str = 'random',
+    run_dir: Optional[str] = None,
+    resume: bool = False,
+    total_cores: Optional[int] = None,
+    estimator_threads: int = 1
 ) -> Dict[str, Any]:
     """
     Run full hyperparameter tuning pipeline.
     
+    The three model families are tuned concurrently, one process each, on
+    a shared core budget (see plan_cpu_budget); the CPU utilisation of
+    every stage is logged and returned under 'cpu_usage'.
+    
+    With run_dir, every finished stage (each model's tuning, the ensemble)
+    and every CV fit inside the searches is checkpointed there; resume=True
+    picks an interrupted run up where it stopped.
+    
     Args:
         X_train, y_train: Training data
         X_val, y_val: Validation data
         X_test, y_test: Test data
-        n_iter: Number of random search iterations
+        n_iter: Number of search iterations
         save_dir: Directory to save models
+        search_type: Search type of the tuners ('random', 'halving', 'tpe', 'grid')
+        run_dir: Checkpoint directory (None: no checkpoints)
+        resume: Skip the stages and CV fits already recorded in run_dir
+        total_cores: Core budget of the pipeline (None: all cores)
+        estimator_threads: Threads per model fit for XGBoost and Random Forest
     
     Returns:
         Dictionary with all results
@@ -588,54 +1225,97 @@ def run_full_tuning_pipeline(
     results = {}
     models = {}
     
-    # 1. Tune XGBoost
-    try:
-        xgb_model, xgb_results = tune_xgboost(
-            X_train, y_train,
-            search_type='random',
-            n_iter=n_iter,
-            cv=5
-        )
-        models['xgboost'] = xgb_model
-        results['xgboost'] = xgb_results
-    except Exception as e:
-        logger.error(f"XGBoost tuning failed: {e}")
-    
-    # 2. Tune Random Forest
-    try:
-        rf_model, rf_results = tune_random_forest(
-            X_train, y_train,
-            search_type='random',
-            n_iter=n_iter,
-            cv=5
-        )
-        models['random_forest'] = rf_model
-        results['random_forest'] = rf_results
-    except Exception as e:
-        logger.error(f"Random Forest tuning failed: {e}")
-    
-    # 3. Tune Gradient Boosting
-    try:
-        gb_model, gb_results = tune_gradient_boosting(
-            X_train, y_train,
-            search_type='random',
-            n_iter=n_iter,
-            cv=5
-        )
-        models['gradient_boosting'] = gb_model
-        results['gradient_boosting'] = gb_results
-    except Exception as e:
-        logger.error(f"Gradient Boosting tuning failed: {e}")
+    checkpoint = None
+    if run_dir:
+        fingerprint = _array_hash(X_train, y_train, X_val, y_val, X_test, y_test) \
+            + f"-{search_type}-{n_iter}"
+        checkpoint = TuningCheckpoint(run_dir, resume, fingerprint)
+    
+    # 1-3. Tune XGBoost, Random Forest and Gradient Boosting concurrently
+    tuners = {
+        'xgboost': ('XGBoost', tune_xgboost),
+        'random_forest': ('Random Forest', tune_random_forest),
+        'gradient_boosting': ('Gradient Boosting', tune_gradient_boosting)
+    }
+    pending = []
+    for name, (label, _) in tuners.items():
+        stage = checkpoint.load(name) if checkpoint else None
+        if stage is not None:
+            models[name], results[name] = stage
+            logger.info(f"{label} tuning restored from checkpoint")
+        else:
+            pending.append(name)
+    
+    total_cores = total_cores or os.cpu_count() or 1
+    plan = plan_cpu_budget(pending, total_cores, estimator_threads)
+    cpu_usage = {}
+    
+    if pending:
+        logger.info("CPU budget: " + ", ".join(
+            f"{name} {p['cores']} cores ({p['n_jobs']} jobs x {p['estimator_n_jobs']} threads)"
+            for name, p in plan.items()
+        ))
+        with ProcessPoolExecutor(max_workers=min(len(pending), total_cores)) as pool:
+            futures = {}
+            for name in pending:
+                kwargs = {
+                    'search_type': search_type,
+                    'n_iter': n_iter,
+                    'cv': 5,
+                    'n_jobs': plan[name]['n_jobs'],
+                    **(checkpoint.tuner_kwargs(name) if checkpoint else {})
+                }
+                if name in THREADED_ESTIMATORS:
+                    kwargs['estimator_n_jobs'] = plan[name]['estimator_n_jobs']
+                future = pool.submit(_run_tuning_stage, tuners[name][1], X_train, y_train, kwargs)
+                futures[future] = name
+            
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    model, tuning, usage = future.result()
+                except Exception as e:
+                    logger.error(f"{tuners[name][0]} tuning failed: {e}")
+                    continue
+                models[name] = model
+                results[name] = tuning
+                cpu_usage[name] = {'cores': plan[name]['cores'], **usage}
+                if checkpoint:
+                    checkpoint.save(name, (model, tuning))
+    
+    # The searches ran estimator_n_jobs threads per fit; the ensemble refits
+    # the models one after another, so each gets the whole budget
+    for model in models.values():
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=total_cores)
     
     # 4. Create and fit ensemble
     if len(models) >= 2:
-        logger.info("\nCreating ensemble model...")
-        ensemble = WeightedEnsembleRegressor([
-            (name, model) for name, model in models.items()
-        ])
-        ensemble.fit(X_train, y_train, optimize_weights=True, X_val=X_val, y_val=y_val)
+        ensemble = checkpoint.load('ensemble') if checkpoint else None
+        if ensemble is not None:
+            logger.info("\nEnsemble restored from checkpoint")
+        else:
+            logger.info("\nCreating ensemble model...")
+            cpu_start, wall_start = _cpu_seconds(), time.perf_counter()
+            ensemble = WeightedEnsembleRegressor([
+                (name, model) for name, model in models.items()
+            ])
+            ensemble.fit(X_train, y_train, optimize_weights=True, X_val=X_val, y_val=y_val)
+            # Measured against the threads its fits can use, not the full budget
+            ensemble_cores = max(_model_threads(model, total_cores) for _, model in ensemble.models)
+            cpu_usage['ensemble'] = {'cores': ensemble_cores, 'wall_s': time.perf_counter() - wall_start,
+                                     'cpu_s': _cpu_seconds() - cpu_start}
+            if checkpoint:
+                checkpoint.save('ensemble', ensemble)
         models['ensemble'] = ensemble
     
+    # Core utilisation: CPU time over wall time x cores given to the stage
+    for name, usage in cpu_usage.items():
+        usage['utilisation'] = usage['cpu_s'] / max(usage['wall_s'] * usage['cores'], 1e-9)
+        logger.info(f"{name:20s}: {usage['cores']} cores, {usage['wall_s']:.1f}s wall, "
+                    f"{usage['cpu_s']:.1f}s CPU, utilisation {usage['utilisation']:.0%}")
+    results['cpu_usage'] = cpu_usage
+    
     # 5. Evaluate all models on test set
     logger.info("\n" + "=" * 60)
     logger.info("FINAL TEST SET EVALUATION")
@@ -716,7 +1396,9 @@ if __name__ == "__main__":
         X_val, y_val,
         X_test, y_test,
         n_iter=50,
-        save_dir='models/'
+        save_dir='models/',
+        run_dir='runs/tuning/',  # checkpoints; rerun with resume=True after a crash
+        resume=True
     )
     
     # Access best model
@@ -0,0 +1,521 @@
+"""
+Batch Inference Server for Bangkok Traffic Flow Optimization Project
+
+A long-lived local HTTP service that loads the trained congestion models
+once and serves predictions to other processes, instead of every consumer
+unpickling the models through model_utils.load_model.
+
+Concurrent requests for the same model are micro-batched: a worker thread
+collects requests until max_batch_size is reached or max_wait_ms has passed
+since the first one, builds the features of the whole batch in one
+FeatureGraph call (one group per request) and runs a single predict. Each
+request is validated on its own first, and a batch that still fails is
+retried one request at a time, so a malformed request only fails itself.
+
+Endpoints:
+    POST /predict   {"model": "random_forest", "rows": [{...}, ...],
+                     "last_only": true}
+                    rows are raw history (date, congestion_index and the
+                    exogenous model inputs) in any order: features are
+                    built in date order, predictions come back in the
+                    order of the rows and last_only predicts the latest
+                    date; alternatively "features" is a list of ready
+                    model input vectors (last_only takes the last one)
+    GET  /stats     p50/p99 latency, throughput and batch size counters
+    GET  /health    loaded models
+
+Malformed requests (bad JSON, unknown model, invalid rows or features) are
+answered with 400, failures while building features or predicting with
+500, and unknown paths with 404.
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import json
+import queue
+import threading
+import time
+import numpy as np
+import pandas as pd
+import logging
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from feature_engineering import FeatureGraph
+from model_utils import load_model, get_feature_names, TRAINED_MODEL_FEATURES, MMAP_MANIFEST
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS_DIR = Path(__file__).parent.parent / '02_Model_Development' / 'Trained_Models'
+
+
+# ============================================================================
+# LATENCY AND THROUGHPUT COUNTERS
+# ============================================================================
+
+class InferenceStats:
+    """
+    Thread-safe latency and throughput counters.
+    
+    Latencies are kept for the most recent `window` requests, so the
+    percentiles describe current behaviour rather than the whole uptime.
+    """
+    
+    def __init__(self, window: int = 10000):
+        """
+        Initialize counters.
+        
+        Args:
+            window: Number of recent request latencies kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+    
+    def record_batch(self, latencies: List[float], rows: int) -> None:
+        """Record one processed batch and the latency of each of its requests."""
+        with self._lock:
+            self._latencies.extend(latencies)
+            self.requests += len(latencies)
+            self.rows += rows
+            self.batches += 1
+    
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Current counters.
+        
+        Returns:
+            Dictionary with request/row counts, throughput (per second over
+            the uptime), mean batch size and p50/p99 latency in milliseconds
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            uptime = time.perf_counter() - self.started
+            summary = {
+                'uptime_s': uptime,
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'errors': self.errors,
+                'requests_per_s': self.requests / uptime if uptime > 0 else 0.0,
+                'rows_per_s': self.rows / uptime if uptime > 0 else 0.0,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0
+            }
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            summary.update({'latency_p50_ms': p50, 'latency_p99_ms': p99,
+                            'latency_max_ms': latencies.max() * 1000})
+        return summary
+
+
+# ============================================================================
+# MICRO-BATCHING
+# ============================================================================
+
+class RequestError(ValueError):
+    """Malformed prediction request (the client's fault, HTTP 400)."""
+
+
+class _Request:
+    """One queued prediction request."""
+    
+    __slots__ = ('rows', 'features', 'last_only', 'future', 'enqueued', 'frame', 'order')
+    
+    def __init__(self, rows: Optional[List[Dict]], features: Optional[List], last_only: bool):
+        self.rows = rows
+        self.features = features
+        self.last_only = last_only
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+        self.frame: Optional[pd.DataFrame] = None
+        self.order: Optional[np.ndarray] = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for one model and predicts them together.
+    
+    A single worker thread owns the model, so predict is never called
+    concurrently on it.
+    """
+    
+    def __init__(
+        self,
+        model: Any,
+        feature_names: List[str],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        target_col: str = 'congestion_index',
+        datetime_col: str = 'date',
+        holidays: Optional[pd.DataFrame] = None,
+        stats: Optional[InferenceStats] = None
+    ):
+        """
+        Initialize batcher and start its worker thread.
+        
+        Args:
+            model: Fitted model with predict(X)
+            feature_names: Model inputs in training order
+            max_batch_size: Maximum requests per batch
+            max_wait_ms: Longest a request waits for others to join its batch
+            target_col: Target column name
+            datetime_col: Datetime column name
+            holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+            stats: Counters to record into
+        """
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.target_col = target_col
+        self.datetime_col = datetime_col
+        self.graph = FeatureGraph(target_col, datetime_col, holidays, group_col='_request')
+        self.stats = stats or InferenceStats()
+        self._queue: 'queue.Queue[Optional[_Request]]' = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(
+        self,
+        rows: Optional[List[Dict]] = None,
+        features: Optional[List] = None,
+        last_only: bool = False
+    ) -> Future:
+        """
+        Queue a request.
+        
+        Args:
+            rows: Raw history records in any order (features are built from
+                them in date order)
+            features: Ready model input vectors (skips feature building)
+            last_only: Only predict for the row with the latest date (the last
+                vector for features)
+        
+        Returns:
+            Future resolving to the list of predictions in the order of the
+            rows (None where a row's features are incomplete), or to the
+            error of this request alone when its input is malformed
+        """
+        if (rows is None) == (features is None):
+            raise RequestError("Pass exactly one of rows or features")
+        request = _Request(rows, features, last_only)
+        self._queue.put(request)
+        return request.future
+    
+    def close(self) -> None:
+        """Stop the worker after the queued requests are served."""
+        self._queue.put(None)
+        self._worker.join()
+    
+    def _run(self) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = request.enqueued + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)
+                    break
+                batch.append(request)
+            self._process(batch)
+    
+    def _prepare(self, request: '_Request') -> None:
+        """Validate one request and parse its input; raises RequestError on malformed input."""
+        try:
+            self._parse(request)
+        except RequestError:
+            raise
+        except Exception as e:
+            raise RequestError(f"Invalid request: {e}") from e
+    
+    def _parse(self, request: '_Request') -> None:
+        n_features = len(self.feature_names)
+        if request.features is not None:
+            X = np.asarray(request.features, dtype=np.float64)
+            if X.size == 0 or X.size % n_features:
+                raise RequestError(f"features must be vectors of {n_features} values, "
+                                   f"got shape {X.shape}")
+            request.features = X.reshape(-1, n_features)
+            return
+        
+        frame = pd.DataFrame.from_records(request.rows)
+        if frame.empty:
+            raise RequestError("rows is empty")
+        missing = sorted({self.datetime_col, self.target_col} - set(frame.columns))
+        if missing:
+            raise RequestError(f"rows are missing columns {missing}")
+        dates = pd.to_datetime(frame[self.datetime_col])
+        if dates.isna().any():
+            raise RequestError(f"rows have missing '{self.datetime_col}' values")
+        # Lags and rolling windows need the history in date order
+        request.order = np.argsort(dates.to_numpy(), kind='stable')
+        request.frame = frame.assign(**{self.datetime_col: dates}).iloc[request.order]
+    
+    def _build_inputs(self, batch: List['_Request']) -> List[np.ndarray]:
+        """Model input matrix of every request, feature building batched."""
+        inputs: List[Optional[np.ndarray]] = [None] * len(batch)
+        frames = []
+        for i, request in enumerate(batch):
+            if request.features is not None:
+                inputs[i] = request.features
+            else:
+                frames.append(request.frame.assign(_request=i))
+        
+        if frames:
+            panel = pd.concat(frames, ignore_index=True)
+            built = self.graph.build(panel, self.feature_names, dropna=False)
+            X = built.loc[panel.index].to_numpy(dtype=np.float64)
+            group = panel['_request'].to_numpy()
+            bounds = np.flatnonzero(np.r_[True, group[1:] != group[:-1], True])
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                inputs[group[start]] = X[start:end]
+        
+        for i, request in enumerate(batch):
+            if request.last_only:
+                inputs[i] = inputs[i][-1:]
+            elif request.order is not None:
+                # Back to the order the rows were submitted in
+                restored = np.empty_like(inputs[i])
+                restored[request.order] = inputs[i]
+                inputs[i] = restored
+        return inputs
+    
+    def _predict(self, batch: List['_Request']) -> None:
+        """Build, predict and resolve the futures of prepared requests."""
+        inputs = self._build_inputs(batch)
+        X = np.concatenate(inputs)
+        complete = ~np.isnan(X).any(axis=1)
+        predictions = np.full(len(X), np.nan)
+        if complete.any():
+            predictions[complete] = self.model.predict(X[complete])
+        
+        done = time.perf_counter()
+        offset = 0
+        for request, X_request in zip(batch, inputs):
+            values = predictions[offset:offset + len(X_request)]
+            offset += len(X_request)
+            request.future.set_result([None if np.isnan(v) else float(v) for v in values])
+        self.stats.record_batch([done - request.enqueued for request in batch], len(X))
+    
+    def _fail(self, request: '_Request', error: Exception) -> None:
+        self.stats.record_error()
+        request.future.set_exception(error)
+    
+    def _process(self, batch: List['_Request']) -> None:
+        ready = []
+        for request in batch:
+            try:
+                self._prepare(request)
+            except Exception as e:
+                self._fail(request, e)
+            else:
+                ready.append(request)
+        if not ready:
+            return
+        
+        try:
+            self._predict(ready)
+        except Exception as e:
+            if len(ready) == 1:
+                self._fail(ready[0], e)
+                return
+            # Input that only feature building or predict rejects: isolate it
+            # by serving the requests one at a time
+            for request in ready:
+                try:
+                    self._predict([request])
+                except Exception as e:
+                    self._fail(request, e)
+
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+
+class InferenceServer:
+    """
+    HTTP front end over one MicroBatcher per loaded model.
+    """
+    
+    def __init__(
+        self,
+        models: Union[str, Path, Dict[str, Any]] = DEFAULT_MODELS_DIR,
+        feature_names: Optional[List[str]] = None,
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        holidays: Optional[pd.DataFrame] = None
+    ):
+        """
+        Load models and bind the server (call serve_forever or start to run).
+        
+        Args:
+            models: Directory of *_model.pkl files or *_model mmap artifacts,
+                or dict of name -> model
+            feature_names: Model inputs for models that do not record their
+                names (default: model_utils.TRAINED_MODEL_FEATURES); a model
+                whose n_features_in_ differs from its list is refused
+            host: Interface to bind (local only by default)
+            port: TCP port (0 picks a free port)
+            max_batch_size: Maximum requests per batch
+            max_wait_ms: Longest a request waits for others to join its batch
+            holidays: Dated holiday list for is_holiday (None for fixed-date holidays)
+        """
+        if not isinstance(models, dict):
+            paths = {path.stem: path for path in sorted(Path(models).glob('*_model.pkl'))}
+            # Memory-mapped artifact directories take precedence over pickles
+            paths.update({
+                path.name: path for path in sorted(Path(models).glob('*_model'))
+                if (path / MMAP_MANIFEST).exists()
+            })
+            models = {
+                stem.replace('_model', ''): load_model(str(path))
+                for stem, path in paths.items()
+            }
+        if not models:
+            raise ValueError("No models to serve")
+        
+        self.stats = InferenceStats()
+        self.batchers = {}
+        for name, model in models.items():
+            names = get_feature_names(model, feature_names) or TRAINED_MODEL_FEATURES
+            n_features = getattr(model, 'n_features_in_', None)
+            if n_features is not None and n_features != len(names):
+                raise ValueError(
+                    f"Model '{name}' expects {n_features} features but its feature list has "
+                    f"{len(names)}; pass the feature_names it was trained on"
+                )
+            if n_features is None:
+                logger.warning(f"Model '{name}' does not record its input size; "
+                               f"serving it with {len(names)} features unchecked")
+            self.batchers[name] = MicroBatcher(
+                model, names, max_batch_size, max_wait_ms, holidays=holidays, stats=self.stats
+            )
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        logger.info(f"Serving {sorted(self.batchers)} on http://{host}:{self.port}")
+    
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+    
+    def predict(self, model: str, rows: Optional[List[Dict]] = None,
+                features: Optional[List] = None, last_only: bool = False) -> List[Optional[float]]:
+        """In-process prediction through the same micro-batching queue."""
+        if model not in self.batchers:
+            raise RequestError(f"Unknown model '{model}'. Available: {sorted(self.batchers)}")
+        return self.batchers[model].submit(rows, features, last_only).result()
+    
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+    
+    def start(self) -> 'InferenceServer':
+        """Serve from a background thread (e.g. for tests and load tests)."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for batcher in self.batchers.values():
+            batcher.close()
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def _reply(self, status: int, payload: Dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                if self.path == '/stats':
+                    self._reply(200, server.stats.snapshot())
+                elif self.path == '/health':
+                    self._reply(200, {'status': 'ok', 'models': sorted(server.batchers)})
+                else:
+                    self._reply(404, {'error': f'Unknown path {self.path}'})
+            
+            def do_POST(self):
+                if self.path != '/predict':
+                    self._reply(404, {'error': f'Unknown path {self.path}'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length', 0))
+                    payload = json.loads(self.rfile.read(length))
+                except ValueError as e:
+                    self._reply(400, {'error': f'Invalid JSON body: {e}'})
+                    return
+                if not isinstance(payload, dict):
+                    self._reply(400, {'error': 'Request body must be a JSON object'})
+                    return
+                try:
+                    predictions = server.predict(
+                        payload.get('model', 'random_forest'), payload.get('rows'),
+                        payload.get('features'), payload.get('last_only', False)
+                    )
+                except RequestError as e:
+                    self._reply(400, {'error': str(e)})
+                except Exception as e:
+                    logger.error(f"Prediction failed: {type(e).__name__}: {e}")
+                    self._reply(500, {'error': f'{type(e).__name__}: {e}'})
+                else:
+                    self._reply(200, {'predictions': predictions})
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return Handler
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Serve trained congestion models over local HTTP")
+    parser.add_argument('--models-dir', default=str(DEFAULT_MODELS_DIR))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+    
+    server = InferenceServer(args.models_dir, host=args.host, port=args.port,
+                             max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,174 @@
+"""
+Load Test for the Batch Inference Server
+
+Drives inference_server.py with concurrent synthetic requests and reports
+client-side latency percentiles and throughput next to the server's own
+/stats counters.
+
+Each synthetic request carries a random daily history (congestion index,
+traffic and weather columns) long enough for the 14-day lags and rolling
+windows, and asks for the prediction of its last day.
+
+Usage:
+    # Start a server in-process and test it
+    python load_test_inference.py --spawn --concurrency 32 --requests 2000
+    
+    # Test a running server
+    python load_test_inference.py --url http://127.0.0.1:8765
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+def make_request_payload(
+    rng: np.random.Generator,
+    model: str = 'random_forest',
+    history_days: int = 30
+) -> Dict:
+    """
+    Synthetic history in the raw format the server expects.
+    
+    Args:
+        rng: Random generator
+        model: Model name to query
+        history_days: Days of history per request
+    
+    Returns:
+        JSON-serialisable request payload
+    """
+    end = pd.Timestamp('2025-01-01') + pd.Timedelta(days=int(rng.integers(0, 300)))
+    dates = pd.date_range(end=end, periods=history_days, freq='D')
+    weekly = 8 * np.sin(2 * np.pi * dates.dayofweek.to_numpy() / 7)
+    frame = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'congestion_index': 50 + weekly + rng.normal(0, 3, history_days),
+        'traffic_volume': rng.normal(2400, 150, history_days),
+        'average_speed': rng.normal(38, 4, history_days),
+        'temp_avg': rng.normal(29, 2, history_days),
+        'humidity': rng.normal(72, 6, history_days),
+        'rainfall': rng.exponential(4, history_days),
+        'pressure': rng.normal(1010, 3, history_days),
+        'wind_speed': rng.normal(5, 1, history_days)
+    })
+    return {'model': model, 'rows': frame.to_dict(orient='records'), 'last_only': True}
+
+
+def _post(url: str, payload: bytes) -> Dict:
+    request = urllib.request.Request(
+        f'{url}/predict', data=payload, headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run_load_test(
+    url: str,
+    n_requests: int = 1000,
+    concurrency: int = 16,
+    model: str = 'random_forest',
+    history_days: int = 30,
+    seed: int = 42
+) -> Dict[str, float]:
+    """
+    Send n_requests from `concurrency` client threads.
+    
+    Args:
+        url: Server base URL
+        n_requests: Total requests
+        concurrency: Concurrent client threads
+        model: Model name to query
+        history_days: Days of history per request
+        seed: Random seed for the synthetic payloads
+    
+    Returns:
+        Client-side summary (throughput, latency percentiles, errors)
+    """
+    rng = np.random.default_rng(seed)
+    payloads = [
+        json.dumps(make_request_payload(rng, model, history_days)).encode()
+        for _ in range(min(n_requests, 200))
+    ]
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+    
+    def client() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                _post(url, payloads[i % len(payloads)])
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+    
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000 if latencies else (np.nan, np.nan)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed_s': elapsed,
+        'requests_per_s': len(latencies) / elapsed,
+        'latency_p50_ms': p50,
+        'latency_p99_ms': p99
+    }
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the batch inference server")
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--spawn', action='store_true',
+                        help='start a server in-process on a free port')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--model', default='random_forest')
+    parser.add_argument('--history-days', type=int, default=30)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+    
+    server = None
+    url = args.url
+    if args.spawn:
+        from inference_server import InferenceServer
+        server = InferenceServer(port=0, max_batch_size=args.max_batch_size,
+                                 max_wait_ms=args.max_wait_ms).start()
+        url = f'http://127.0.0.1:{server.port}'
+    
+    client = run_load_test(url, args.requests, args.concurrency, args.model, args.history_days)
+    with urllib.request.urlopen(f'{url}/stats') as response:
+        stats = json.loads(response.read())
+    
+    print(f"\nClient ({args.concurrency} threads, {args.requests} requests)")
+    for key, value in client.items():
+        print(f"  {key:<18} {value:,.2f}")
+    print("\nServer /stats")
+    for key, value in stats.items():
+        print(f"  {key:<18} {value:,.2f}")
+    
+    if server is not None:
+        server.stop()
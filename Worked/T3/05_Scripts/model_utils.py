@@ -27,6 +27,15 @@ logger = logging.getLogger(__name__)
 # MODEL SAVING AND LOADING
 # ============================================================================
 
+# Memory-mapped artifacts: a directory with a JSON manifest and one .npy per array
+MMAP_MANIFEST = 'manifest.json'
+MMAP_FORMAT_VERSION = 1
+
+# Estimator attributes a mapped tree model answers from its manifest, so
+# reading them does not unpickle the estimator
+MMAP_ESTIMATOR_ATTRIBUTES = ('n_features_in_', 'feature_names_in_')
+
+
 def save_model(
     model: Any,
     filepath: str,
@@ -37,8 +46,8 @@ def save_model(
     
     Args:
         model: Trained model object
-        filepath: Output file path
-        model_type: Type of model ('sklearn', 'keras', 'pytorch')
+        filepath: Output file path (a directory for model_type='mmap')
+        model_type: Type of model ('sklearn', 'keras', 'pytorch', 'mmap')
     """
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -54,6 +63,9 @@ def save_model(
             pickle.dump(model, f)
         logger.info(f"Model saved to {filepath}")
     
+    elif model_type == 'mmap':
+        _save_mmap_artifact(model, filepath)
+    
     else:
         raise ValueError(f"Unknown model type: {model_type}")
 
@@ -65,9 +77,11 @@ def load_model(
     """
     Load a trained model from file.
     
+    A directory holding a manifest.json is always read as an mmap artifact.
+    
     Args:
         filepath: Model file path
-        model_type: Type of model ('sklearn', 'keras', 'pytorch')
+        model_type: Type of model ('sklearn', 'keras', 'pytorch', 'mmap')
     
     Returns:
         Loaded model object
@@ -77,7 +91,10 @@ def load_model(
     if not filepath.exists():
         raise FileNotFoundError(f"Model file not found: {filepath}")
     
-    if model_type == 'keras':
+    if model_type == 'mmap' or (filepath / MMAP_MANIFEST).exists():
+        model = _load_mmap_artifact(filepath)
+    
+    elif model_type == 'keras':
         from tensorflow.keras.models import load_model as keras_load
         model = keras_load(str(filepath))
         logger.info(f"Keras model loaded from {filepath}")
@@ -93,6 +110,172 @@ def load_model(
     return model
 
 
+def _save_mmap_artifact(model: Any, directory: Path) -> None:
+    """
+    Write a model as a manifest plus one .npy file per numeric array.
+    
+    Tree ensembles (random forest, XGBoost) are stored as the flat node
+    arrays of tree_evaluator next to the pickled estimator, and load as a
+    MappedTreeModel: predict runs on the flat arrays, everything else is
+    read from the estimator. Other models are pickled with their arrays kept
+    out-of-band (pickle protocol 5), so the arrays are still memory-mapped.
+    
+    A tree artifact therefore holds the ensemble twice on disk: the flat
+    arrays, and the estimator, which the flat arrays cannot rebuild (no
+    impurities or sample counts). Only the flat arrays are paged in for
+    predict; the estimator's pages are read when another attribute is
+    first used. manifest['sizes'] records the bytes of each part. Saving
+    export_trees(model) instead stores only the flat arrays (predict-only).
+    """
+    from tree_evaluator import FlatTreeEnsemble, export_trees
+    
+    if isinstance(model, MappedTreeModel):
+        model = model.estimator
+    if isinstance(model, FlatTreeEnsemble):
+        flat = model
+    else:
+        try:
+            flat = export_trees(model)
+        except ValueError:
+            flat = None
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        'format_version': MMAP_FORMAT_VERSION,
+        'model_class': f"{type(model).__module__}.{type(model).__name__}",
+        'created': datetime.now().isoformat(),
+        'arrays': {}
+    }
+    
+    arrays = {}
+    if flat is not None:
+        manifest['kind'] = 'flat_trees'
+        manifest['metadata'] = flat.metadata
+        arrays.update(flat.arrays)
+    else:
+        manifest['kind'] = 'pickle'
+    
+    if flat is not model:
+        buffers = []
+        payload = pickle.dumps(model, protocol=5, buffer_callback=buffers.append)
+        manifest['pickle'] = 'model.pkl'
+        (directory / 'model.pkl').write_bytes(payload)
+        arrays.update({f'buffer_{i}': np.frombuffer(buffer.raw(), dtype=np.uint8)
+                       for i, buffer in enumerate(buffers)})
+        manifest['estimator_attributes'] = {
+            name: np.asarray(getattr(model, name)).tolist()
+            for name in MMAP_ESTIMATOR_ATTRIBUTES if hasattr(model, name)
+        }
+    
+    for name, array in arrays.items():
+        np.save(directory / f'{name}.npy', np.ascontiguousarray(array))
+        manifest['arrays'][name] = {'file': f'{name}.npy', 'dtype': str(array.dtype),
+                                    'shape': list(array.shape)}
+    
+    estimator_bytes = sum(a.nbytes for name, a in arrays.items() if name.startswith('buffer_'))
+    if 'pickle' in manifest:
+        estimator_bytes += (directory / manifest['pickle']).stat().st_size
+    manifest['sizes'] = {
+        'flat_bytes': sum(a.nbytes for name, a in arrays.items() if not name.startswith('buffer_'))
+        if flat is not None else 0,
+        'estimator_bytes': estimator_bytes
+    }
+    
+    # Manifest last, so a partially written artifact is never loadable
+    tmp_path = directory / (MMAP_MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(directory / MMAP_MANIFEST)
+    sizes = manifest['sizes']
+    logger.info(f"Model saved to {directory} ({manifest['kind']}, {len(arrays)} arrays, "
+                f"{sizes['flat_bytes'] / 1e6:.1f} MB flat + {sizes['estimator_bytes'] / 1e6:.1f} MB estimator)")
+
+
+def _load_mmap_artifact(directory: Path) -> Any:
+    """Open an artifact written by _save_mmap_artifact; arrays are read-only memory maps."""
+    with open(directory / MMAP_MANIFEST) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != MMAP_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version: {manifest.get('format_version')}")
+    
+    # Plain ndarray views of the maps: pages are shared by every process
+    arrays = {
+        name: np.asarray(np.load(directory / spec['file'], mmap_mode='r'))
+        for name, spec in manifest['arrays'].items()
+    }
+    
+    buffers = [arrays[f'buffer_{i}'] for i in range(sum(n.startswith('buffer_') for n in arrays))]
+    
+    if manifest['kind'] == 'flat_trees':
+        from tree_evaluator import FlatTreeEnsemble
+        flat = FlatTreeEnsemble.from_arrays(
+            {name: a for name, a in arrays.items() if not name.startswith('buffer_')},
+            manifest['metadata']
+        )
+        # Artifacts of a bare FlatTreeEnsemble have no estimator
+        model = MappedTreeModel(flat, directory, manifest, buffers) if 'pickle' in manifest else flat
+    elif manifest['kind'] == 'pickle':
+        model = pickle.loads((directory / manifest['pickle']).read_bytes(), buffers=buffers)
+    else:
+        raise ValueError(f"Unknown artifact kind: {manifest['kind']}")
+    
+    logger.info(f"Model loaded from {directory} ({manifest['kind']}, memory-mapped)")
+    return model
+
+
+class MappedTreeModel:
+    """
+    Tree ensemble opened from a memory-mapped artifact.
+    
+    predict runs the flat evaluator on the mapped node arrays, with
+    predictions identical to the estimator's. Every other attribute
+    (get_params, get_booster, feature_importances_, ...) is read from the
+    original estimator, unpickled from the artifact on first use;
+    n_features_in_ and feature_names_in_ come from the manifest.
+    """
+    
+    def __init__(
+        self,
+        flat: Any,
+        directory: Path,
+        manifest: Dict[str, Any],
+        buffers: list
+    ):
+        """
+        Initialize from an opened artifact.
+        
+        Args:
+            flat: FlatTreeEnsemble over the mapped arrays
+            directory: Artifact directory
+            manifest: Parsed manifest
+            buffers: Mapped out-of-band buffers of the estimator pickle
+        """
+        self.flat = flat
+        self.directory = Path(directory)
+        self._manifest = manifest
+        self._buffers = buffers
+        self._estimator = None
+        for name, value in manifest.get('estimator_attributes', {}).items():
+            setattr(self, name, np.asarray(value, dtype=object) if isinstance(value, list) else value)
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.flat.predict(X)
+    
+    @property
+    def estimator(self) -> Any:
+        """The original estimator (unpickled on first access)."""
+        if self._estimator is None:
+            payload = (self.directory / self._manifest['pickle']).read_bytes()
+            self._estimator = pickle.loads(payload, buffers=self._buffers)
+        return self._estimator
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not set on the wrapper
+        if name.startswith('_') or name in MMAP_ESTIMATOR_ATTRIBUTES or name == 'feature_names':
+            raise AttributeError(name)
+        return getattr(self.estimator, name)
+
+
 # ============================================================================
 # CONFIGURATION MANAGEMENT
 # ============================================================================
@@ -297,6 +480,23 @@ def get_reproducibility_info() -> Dict[str, str]:
 # UTILITIES
 # ============================================================================
 
+# Input columns of the models in 02_Model_Development/Trained_Models, in
+# training order: the numeric columns of features_engineered.csv except the
+# target and is_outlier. The pickles record n_features_in_ (33) but no names.
+TRAINED_MODEL_FEATURES = [
+    'traffic_volume', 'average_speed', 'year', 'month', 'day', 'dayofweek',
+    'is_weekend', 'is_holiday', 'dayofyear', 'weekofyear', 'quarter',
+    'is_month_start', 'is_month_end', 'temp_avg', 'humidity', 'rainfall',
+    'pressure', 'wind_speed', 'congestion_index_lag_1', 'congestion_index_lag_7',
+    'congestion_index_lag_14', 'congestion_index_rolling_mean_7',
+    'congestion_index_rolling_std_7', 'congestion_index_rolling_min_7',
+    'congestion_index_rolling_max_7', 'congestion_index_rolling_mean_14',
+    'congestion_index_rolling_std_14', 'congestion_index_rolling_min_14',
+    'congestion_index_rolling_max_14', 'month_sin', 'month_cos',
+    'dayofweek_sin', 'dayofweek_cos'
+]
+
+
 def get_feature_names(
     model: Any,
     feature_names: Optional[list] = None
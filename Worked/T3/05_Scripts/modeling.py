@@ -38,26 +38,127 @@ logger = logging.getLogger(__name__)
 def create_sequences(
     data: np.ndarray,
     sequence_length: int = 7,
-    target_col_idx: int = 0
+    target_col_idx: int = 0,
+    stride: int = 1,
+    horizon: int = 1
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Create sequences for LSTM training.
     
+    Windows are strided views of data (sliding_window_view), so nothing is
+    copied and memory stays at the size of data rather than
+    sequence_length times it. Both arrays are read-only; use
+    np.ascontiguousarray on a batch if a framework needs an owned copy.
+    
     Args:
         data: Feature array of shape (n_samples, n_features)
         sequence_length: Number of time steps in each sequence
         target_col_idx: Index of target column
+        stride: Rows between the starts of consecutive windows
+        horizon: Steps ahead of the window's last row to predict (1 = next row)
     
     Returns:
-        Tuple of (X, y) where X has shape (n_samples, sequence_length, n_features)
+        Tuple of (X, y) where X has shape (n_sequences, sequence_length, n_features)
+    """
+    if sequence_length < 1 or stride < 1 or horizon < 1:
+        raise ValueError("sequence_length, stride and horizon must be positive")
+    
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, None]
+    n_sequences = max(0, (len(data) - sequence_length - horizon) // stride + 1)
+    
+    if n_sequences == 0:
+        X = np.empty((0, sequence_length, data.shape[1]), dtype=data.dtype)
+        y = np.empty(0, dtype=data.dtype)
+    else:
+        # (n_windows, n_features, sequence_length) -> (n_windows, sequence_length, n_features)
+        windows = np.lib.stride_tricks.sliding_window_view(data, sequence_length, axis=0)
+        X = windows.transpose(0, 2, 1)[::stride][:n_sequences]
+        y = data[sequence_length + horizon - 1::stride, target_col_idx][:n_sequences]
+    
+    X, y = X.view(), y.view()
+    X.flags.writeable = False
+    y.flags.writeable = False
+    return X, y
+
+
+def iter_sequence_batches(
+    source: Union[np.ndarray, Any],
+    sequence_length: int = 7,
+    batch_size: int = 256,
+    target_col_idx: int = 0,
+    stride: int = 1,
+    horizon: int = 1
+):
     """
-    X, y = [], []
+    Yield (X, y) training batches of sequences without building them all.
     
-    for i in range(sequence_length, len(data)):
-        X.append(data[i-sequence_length:i])
-        y.append(data[i, target_col_idx])
+    source is either an array (including np.memmap / np.load(mmap_mode='r')
+    for histories larger than RAM, in which case batches are views paged in
+    on access) or an iterable of consecutive row chunks, e.g. arrays read
+    from Parquet partitions. For chunks, the rows a window needs from the
+    previous chunk are carried over so the sequences are identical to
+    create_sequences on the concatenated data.
+    
+    Args:
+        source: Array of shape (n_samples, n_features) or iterable of such chunks
+        sequence_length: Number of time steps in each sequence
+        batch_size: Sequences per batch (the last batch may be smaller)
+        target_col_idx: Index of target column
+        stride: Rows between the starts of consecutive windows
+        horizon: Steps ahead of the window's last row to predict
     
-    return np.array(X), np.array(y)
+    Yields:
+        Tuple of (X_batch, y_batch)
+    """
+    if isinstance(source, np.ndarray):
+        X, y = create_sequences(source, sequence_length, target_col_idx, stride, horizon)
+        for start in range(0, len(X), batch_size):
+            yield X[start:start + batch_size], y[start:start + batch_size]
+        return
+    
+    carry = None
+    carry_offset = 0     # position of carry[0] in the full history
+    next_start = 0       # position of the next window's first row
+    pending: List[Tuple[np.ndarray, np.ndarray]] = []
+    n_pending = 0
+    
+    for chunk in source:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[:, None]
+        block = chunk if carry is None or len(carry) == 0 else np.concatenate([carry, chunk])
+        first = next_start - carry_offset
+        
+        X, y = create_sequences(block[first:], sequence_length, target_col_idx, stride, horizon)
+        next_start += len(X) * stride
+        keep_from = min(next_start - carry_offset, len(block))
+        carry = block[keep_from:]
+        carry_offset += keep_from
+        
+        position = 0
+        if n_pending:
+            # Top up the batch left over from the previous chunk
+            take = min(batch_size - n_pending, len(X))
+            pending.append((X[:take], y[:take]))
+            n_pending += take
+            position = take
+            if n_pending == batch_size:
+                yield (np.concatenate([part[0] for part in pending]),
+                       np.concatenate([part[1] for part in pending]))
+                pending, n_pending = [], 0
+        
+        while len(X) - position >= batch_size:
+            yield X[position:position + batch_size], y[position:position + batch_size]
+            position += batch_size
+        if position < len(X):
+            pending.append((X[position:], y[position:]))
+            n_pending += len(X) - position
+    
+    if n_pending:
+        yield (np.concatenate([part[0] for part in pending]),
+               np.concatenate([part[1] for part in pending]))
 
 
 def temporal_train_test_split(
@@ -325,6 +426,134 @@ def train_xgboost_model(
     return model, training_info
 
 
+def update_xgboost_model(
+    model: Union[Any, str],
+    X_new: np.ndarray,
+    y_new: np.ndarray,
+    X_val: Optional[np.ndarray] = None,
+    y_val: Optional[np.ndarray] = None,
+    n_rounds: int = 20,
+    max_total_rounds: int = 500,
+    max_degradation: float = 0.05,
+    X_full: Optional[np.ndarray] = None,
+    y_full: Optional[np.ndarray] = None,
+    config: Optional[Dict] = None,
+    save_path: Optional[str] = None
+) -> Tuple[Any, Dict]:
+    """
+    Warm-start an XGBoost model on newly arrived data.
+    
+    Appends n_rounds boosting rounds trained on (X_new, y_new) to the
+    existing booster instead of training from scratch. The update is
+    rejected when the validation RMSE gets worse than the current model's
+    by more than max_degradation (relative), or when the booster would
+    exceed max_total_rounds; the model is then retrained from scratch with
+    train_xgboost_model on (X_full, y_full) if given, and otherwise kept
+    unchanged. A retrain uses the model's original n_estimators (recorded
+    on the booster at the first update), not the grown round count, so
+    later updates can append rounds again.
+    
+    Args:
+        model: Trained XGBRegressor, or a path model_utils.load_model reads
+            (e.g. xgboost_model.pkl or an mmap artifact directory)
+        X_new: Features of the newly arrived rows
+        y_new: Targets of the newly arrived rows
+        X_val: Validation features for the guard (optional)
+        y_val: Validation targets for the guard (optional)
+        n_rounds: Boosting rounds appended per update
+        max_total_rounds: Round budget of the booster before a full retrain
+        max_degradation: Allowed relative increase of the validation RMSE
+        X_full: Full history features for the fallback retrain (optional)
+        y_full: Full history targets for the fallback retrain (optional)
+        config: Parameter overrides for the appended rounds (e.g. learning_rate)
+            and for the fallback retrain, which otherwise reuses the current
+            model's hyperparameters and original n_estimators
+        save_path: Path to save the resulting model
+    
+    Returns:
+        Tuple of (model, update_info); update_info['action'] is 'updated',
+        'retrained' or 'kept'
+    """
+    try:
+        import xgboost as xgb
+    except ImportError:
+        logger.error("XGBoost not installed. Install with: pip install xgboost")
+        raise
+    
+    if isinstance(model, (str, Path)):
+        from model_utils import load_model
+        model = load_model(str(model))
+    # An mmap artifact opens as a predict-only wrapper; update its estimator
+    model = getattr(model, 'estimator', model)
+    if not hasattr(model, 'get_booster'):
+        raise TypeError(
+            f"update_xgboost_model needs an XGBRegressor with its booster, got "
+            f"{type(model).__name__} (a predict-only export cannot be warm-started)"
+        )
+    
+    def val_rmse(candidate: Any) -> float:
+        return float(np.sqrt(np.mean((y_val - candidate.predict(X_val)) ** 2)))
+    
+    has_val = X_val is not None and y_val is not None
+    rounds_before = model.get_booster().num_boosted_rounds()
+    base_rounds = int(model.get_booster().attr('base_n_estimators') or model.get_params()['n_estimators'])
+    update_info = {
+        'rounds_before': rounds_before,
+        'val_rmse_before': val_rmse(model) if has_val else None,
+        'val_rmse_after': None,
+        'reason': None
+    }
+    
+    candidate = None
+    if rounds_before + n_rounds > max_total_rounds:
+        update_info['reason'] = f"round budget exceeded ({rounds_before} + {n_rounds} > {max_total_rounds})"
+    else:
+        # Same hyperparameters, n_rounds new trees on top of the current booster
+        params = {**model.get_params(), **(config or {}), 'n_estimators': n_rounds}
+        candidate = xgb.XGBRegressor(**params)
+        
+        logger.info(f"Appending {n_rounds} rounds to a {rounds_before}-round booster "
+                    f"on {len(X_new)} new rows...")
+        candidate.fit(X_new, y_new, xgb_model=model.get_booster())
+        candidate.set_params(n_estimators=rounds_before + n_rounds)
+        candidate.get_booster().set_attr(base_n_estimators=str(base_rounds))
+        
+        if has_val:
+            update_info['val_rmse_after'] = val_rmse(candidate)
+            limit = update_info['val_rmse_before'] * (1 + max_degradation)
+            if update_info['val_rmse_after'] > limit:
+                update_info['reason'] = (f"validation RMSE degraded "
+                                         f"{update_info['val_rmse_before']:.4f} -> "
+                                         f"{update_info['val_rmse_after']:.4f}")
+    
+    if update_info['reason'] is None:
+        model = candidate
+        update_info['action'] = 'updated'
+    elif X_full is not None and y_full is not None:
+        logger.warning(f"Update rejected ({update_info['reason']}); retraining from scratch")
+        retrain_config = {**model.get_params(), 'n_estimators': base_rounds, **(config or {})}
+        retrain_config = {key: retrain_config[key] for key in [
+            'n_estimators', 'max_depth', 'learning_rate', 'subsample', 'colsample_bytree',
+            'min_child_weight', 'gamma', 'reg_alpha', 'reg_lambda', 'random_state', 'n_jobs'
+        ]}
+        model, _ = train_xgboost_model(X_full, y_full, config=retrain_config)
+        update_info['val_rmse_after'] = val_rmse(model) if has_val else None
+        update_info['action'] = 'retrained'
+    else:
+        logger.warning(f"Update rejected ({update_info['reason']}); keeping the current model")
+        update_info['action'] = 'kept'
+    
+    update_info['rounds_after'] = model.get_booster().num_boosted_rounds()
+    
+    # Save model
+    if save_path:
+        with open(save_path, 'wb') as f:
+            pickle.dump(model, f)
+        logger.info(f"Model saved to {save_path}")
+    
+    return model, update_info
+
+
 # ============================================================================
 # ARIMA MODEL (DEPRECATED - Out of project scope)
 # ============================================================================
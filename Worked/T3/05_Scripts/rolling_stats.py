@@ -0,0 +1,293 @@
+"""
+Rolling Statistics Kernel for Bangkok Traffic Flow Optimization Project
+
+This module computes trailing-window mean, std, min and max for several
+window sizes at once, replacing one pandas rolling pass per statistic and
+window. Mean/std cost O(n) per window regardless of window length and min/max
+share one O(n log w_max) pass across all windows:
+
+- mean/std come from prefix sums re-anchored every block of rows: each
+  block is summed together with the block before it, centred on their
+  mean, so no window total is the difference of two whole-series prefixes.
+  Rows whose variance would still lose digits to cancellation (a window
+  just after a level shift) are recomputed from their values directly
+- min/max use a doubling (sparse-table) scheme, the vectorised counterpart
+  of a monotonic deque: extrema over the last 2**k rows are built level by
+  level, and each window is the extreme of two overlapping power-of-two
+  spans, so every window reads two precomputed values
+
+Results follow pandas semantics: NaNs are skipped, a window yields NaN when
+it holds fewer than min_periods valid values, and std uses ddof=1. Windows
+can be clipped at segment starts for panel data (see group_start).
+
+The same file lives in T2/04_Scripts and T3/05_Scripts so each stage's
+scripts run on their own; change both copies together (both test suites
+check that they are identical).
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+ROLLING_STATS = ('mean', 'std', 'min', 'max')
+
+# Smallest block for the re-anchored prefix sums, and the ratio of prefix
+# magnitude to a window's sum of squared deviations above which that window's
+# variance is recomputed directly (bounds the relative error near 1e-9)
+MIN_BLOCK = 16
+CANCELLATION_RATIO = 1e6
+
+
+def _sliding_min(
+    values: np.ndarray,
+    windows: Sequence[int],
+    offset: Optional[np.ndarray] = None
+) -> Dict[int, np.ndarray]:
+    """
+    Trailing min over [i - window + 1, i] for several windows at once.
+    
+    Uses doubling: level k holds the min over the last 2**k rows, built from
+    level k - 1 with one vectorised np.minimum. A window of size w is then the
+    min of two overlapping power-of-two spans, so all windows share the same
+    O(n log w_max) pass. Spans never reach before the start of the array, or
+    before a row's group start when offset (position within group) is given.
+    values must not contain NaN (use +inf for missing).
+    """
+    n = len(values)
+    spans = {w: 1 << (int(w).bit_length() - 1) for w in windows}
+    needed = set(spans.values())
+    levels = {}
+    level, span = values, 1
+    while True:
+        if span in needed:
+            levels[span] = level
+        if span * 2 > max(spans.values()):
+            break
+        doubled = level.copy()
+        if span < n:
+            np.minimum(level[span:], level[:-span], out=doubled[span:])
+            if offset is not None:
+                np.copyto(doubled, level, where=offset < span)
+        level, span = doubled, span * 2
+    
+    results = {}
+    for window, span in spans.items():
+        level = levels[span]
+        rest = window - span
+        if rest == 0 or rest >= n:
+            results[window] = level.copy()
+            continue
+        out = level.copy()
+        np.minimum(level[rest:], level[:-rest], out=out[rest:])
+        if offset is not None:
+            np.copyto(out, level, where=offset < rest)
+        results[window] = out
+    return results
+
+
+def _window_sums(
+    prefix: np.ndarray,
+    window: int,
+    head: Optional[np.ndarray],
+    group_start: Optional[np.ndarray]
+) -> np.ndarray:
+    """Window totals prefix[i + 1] - prefix[start_i] using slices, not gathers."""
+    n = len(prefix) - 1
+    k = min(window - 1, n)
+    out = np.empty(n, dtype=prefix.dtype)
+    np.subtract(prefix[1:k + 1], prefix[0], out=out[:k])
+    np.subtract(prefix[k + 1:], prefix[:n - k], out=out[k:])
+    if head is not None:
+        out[head] = prefix[1:][head] - prefix[group_start[head]]
+    return out
+
+
+def _block_prefix(
+    filled: np.ndarray,
+    valid: np.ndarray,
+    block: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Prefix sums of values and squares, re-anchored every `block` rows.
+    
+    Row b covers blocks b - 1 and b (row 0 starts with a zero block), centred
+    on the mean of their valid values, so any trailing window of at most
+    `block` rows ending in block b is the difference of two entries of row b.
+    filled holds the values with NaN replaced by 0.
+    
+    Returns:
+        (value prefix, square prefix, shift per block); prefixes have shape
+        (n_blocks, 2 * block + 1)
+    """
+    n = len(filled)
+    n_blocks = -(-n // block)
+    pairs = np.zeros((n_blocks, 2 * block))
+    counts = np.zeros((n_blocks, 2 * block), dtype=bool)
+    pairs[:, block:] = np.pad(filled, (0, n_blocks * block - n)).reshape(n_blocks, block)
+    counts[:, block:] = np.pad(valid, (0, n_blocks * block - n)).reshape(n_blocks, block)
+    pairs[1:, :block] = pairs[:-1, block:]
+    counts[1:, :block] = counts[:-1, block:]
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shift = pairs.sum(axis=1) / counts.sum(axis=1)
+    shift[~np.isfinite(shift)] = 0.0
+    centred = np.subtract(pairs, shift[:, None], out=pairs)
+    centred[~counts] = 0.0
+    
+    value_sum = np.zeros((n_blocks, 2 * block + 1))
+    np.cumsum(centred, axis=1, out=value_sum[:, 1:])
+    square_sum = np.zeros((n_blocks, 2 * block + 1))
+    np.cumsum(np.square(centred, out=centred), axis=1, out=square_sum[:, 1:])
+    return value_sum, square_sum, shift
+
+
+def _block_window_sums(
+    prefix: np.ndarray,
+    window: int,
+    n: int,
+    head: Optional[np.ndarray],
+    group_start: Optional[np.ndarray]
+) -> np.ndarray:
+    """Window totals from a _block_prefix array, aligned with the n input rows."""
+    block = prefix.shape[1] // 2
+    out = np.subtract(
+        prefix[:, block + 1:], prefix[:, block + 1 - window:2 * block + 1 - window]
+    ).ravel()[:n]
+    if head is not None:
+        rows = np.flatnonzero(head)
+        base = (rows // block) * prefix.shape[1] + block - (rows // block) * block
+        flat = prefix.ravel()
+        out[rows] = flat[base + rows + 1] - flat[base + group_start[rows]]
+    return out
+
+
+def _exact_sum_squares(
+    x: np.ndarray,
+    rows: np.ndarray,
+    window: int,
+    group_start: Optional[np.ndarray],
+    chunk_size: int = 1 << 16
+) -> np.ndarray:
+    """Sum of squared deviations from the window mean, two-pass, for selected rows."""
+    out = np.empty(len(rows))
+    lags = np.arange(window)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        first = np.maximum(chunk - window + 1, 0)
+        if group_start is not None:
+            first = np.maximum(first, group_start[chunk])
+        positions = chunk[:, None] - lags
+        values = x[np.maximum(positions, 0)]
+        values[positions < first[:, None]] = np.nan
+        deviations = values - np.nanmean(values, axis=1, keepdims=True)
+        out[start:start + chunk_size] = np.nansum(deviations * deviations, axis=1)
+    return out
+
+
+def rolling_window_stats(
+    values: Union[np.ndarray, pd.Series],
+    windows: Sequence[int],
+    stats: Sequence[str] = ROLLING_STATS,
+    min_periods: Optional[int] = 1,
+    group_start: Optional[np.ndarray] = None,
+    dtype: Union[str, np.dtype] = np.float64
+) -> Dict[Tuple[str, int], np.ndarray]:
+    """
+    Trailing rolling statistics for all windows in one pass.
+    
+    Args:
+        values: 1-D series in time order
+        windows: Window sizes (rows)
+        stats: Any of 'mean', 'std', 'min', 'max'
+        min_periods: Minimum valid values per window (None means the window
+            size, as in pandas' default)
+        group_start: For group-sorted panel data, the position at which each
+            row's group begins; windows never reach back past it
+        dtype: Output dtype, np.float64 or np.float32
+    
+    Returns:
+        Dict mapping (stat, window) to an array aligned with values
+    """
+    unknown = set(stats) - set(ROLLING_STATS)
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics: {sorted(unknown)}")
+    if any(window < 1 for window in windows):
+        raise ValueError(f"Window sizes must be positive, got {list(windows)}")
+    
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    valid = ~np.isnan(x)
+    offset = None
+    if group_start is not None:
+        group_start = np.asarray(group_start, dtype=np.int64)
+        offset = np.arange(n) - group_start
+    
+    # Valid counts use one exact integer prefix; value sums are re-anchored
+    # per block, one block size covering the longest window
+    count_sum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid, out=count_sum[1:])
+    need_moments = 'mean' in stats or 'std' in stats
+    if need_moments:
+        block = max(MIN_BLOCK, 1 << (int(max(windows)) - 1).bit_length())
+        value_sum, square_sum, shift = _block_prefix(np.where(valid, x, 0.0), valid, block)
+        block_shift = np.repeat(shift, block)[:n]
+        magnitude = square_sum[:, block + 1:].ravel()[:n]
+    
+    # Extremes: NaN -> +inf so it never wins (max is the min of -x)
+    need_min = 'min' in stats or 'std' in stats
+    need_max = 'max' in stats or 'std' in stats
+    if need_min:
+        mins = _sliding_min(np.where(valid, x, np.inf), windows, offset)
+    if need_max:
+        maxs = _sliding_min(np.where(valid, -x, np.inf), windows, offset)
+    
+    required = max(1, min_periods if min_periods is not None else 0)
+    results = {}
+    for window in windows:
+        head = offset < window - 1 if group_start is not None else None
+        count = _window_sums(count_sum, window, head, group_start)
+        short = count < (window if min_periods is None else required)
+        
+        if need_min:
+            win_min = mins[window]
+        if need_max:
+            win_max = np.negative(maxs[window], out=maxs[window])
+        
+        if need_moments:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                total = _block_window_sums(value_sum, window, n, head, group_start)
+                mean = total / count
+                
+                if 'std' in stats:
+                    squares = _block_window_sums(square_sum, window, n, head, group_start)
+                    sum_squares = squares - total * mean
+                    undefined = short | (count < 2) | (win_min == win_max)
+                    # Rounding error scales with the prefix magnitude; recompute
+                    # the rows where it could reach the result's leading digits
+                    risky = ~undefined & (sum_squares * CANCELLATION_RATIO < magnitude)
+                    if risky.any():
+                        rows = np.flatnonzero(risky)
+                        sum_squares[rows] = _exact_sum_squares(x, rows, window, group_start)
+                    var = sum_squares / (count - 1)
+                    np.maximum(var, 0.0, out=var)
+                    var[win_min == win_max] = 0.0    # constant window
+                    std = np.sqrt(var)
+                    std[short | (count < 2)] = np.nan
+                    results[('std', window)] = std
+                
+                if 'mean' in stats:
+                    mean += block_shift
+                    mean[short] = np.nan
+                    results[('mean', window)] = mean
+        
+        if 'min' in stats:
+            win_min[short] = np.nan
+            results[('min', window)] = win_min
+        if 'max' in stats:
+            win_max[short] = np.nan
+            results[('max', window)] = win_max
+    
+    return {key: arr.astype(dtype, copy=False) for key, arr in results.items()}
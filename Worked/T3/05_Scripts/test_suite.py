@@ -285,6 +285,395 @@ def test_evaluation_functions() -> TestResults:
     return results
 
 
+def test_sequence_windows() -> TestResults:
+    """Test zero-copy sequence windows and the batched generator."""
+    results = TestResults()
+    logger.info("\n🪟 Testing Sequence Windows...")
+    
+    try:
+        from modeling import create_sequences, iter_sequence_batches
+        
+        data = np.random.default_rng(9).normal(size=(500, 4))
+        sequence_length, stride, horizon = 10, 3, 2
+        starts = range(0, len(data) - sequence_length - horizon + 1, stride)
+        X_loop = np.array([data[i:i + sequence_length] for i in starts])
+        y_loop = np.array([data[i + sequence_length + horizon - 1, 1] for i in starts])
+        
+        X, y = create_sequences(data, sequence_length, 1, stride, horizon)
+        if np.array_equal(X, X_loop) and np.array_equal(y, y_loop):
+            results.add_pass(f"windows match slice loop {X.shape}")
+        else:
+            results.add_fail("windows match slice loop", f"Shape {X.shape} vs {X_loop.shape}")
+        
+        if np.shares_memory(X, data) and not X.flags.writeable:
+            results.add_pass("windows are read-only views")
+        else:
+            results.add_fail("windows are read-only views", "Data was copied or is writeable")
+        
+        # Chunked source must give the same sequences across chunk boundaries
+        chunks = (data[i:i + 37] for i in range(0, len(data), 37))
+        batches = list(iter_sequence_batches(chunks, sequence_length, 16, 1, stride, horizon))
+        if np.array_equal(np.concatenate([b[0] for b in batches]), X_loop) \
+                and np.array_equal(np.concatenate([b[1] for b in batches]), y_loop) \
+                and all(len(b[0]) == 16 for b in batches[:-1]):
+            results.add_pass(f"chunked batches match ({len(batches)} batches)")
+        else:
+            results.add_fail("chunked batches match", "Sequences differ")
+    
+    except Exception as e:
+        results.add_fail("Sequence windows", str(e))
+    
+    return results
+
+
+def test_xgboost_update() -> TestResults:
+    """Test warm-start XGBoost updates and the fallback guard."""
+    results = TestResults()
+    logger.info("\n🔁 Testing XGBoost Warm-Start Update...")
+    
+    try:
+        from modeling import train_xgboost_model, update_xgboost_model
+        
+        rng = np.random.default_rng(3)
+        X = rng.normal(size=(600, 5))
+        y = 3 * X[:, 0] - 2 * X[:, 1] ** 2 + rng.normal(0, 0.3, 600)
+        config = {'n_estimators': 50, 'n_jobs': 1}
+        model, _ = train_xgboost_model(X[:400], y[:400], config=config)
+        
+        updated, info = update_xgboost_model(model, X[400:500], y[400:500], X[500:], y[500:],
+                                             n_rounds=10)
+        # The first 50 trees must be untouched, with 10 new trees on top
+        if info['action'] == 'updated' and info['rounds_after'] == 60 \
+                and np.array_equal(updated.predict(X[:20], iteration_range=(0, 50)), model.predict(X[:20])):
+            results.add_pass(f"rounds appended (val RMSE {info['val_rmse_before']:.3f} -> {info['val_rmse_after']:.3f})")
+        else:
+            results.add_fail("rounds appended", str(info))
+        
+        # Corrupted new targets must trigger the full retrain
+        _, info = update_xgboost_model(model, X[400:500], y[400:500] + 50, X[500:], y[500:],
+                                       n_rounds=10, X_full=X[:500], y_full=y[:500])
+        if info['action'] == 'retrained' and info['rounds_after'] == 50:
+            results.add_pass("degraded update falls back to retraining")
+        else:
+            results.add_fail("degraded update falls back to retraining", str(info))
+        
+        _, info = update_xgboost_model(model, X[400:500], y[400:500], n_rounds=10, max_total_rounds=55)
+        if info['action'] == 'kept':
+            results.add_pass("round budget enforced")
+        else:
+            results.add_fail("round budget enforced", str(info))
+        
+        # Nightly updates: a budget retrain goes back to the original 50
+        # rounds, so the following nights append again
+        actions = []
+        current = model
+        for night in range(5):
+            current, info = update_xgboost_model(current, X[400:500], y[400:500], n_rounds=10,
+                                                 max_total_rounds=70, X_full=X[:500], y_full=y[:500])
+            actions.append((info['action'], info['rounds_after']))
+        expected = [('updated', 60), ('updated', 70), ('retrained', 50), ('updated', 60), ('updated', 70)]
+        if actions == expected:
+            results.add_pass("warm starts resume after a budget retrain")
+        else:
+            results.add_fail("warm starts resume after a budget retrain", str(actions))
+    
+    except Exception as e:
+        results.add_fail("XGBoost update", str(e))
+    
+    return results
+
+
+def test_halving_search() -> TestResults:
+    """Test successive-halving hyperparameter search."""
+    results = TestResults()
+    logger.info("\n✂️  Testing Successive Halving Search...")
+    
+    try:
+        from hyperparameter_tuning import tune_xgboost, tune_random_forest
+        
+        rng = np.random.default_rng(5)
+        X = rng.normal(size=(200, 4))
+        y = 2 * X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.2, 200)
+        
+        _, random_results = tune_random_forest(X, y, search_type='random', n_iter=2, cv=3,
+                                               n_jobs=1, verbose=0)
+        model, tuning = tune_xgboost(X, y, search_type='halving', n_iter=9, cv=3,
+                                     n_jobs=1, verbose=0)
+        cv_results = tuning['cv_results']
+        
+        # Same results shape as the other search types
+        if set(tuning) == set(random_results) and np.isfinite(tuning['best_score']):
+            results.add_pass(f"results dict shape (best CV RMSE {tuning['best_score']:.3f})")
+        else:
+            results.add_fail("results dict shape", f"Keys {sorted(tuning)}")
+        
+        # 9 -> 3 -> 1 candidates, rounds tripling up to the 500-round budget
+        survivors = cv_results.groupby('iter').size().tolist()
+        rounds = sorted(cv_results['n_resources'].unique().tolist())
+        if survivors == [9, 3, 1] and rounds == [55, 165, 495] \
+                and model.get_booster().num_boosted_rounds() == 495:
+            results.add_pass(f"candidates per rung {survivors}, rounds {rounds}")
+        else:
+            results.add_fail("halving rungs", f"Rungs {survivors}")
+    
+    except Exception as e:
+        results.add_fail("Successive halving", str(e))
+    
+    return results
+
+
+def test_tpe_search() -> TestResults:
+    """Test the TPE optimizer, its SQLite trial store and resuming."""
+    results = TestResults()
+    logger.info("\n🎯 Testing TPE Search...")
+    
+    try:
+        import tempfile
+        import sqlite3
+        from tpe_search import Study, space_from_param_grid
+        from hyperparameter_tuning import get_random_forest_param_grid
+        
+        space = space_from_param_grid(get_random_forest_param_grid('random'))
+        if space['n_estimators'] == {'type': 'int', 'low': 100, 'high': 599, 'log': False} \
+                and space['max_features']['type'] == 'categorical':
+            results.add_pass("search space read from param grid")
+        else:
+            results.add_fail("search space read from param grid", str(space))
+        
+        from scipy.stats import uniform, randint
+        grid = {'x': uniform(-5, 10), 'n': randint(0, 20), 'kind': ['a', 'b', 'c']}
+        calls = []
+        
+        def objective(params):
+            calls.append(params)
+            return (params['x'] - 1.5) ** 2 + abs(params['n'] - 12) / 4 + (params['kind'] != 'b')
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = str(Path(temp_dir) / 'trials.db')
+            study = Study(storage, 'quadratic', grid, n_startup_trials=10)
+            study.optimize(objective, n_trials=30)
+            
+            # TPE trials (after the random startup) must beat the random ones
+            values = study.trials_dataframe()['value'].to_numpy()
+            if np.median(values[10:]) < np.median(values[:10]):
+                results.add_pass(f"TPE improves on random startup "
+                                 f"(median loss {np.median(values[:10]):.2f} -> {np.median(values[10:]):.2f})")
+            else:
+                results.add_fail("TPE improves on random startup", f"Losses {values.round(2)}")
+            
+            # Interrupted session: one trial left running by a dead worker
+            trial_id, _ = study.ask(n_trials=31)
+            with sqlite3.connect(storage) as conn:
+                conn.execute("UPDATE trials SET worker = ? WHERE id = ?",
+                             (study.worker_id.rsplit(':', 1)[0] + ':999999999', trial_id))
+            calls.clear()
+            Study(storage, 'quadratic', grid, n_startup_trials=10).optimize(objective, n_trials=35)
+            states = study.trials_dataframe()['state'].value_counts().to_dict()
+            if len(calls) == 5 and states == {'COMPLETE': 35, 'INTERRUPTED': 1}:
+                results.add_pass("resume keeps finished trials and retries interrupted ones")
+            else:
+                results.add_fail("resume", f"{len(calls)} new evaluations, states {states}")
+            
+            # An objective that always raises uses up the budget, then stops
+            failing = []
+            
+            def broken(params):
+                failing.append(params)
+                raise ValueError("bad data")
+            
+            try:
+                Study(storage, 'broken', grid).optimize(broken, n_trials=5)
+                raised = False
+            except RuntimeError as e:
+                raised = 'bad data' in str(e)
+            if raised and len(failing) == 5:
+                results.add_pass("failed trials count toward the budget")
+            else:
+                results.add_fail("failed trials count toward the budget",
+                                 f"{len(failing)} evaluations, raised {raised}")
+    
+    except Exception as e:
+        results.add_fail("TPE search", str(e))
+    
+    return results
+
+
+def test_tuning_checkpoints() -> TestResults:
+    """Test per-fit and per-stage checkpoints of the tuning pipeline."""
+    results = TestResults()
+    logger.info("\n💾 Testing Tuning Checkpoints...")
+    
+    try:
+        import tempfile
+        from hyperparameter_tuning import tune_xgboost, TuningCheckpoint
+        
+        rng = np.random.default_rng(5)
+        X = rng.normal(size=(200, 4))
+        y = 2 * X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.2, 200)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fits_dir = Path(temp_dir) / 'fits'
+            kwargs = dict(search_type='random', n_iter=3, cv=3, n_jobs=1, verbose=0,
+                          checkpoint_dir=str(fits_dir))
+            model, tuning = tune_xgboost(X, y, **kwargs)
+            records = {f: f.stat().st_mtime_ns for f in fits_dir.glob('*.pkl')}
+            
+            # Rerun: every CV fit comes from its record, none is rewritten
+            model_again, tuning_again = tune_xgboost(X, y, **kwargs)
+            unchanged = records == {f: f.stat().st_mtime_ns for f in fits_dir.glob('*.pkl')}
+            if len(records) == 9 and unchanged and tuning_again['best_params'] == tuning['best_params'] \
+                    and np.array_equal(model_again.predict(X), model.predict(X)):
+                results.add_pass(f"CV fits restored from {len(records)} records")
+            else:
+                results.add_fail("CV fits restored", f"{len(records)} records, unchanged: {unchanged}")
+            
+            run_dir = Path(temp_dir) / 'run'
+            TuningCheckpoint(str(run_dir), fingerprint='a').save('xgboost', (model, tuning))
+            restored = TuningCheckpoint(str(run_dir), resume=True, fingerprint='a').load('xgboost')
+            fresh = TuningCheckpoint(str(run_dir), resume=False, fingerprint='a').load('xgboost')
+            try:
+                TuningCheckpoint(str(run_dir), resume=True, fingerprint='b')
+                mismatch_rejected = False
+            except ValueError:
+                mismatch_rejected = True
+            if restored[1]['best_params'] == tuning['best_params'] and fresh is None and mismatch_rejected:
+                results.add_pass("stages resume, restart and reject changed inputs")
+            else:
+                results.add_fail("stage checkpoints", f"Fresh run kept {fresh is not None}")
+    
+    except Exception as e:
+        results.add_fail("Tuning checkpoints", str(e))
+    
+    return results
+
+
+def test_cpu_budget() -> TestResults:
+    """Test the core budget split of the concurrent tuning pipeline."""
+    results = TestResults()
+    logger.info("\n🧮 Testing CPU Budget Scheduler...")
+    
+    try:
+        from hyperparameter_tuning import plan_cpu_budget
+        
+        families = ['xgboost', 'random_forest', 'gradient_boosting']
+        violations = []
+        for total in [1, 2, 3, 4, 8, 13, 32, 64]:
+            for threads in [1, 2, 4]:
+                plan = plan_cpu_budget(families, total, threads)
+                used = sum(p['cores'] for p in plan.values())
+                if used != max(total, len(families)):
+                    violations.append(f"{total} cores: {used} allotted")
+                for family, p in plan.items():
+                    if p['n_jobs'] * p['estimator_n_jobs'] > p['cores']:
+                        violations.append(f"{total} cores: {family} oversubscribed {p}")
+        
+        plan = plan_cpu_budget(families, 16, 2)
+        cores = {family: p['cores'] for family, p in plan.items()}
+        if not violations and plan['random_forest']['cores'] > plan['xgboost']['cores'] \
+                and plan['gradient_boosting']['estimator_n_jobs'] == 1:
+            results.add_pass(f"budget split without oversubscription (16 cores: {cores})")
+        else:
+            results.add_fail("budget split", "; ".join(violations[:3]) or str(plan))
+        
+        # A parallel search fits on one thread; the returned model gets the budget back
+        from hyperparameter_tuning import tune_xgboost, tune_random_forest
+        rng = np.random.default_rng(3)
+        X = rng.normal(size=(120, 4))
+        y = X[:, 0] + rng.normal(0, 0.1, 120)
+        threads = {}
+        for tuner in [tune_xgboost, tune_random_forest]:
+            for n_jobs in [1, 2]:
+                model, _ = tuner(X, y, n_iter=2, cv=2, n_jobs=n_jobs, verbose=0)
+                threads[(tuner.__name__, n_jobs)] = model.get_params()['n_jobs']
+        if all(t == (-1 if n_jobs == 1 else n_jobs) for (_, n_jobs), t in threads.items()):
+            results.add_pass("tuned models get the search's cores back")
+        else:
+            results.add_fail("tuned models get the search's cores back", str(threads))
+    
+    except Exception as e:
+        results.add_fail("CPU budget", str(e))
+    
+    return results
+
+
+def _held_dmatrices() -> int:
+    """Binned XGBoost matrices held by the calling (worker) process."""
+    from fold_cache import _PROCESS_DMATRICES
+    return len(_PROCESS_DMATRICES)
+
+
+def test_fold_cache() -> TestResults:
+    """Test the fold-level data cache of the CV searches."""
+    results = TestResults()
+    logger.info("\n📦 Testing Fold Cache...")
+    
+    try:
+        import pickle as pkl
+        import xgboost as xgb
+        from sklearn.model_selection import RandomizedSearchCV, TimeSeriesSplit, KFold
+        from fold_cache import FoldCache, CachedSearchCV
+        from hyperparameter_tuning import get_xgboost_param_grid
+        
+        rng = np.random.default_rng(8)
+        X = rng.normal(size=(300, 5))
+        X[rng.random(X.shape) < 0.03] = np.nan
+        y = 2 * np.nan_to_num(X[:, 0]) - np.nan_to_num(X[:, 1]) ** 2 + rng.normal(0, 0.3, 300)
+        tscv = TimeSeriesSplit(n_splits=3)
+        
+        # Same candidates and bit-identical scores as the uncached search
+        grid = get_xgboost_param_grid('random')
+        grid['n_estimators'] = [20, 40]
+        base = xgb.XGBRegressor(objective='reg:squarederror', random_state=42, n_jobs=1)
+        native = RandomizedSearchCV(base, grid, n_iter=4, cv=tscv, random_state=42,
+                                    scoring='neg_root_mean_squared_error', refit=False).fit(X, y)
+        cached = CachedSearchCV(base, grid, n_iter=4, cv=tscv, refit=False).fit(X, y)
+        if np.array_equal(native.cv_results_['mean_test_score'], cached.cv_results_['mean_test_score']) \
+                and native.best_params_ == cached.best_params_:
+            results.add_pass("cached XGBoost search matches RandomizedSearchCV exactly")
+        else:
+            results.add_fail("cached XGBoost search", "Scores differ")
+        
+        with FoldCache(X, y, tscv) as cache:
+            X_train, _, X_test, _ = cache.fold(2)
+            # Workers receive the file paths only, and map the same arrays
+            clone = pkl.loads(pkl.dumps(cache))
+            shared = np.shares_memory(X_train, cache.X) and np.shares_memory(X_test, cache.X)
+            if shared and cache.X.dtype == np.float32 and cache.nbytes == 300 * 5 * 4 + 300 * 8 \
+                    and len(pkl.dumps(cache)) < 2000 and np.array_equal(clone.fold(2)[0], X_train, equal_nan=True):
+                results.add_pass(f"time-series folds are views of one float32 array ({cache.nbytes} bytes)")
+            else:
+                results.add_fail("fold views", f"{cache.nbytes} bytes, shared: {shared}")
+        
+        with FoldCache(X, y, KFold(n_splits=3)) as cache:
+            materialized = cache.nbytes > 300 * 5 * 4 + 300 * 8
+            match = all(np.array_equal(cache.fold(i)[0], X[train].astype(np.float32), equal_nan=True)
+                        for i, (train, _) in enumerate(KFold(n_splits=3).split(X)))
+        try:
+            FoldCache(X, y, tscv, max_bytes=1000)
+            limited = False
+        except MemoryError:
+            limited = True
+        if materialized and match and limited:
+            results.add_pass("non-contiguous folds materialized once, memory limit enforced")
+        else:
+            results.add_fail("materialized folds", f"match {match}, limit {limited}")
+        
+        # Reused joblib workers keep the matrices of one search at a time
+        from joblib import Parallel, delayed
+        for _ in range(3):
+            search = CachedSearchCV(base, grid, n_iter=2, cv=tscv, n_jobs=2, refit=False).fit(X, y)
+        held = Parallel(n_jobs=2)(delayed(_held_dmatrices)() for _ in range(8))
+        if max(held) <= tscv.n_splits and search.fold_cache_usage_['dmatrix_processes'].min() >= 1:
+            results.add_pass(f"worker matrices bounded across searches (max {max(held)} held)")
+        else:
+            results.add_fail("worker matrices bounded across searches", f"Held {held}")
+    
+    except Exception as e:
+        results.add_fail("Fold cache", str(e))
+    
+    return results
+
+
 def test_feature_engineering() -> TestResults:
     """Test feature engineering module functions."""
     results = TestResults()
@@ -311,6 +700,18 @@ def test_feature_engineering() -> TestResults:
         else:
             results.add_fail("create_temporal_features", "Missing columns")
         
+        # Panel input (shuffled segments x dates) broadcasts per-date features
+        panel = pd.DataFrame({
+            'date': np.tile(dates, 3),
+            'segment': np.repeat(['a', 'b', 'c'], len(dates))
+        }).sample(frac=1, random_state=0)
+        df_panel = create_temporal_features(panel, 'date')
+        per_date = df_temp.set_index('date')[expected_cols + ['season', 'is_holiday']]
+        if df_panel.set_index('date')[per_date.columns].equals(per_date.loc[df_panel['date']]):
+            results.add_pass("create_temporal_features on panel data")
+        else:
+            results.add_fail("create_temporal_features on panel data", "Broadcast mismatch")
+        
         # Test lag features
         df_lag = create_lag_features(df, 'congestion_index', [1, 7])
         if 'congestion_index_lag_1' in df_lag.columns:
@@ -331,6 +732,774 @@ def test_feature_engineering() -> TestResults:
     return results
 
 
+def test_calendar_table() -> TestResults:
+    """Test the calendar dimension against per-row holiday/season rules."""
+    results = TestResults()
+    logger.info("\n📅 Testing Calendar Table...")
+    
+    try:
+        from calendar_table import (
+            build_calendar_table, calendar_lookup, load_thai_holidays,
+            RECURRING_HOLIDAYS, THAI_SEASONS
+        )
+        
+        dates = pd.Series(pd.date_range('2019-12-25', '2021-01-05 18:00', freq='6h'))
+        calendar = calendar_lookup(dates, ['is_holiday', 'season', 'weekofyear'])
+        
+        expected_holiday = [int((d.month, d.day) in RECURRING_HOLIDAYS) for d in dates]
+        expected_season = [THAI_SEASONS[d.month] for d in dates]
+        expected_week = dates.dt.isocalendar().week.to_numpy(dtype=np.int64)
+        if (calendar['is_holiday'].tolist() == expected_holiday
+                and calendar['season'].tolist() == expected_season
+                and np.array_equal(calendar['weekofyear'].to_numpy(), expected_week)):
+            results.add_pass("calendar lookup matches per-row rules")
+        else:
+            results.add_fail("calendar lookup matches per-row rules", "Mismatch")
+        
+        holiday_file = Path(__file__).parent.parent / '08_Configuration' / 'thai_holidays.csv'
+        holidays = load_thai_holidays(holiday_file)
+        table = build_calendar_table('2024-01-01', '2024-12-31', holidays=holidays)
+        names = table.set_index('date')['holiday_name']
+        if names[pd.Timestamp('2024-02-24')] == 'Makha Bucha' and table['is_holiday'].sum() >= 19:
+            results.add_pass(f"holiday file loaded ({table['is_holiday'].sum()} holidays in 2024)")
+        else:
+            results.add_fail("holiday file loaded", "Lunar holiday missing")
+        
+        # Local days for tz-aware dates (Songkran 00:00-06:59 is the 12th in
+        # UTC), empty input, and 0 flags for missing dates
+        bangkok = pd.Series(pd.date_range('2024-04-13 00:00', '2024-04-13 06:00', freq='3h',
+                                          tz='Asia/Bangkok'))
+        local = calendar_lookup(bangkok, ['is_holiday', 'day'])
+        empty = calendar_lookup(pd.Series([], dtype='datetime64[ns]'), ['is_holiday', 'season'])
+        missing = calendar_lookup(pd.Series(pd.to_datetime(['2024-04-13', None])), ['is_holiday'])
+        if (local['is_holiday'].tolist() == [1, 1, 1] and local['day'].tolist() == [13, 13, 13]
+                and list(empty.columns) == ['is_holiday', 'season'] and empty.empty
+                and missing['is_holiday'].tolist() == [1, 0] and missing['is_holiday'].dtype == np.int64):
+            results.add_pass("tz-aware, empty and missing dates")
+        else:
+            results.add_fail("tz-aware, empty and missing dates",
+                             f"{local.to_dict('list')}, {missing.to_dict('list')}")
+    
+    except Exception as e:
+        results.add_fail("Calendar table", str(e))
+    
+    return results
+
+
+def test_rolling_stats() -> TestResults:
+    """Test the rolling statistics kernel against pandas rolling."""
+    results = TestResults()
+    logger.info("\n📈 Testing Rolling Statistics Kernel...")
+    
+    try:
+        from rolling_stats import rolling_window_stats
+        
+        rng = np.random.default_rng(11)
+        values = rng.normal(50, 10, 3000)
+        values[rng.random(3000) < 0.05] = np.nan
+        values[500:540] = 42.0        # constant stretch
+        values[1200:1215] = np.nan    # gap longer than the short windows
+        series = pd.Series(values)
+        windows = [1, 7, 30, 100]
+        
+        for min_periods in [1, None]:
+            stats = rolling_window_stats(values, windows, min_periods=min_periods)
+            mismatched = [
+                key for key, result in stats.items()
+                if not np.allclose(
+                    result,
+                    getattr(series.rolling(key[1], min_periods=min_periods or key[1]), key[0])(),
+                    rtol=1e-7, atol=1e-5, equal_nan=True
+                )
+            ]
+            label = f"kernel matches pandas (min_periods={min_periods})"
+            if not mismatched:
+                results.add_pass(label)
+            else:
+                results.add_fail(label, f"Mismatch in {mismatched}")
+        
+        # Windows clipped at group starts, float32 output
+        group_start = np.repeat(np.arange(0, 3000, 250), 250)
+        stats = rolling_window_stats(values, [7, 30], group_start=group_start, dtype=np.float32)
+        grouped = series.groupby(group_start)
+        if all(
+            result.dtype == np.float32 and np.allclose(
+                result, getattr(grouped.rolling(window, min_periods=1), stat)().to_numpy(),
+                rtol=1e-5, atol=1e-3, equal_nan=True
+            )
+            for (stat, window), result in stats.items()
+        ):
+            results.add_pass("grouped float32 kernel matches pandas")
+        else:
+            results.add_fail("grouped float32 kernel matches pandas", "Mismatch")
+        
+        # Non-stationary series: level shift to a near-constant stretch, then a
+        # trend; std checked against a two-pass computation of every window
+        shifted = np.concatenate([
+            1e5 + rng.normal(0, 1, 400), rng.normal(0, 0.01, 400),
+            np.arange(2000) * 3.7 + rng.normal(0, 1, 2000)
+        ])
+        shifted[rng.random(len(shifted)) < 0.03] = np.nan
+        stats = rolling_window_stats(shifted, [7, 30], stats=['mean', 'std'])
+        exact = True
+        for window in [7, 30]:
+            padded = np.concatenate([np.full(window - 1, np.nan), shifted])
+            views = np.lib.stride_tricks.sliding_window_view(padded, window)
+            counts = (~np.isnan(views)).sum(axis=1)
+            usable = counts >= 2
+            reference = np.nanstd(views[usable], axis=1, ddof=1)
+            exact &= np.allclose(stats[('std', window)][usable], reference, rtol=1e-9, atol=0)
+            exact &= np.allclose(stats[('mean', window)][usable], np.nanmean(views[usable], axis=1),
+                                 rtol=1e-12, atol=1e-9)
+        if exact:
+            results.add_pass("non-stationary std matches two-pass reference")
+        else:
+            results.add_fail("non-stationary std matches two-pass reference", "Cancellation error")
+        
+        # Level spike inside the first window: recomputed rows must not read
+        # before the start of a single series
+        spiked = np.array([50.2, 49.8, 51.0, 50.5, 10050.0, 50.1, 49.9, 50.3])
+        worst = 0.0
+        for trial in range(50):
+            candidate = spiked if trial == 0 else np.concatenate([
+                rng.normal(50, 1, rng.integers(1, 30)) + np.where(rng.random(1) < 0.5, 1e4, 0.0),
+                [1e4 * rng.normal()], rng.normal(50, 1, rng.integers(5, 60))
+            ])
+            for window in [7, 30]:
+                result = rolling_window_stats(candidate, [window], stats=['std'])[('std', window)]
+                reference = pd.Series(candidate).rolling(window, min_periods=1).std().to_numpy()
+                usable = ~np.isnan(reference) & (reference > 0)
+                worst = max(worst, float(np.max(np.abs(result[usable] / reference[usable] - 1), initial=0)))
+        # pandas' online update itself drifts by ~1e-6 next to a 1e4 spike
+        if worst < 1e-5:
+            results.add_pass("spike in the first window matches pandas")
+        else:
+            results.add_fail("spike in the first window matches pandas", f"Relative error {worst:.2e}")
+    
+    except Exception as e:
+        results.add_fail("Rolling statistics kernel", str(e))
+    
+    return results
+
+
+# Files kept identical between the T2 and T3 stages (path relative to Worked/)
+SHARED_FILES = [
+    ('T3/05_Scripts/rolling_stats.py', 'T2/04_Scripts/rolling_stats.py'),
+    ('T3/05_Scripts/calendar_table.py', 'T2/04_Scripts/calendar_table.py'),
+    ('T3/08_Configuration/thai_holidays.csv', 'T2/06_Configuration/thai_holidays.csv'),
+]
+
+
+def test_shared_files() -> TestResults:
+    """Test that the files copied between T2 and T3 have not drifted apart."""
+    results = TestResults()
+    logger.info("\n🔗 Testing Shared T2/T3 Files...")
+    
+    worked = Path(__file__).resolve().parent.parent.parent
+    for ours, theirs in SHARED_FILES:
+        try:
+            if (worked / ours).read_bytes() == (worked / theirs).read_bytes():
+                results.add_pass(f"{ours} matches {theirs}")
+            else:
+                results.add_fail(f"{ours} matches {theirs}", "Copies differ; apply the change to both")
+        except OSError as e:
+            results.add_fail(f"{ours} matches {theirs}", str(e))
+    
+    return results
+
+
+def test_panel_features() -> TestResults:
+    """Test group_col features against a per-segment loop."""
+    results = TestResults()
+    logger.info("\n🛣️ Testing Panel Features...")
+    
+    try:
+        from feature_engineering import create_model_features
+        
+        # Segments of unequal length, rows interleaved by date, some gaps
+        rng = np.random.default_rng(3)
+        dates = pd.date_range('2024-01-01', periods=90, freq='D')
+        panel = pd.concat([
+            pd.DataFrame({'date': dates[:length], 'segment': f'seg_{i}',
+                          'congestion_index': rng.normal(50, 5, length)})
+            for i, length in enumerate([90, 45, 31, 60])
+        ], ignore_index=True)
+        panel.loc[rng.random(len(panel)) < 0.03, 'congestion_index'] = np.nan
+        panel = panel.sort_values('date', kind='stable')
+        
+        grouped = create_model_features(panel, group_col='segment')
+        looped = pd.concat([
+            create_model_features(segment)
+            for _, segment in panel.sort_values(['segment', 'date'], kind='stable').groupby('segment')
+        ])
+        
+        try:
+            pd.testing.assert_frame_equal(grouped, looped, check_exact=False, rtol=1e-9, atol=1e-9)
+            results.add_pass(f"group_col matches per-segment loop ({grouped.shape[0]} rows)")
+        except AssertionError as e:
+            results.add_fail("group_col matches per-segment loop", str(e)[:200])
+    
+    except Exception as e:
+        results.add_fail("Panel features", str(e))
+    
+    return results
+
+
+def test_fused_feature_builder() -> TestResults:
+    """Test that the fused feature builder matches the chained pipeline."""
+    results = TestResults()
+    logger.info("\n⚡ Testing Fused Feature Builder...")
+    
+    try:
+        from feature_engineering import (
+            create_model_features, create_model_features_fused
+        )
+        
+        # Create test DataFrame (spans Songkran and a year boundary)
+        rng = np.random.default_rng(42)
+        dates = pd.date_range('2023-12-01', periods=200, freq='D')
+        df = pd.DataFrame({
+            'date': dates,
+            'congestion_index': rng.normal(0, 1, 200).cumsum() + 50,
+            'rainfall': np.where(rng.random(200) < 0.05, np.nan, 1.0)
+        })
+        
+        for kwargs in [{}, {'lag_periods': [1, 2], 'include_cyclical': False}]:
+            chained = create_model_features(df, **kwargs)
+            fused = create_model_features_fused(df, **kwargs)
+            label = f"fused parity {kwargs or 'defaults'}"
+            
+            if list(chained.columns) != list(fused.columns):
+                results.add_fail(label, "Column order differs")
+                continue
+            
+            try:
+                pd.testing.assert_frame_equal(chained, fused, check_dtype=False)
+                results.add_pass(f"{label} ({fused.shape[0]} rows)")
+            except AssertionError as e:
+                results.add_fail(label, str(e).splitlines()[0])
+    
+    except Exception as e:
+        results.add_fail("Fused feature builder", str(e))
+    
+    return results
+
+
+def test_feature_graph() -> TestResults:
+    """Test that the lazy feature graph matches the eager pipeline."""
+    results = TestResults()
+    logger.info("\n🕸️ Testing Feature Graph...")
+    
+    try:
+        from feature_engineering import (
+            FeatureGraph, create_model_features, get_model_feature_names
+        )
+        
+        rng = np.random.default_rng(5)
+        dates = pd.date_range('2023-12-01', periods=200, freq='D')
+        df = pd.DataFrame({
+            'date': dates,
+            'congestion_index': rng.normal(0, 1, 200).cumsum() + 50,
+            'temp_avg': rng.normal(30, 2, 200)
+        })
+        
+        names = get_model_feature_names() + ['temp_avg']
+        try:
+            pd.testing.assert_frame_equal(FeatureGraph().build(df, names), create_model_features(df)[names])
+            results.add_pass(f"full graph matches pipeline ({len(names)} features)")
+        except AssertionError as e:
+            results.add_fail("full graph matches pipeline", str(e).splitlines()[0])
+        
+        # A subset only computes its own dependencies
+        graph = FeatureGraph()
+        subset = ['month_sin', 'congestion_index_lag_21', 'congestion_index_rolling_std_7']
+        plan = graph.plan(subset, list(df.columns))
+        built = graph.build(df, subset)
+        if set(plan) == {'month', 'month_sin', 'congestion_index_lag_21', 'congestion_index_rolling_std_7'} \
+                and list(built.columns) == subset and len(built) == 179:
+            results.add_pass("subset builds only its dependencies")
+        else:
+            results.add_fail("subset builds only its dependencies", f"plan={plan}, shape={built.shape}")
+        
+        try:
+            graph.build(df, ['unknown_feature'])
+            results.add_fail("unknown feature rejected", "No error raised")
+        except ValueError:
+            results.add_pass("unknown feature rejected")
+    
+    except Exception as e:
+        results.add_fail("Feature graph", str(e))
+    
+    return results
+
+
+def test_multi_horizon_forecaster() -> TestResults:
+    """Test direct and recursive multi-horizon forecasts."""
+    results = TestResults()
+    logger.info("\n🔭 Testing Multi-Horizon Forecaster...")
+    
+    try:
+        from forecasting import MultiHorizonForecaster
+        
+        rng = np.random.default_rng(21)
+        n = 300
+        df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=n, freq='D'),
+            'congestion_index': 50 + 10 * np.sin(np.arange(n) * 2 * np.pi / 7) + rng.normal(0, 1, n),
+            'temp_avg': rng.normal(30, 2, n)
+        })
+        names = ['congestion_index_lag_1', 'congestion_index_lag_7',
+                 'congestion_index_rolling_mean_7', 'dayofweek', 'temp_avg']
+        config = {'n_estimators': 20, 'max_depth': 4}
+        
+        direct = MultiHorizonForecaster(horizons=range(1, 8), feature_names=names, config=config)
+        direct.fit(df.iloc[:250])
+        forecasts = direct.predict(df.iloc[250:])
+        if forecasts.shape == (50, 7) and np.isfinite(forecasts[7:]).all() and len(direct.models_) == 7:
+            results.add_pass(f"direct forecasts {forecasts.shape}")
+        else:
+            results.add_fail("direct forecasts", f"Shape {forecasts.shape}")
+        
+        # Changing later values must not change forecasts from earlier origins
+        changed = df.iloc[250:].copy()
+        changed.iloc[30:, 1] += 100
+        if np.allclose(direct.predict(changed)[:30], forecasts[:30], equal_nan=True):
+            results.add_pass("no future values leak into origin features")
+        else:
+            results.add_fail("no future values leak into origin features", "Forecasts changed")
+        
+        recursive = MultiHorizonForecaster(horizons=[1, 3, 7], strategy='recursive',
+                                           model_type='random_forest', feature_names=names, config=config)
+        recursive.fit(df.iloc[:250])
+        metrics = recursive.evaluate(df.iloc[250:])
+        if list(metrics.index) == [1, 3, 7] and (metrics['RMSE'] < 10).all():
+            results.add_pass(f"recursive forecasts (RMSE h7={metrics.loc[7, 'RMSE']:.2f})")
+        else:
+            results.add_fail("recursive forecasts", str(metrics['RMSE'].to_dict()))
+    
+    except Exception as e:
+        results.add_fail("Multi-horizon forecaster", str(e))
+    
+    return results
+
+
+def test_recursive_forecaster() -> TestResults:
+    """Test incremental recursive forecasts against step-by-step rebuilds."""
+    results = TestResults()
+    logger.info("\n🔁 Testing Recursive Forecaster...")
+    
+    try:
+        from forecasting import RecursiveForecaster, make_horizon_targets
+        from feature_engineering import FeatureGraph
+        from hyperparameter_tuning import WeightedEnsembleRegressor
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.linear_model import Ridge
+        
+        rng = np.random.default_rng(8)
+        n = 200
+        df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=n, freq='D'),
+            'congestion_index': 50 + 10 * np.sin(np.arange(n) * 2 * np.pi / 7) + rng.normal(0, 1, n),
+            'temp_avg': rng.normal(30, 2, n)
+        })
+        names = ['congestion_index_lag_1', 'congestion_index_diff_7', 'congestion_index_rolling_std_14',
+                 'congestion_index_ewm_7', 'dayofweek_sin', 'is_holiday', 'temp_avg']
+        
+        graph = FeatureGraph()
+        X = graph.build(df, names, dropna=False).to_numpy(dtype=np.float64)
+        y = make_horizon_targets(df, horizons=[1]).to_numpy()[:, 0]
+        rows = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
+        model = WeightedEnsembleRegressor([
+            ('rf', RandomForestRegressor(n_estimators=20, random_state=0)),
+            ('ridge', Ridge())
+        ])
+        model.fit(X[rows], y[rows])
+        
+        forecasts = RecursiveForecaster(model, names, range(1, 11)).predict(df, last_only=True)
+        
+        # Reference: append each prediction and rebuild all features
+        history = df.copy()
+        expected = []
+        for _ in range(10):
+            features = graph.build(history, names, dropna=False).iloc[[-1]].to_numpy(dtype=np.float64)
+            expected.append(model.predict(features)[0])
+            history = pd.concat([history, pd.DataFrame({
+                'date': [history['date'].iloc[-1] + pd.Timedelta(days=1)],
+                'congestion_index': [expected[-1]],
+                'temp_avg': [df['temp_avg'].iloc[-1]]
+            })], ignore_index=True)
+        
+        if np.isnan(forecasts[:-1]).all() and np.allclose(forecasts[-1], expected):
+            results.add_pass("incremental updates match full rebuilds (10 steps)")
+        else:
+            results.add_fail("incremental updates match full rebuilds",
+                             f"Max diff {np.nanmax(np.abs(forecasts[-1] - expected)):.2e}")
+    
+    except Exception as e:
+        results.add_fail("Recursive forecaster", str(e))
+    
+    return results
+
+
+def test_inference_server() -> TestResults:
+    """Test the micro-batching inference server over HTTP."""
+    results = TestResults()
+    logger.info("\n🛰️ Testing Inference Server...")
+    
+    try:
+        import json
+        import urllib.error
+        import urllib.request
+        from concurrent.futures import ThreadPoolExecutor
+        from sklearn.linear_model import Ridge
+        from inference_server import InferenceServer
+        from load_test_inference import make_request_payload
+        from feature_engineering import FeatureGraph
+        from model_utils import TRAINED_MODEL_FEATURES
+        
+        class BrokenModel:
+            n_features_in_ = len(TRAINED_MODEL_FEATURES)
+            
+            def predict(self, X):
+                raise KeyError('lookup inside the worker')
+        
+        rng = np.random.default_rng(4)
+        model = Ridge().fit(rng.normal(size=(100, len(TRAINED_MODEL_FEATURES))), rng.normal(size=100))
+        
+        # A model that does not fit the fallback feature list is refused
+        narrow = Ridge().fit(rng.normal(size=(100, 5)), rng.normal(size=100))
+        try:
+            InferenceServer({'narrow': narrow}, port=0).start().stop()
+            results.add_fail("feature count mismatch refused", "Server started")
+        except ValueError:
+            results.add_pass("feature count mismatch refused")
+        
+        server = InferenceServer({'ridge': model, 'broken': BrokenModel()}, port=0, max_wait_ms=50).start()
+        url = f'http://127.0.0.1:{server.port}'
+        
+        try:
+            payloads = [make_request_payload(rng, 'ridge') for _ in range(8)]
+            
+            def post(payload):
+                request = urllib.request.Request(f'{url}/predict', data=json.dumps(payload).encode())
+                with urllib.request.urlopen(request) as response:
+                    return json.loads(response.read())['predictions']
+            
+            with ThreadPoolExecutor(8) as pool:
+                served = list(pool.map(post, payloads))
+            
+            expected = [
+                model.predict(FeatureGraph().build(pd.DataFrame(p['rows']), TRAINED_MODEL_FEATURES,
+                                                   dropna=False).iloc[[-1]].to_numpy())[0]
+                for p in payloads
+            ]
+            if np.allclose([p[0] for p in served], expected):
+                results.add_pass("served predictions match direct feature build + predict")
+            else:
+                results.add_fail("served predictions match", f"{served[:2]} vs {expected[:2]}")
+            
+            with urllib.request.urlopen(f'{url}/stats') as response:
+                stats = json.loads(response.read())
+            if stats['requests'] == 8 and stats['batches'] < 8 and 'latency_p99_ms' in stats:
+                results.add_pass(f"requests micro-batched ({stats['batches']} batches for 8 requests)")
+            else:
+                results.add_fail("requests micro-batched", str(stats))
+            
+            # Malformed requests coalesced with valid ones fail alone; shuffled
+            # history still predicts its latest date
+            batcher = server.batchers['ridge']
+            shuffled = list(np.random.default_rng(0).permutation(payloads[1]['rows']))
+            garbled = [{**row, 'congestion_index': 'n/a'} for row in payloads[2]['rows']]
+            futures = [
+                batcher.submit(rows=payloads[0]['rows'], last_only=True),
+                batcher.submit(features=[[1.0, 2.0, 3.0]]),
+                batcher.submit(rows=[]),
+                batcher.submit(rows=garbled, last_only=True),
+                batcher.submit(rows=shuffled, last_only=True)
+            ]
+            failed = [future.exception(timeout=30) is not None for future in futures]
+            if failed == [False, True, True, True, False] \
+                    and np.allclose([futures[0].result()[0], futures[4].result()[0]], expected[:2]):
+                results.add_pass("malformed requests fail without their batch")
+            else:
+                results.add_fail("malformed requests fail without their batch",
+                                 f"Failed {failed}")
+            
+            # 404 only for unknown paths; client errors 400, worker failures 500
+            def status(path, body):
+                request = urllib.request.Request(f'{url}{path}', data=body)
+                try:
+                    with urllib.request.urlopen(request) as response:
+                        return response.status
+                except urllib.error.HTTPError as e:
+                    return e.code
+            
+            codes = [
+                status('/predict', json.dumps(payloads[0]).encode()),
+                status('/nowhere', b'{}'),
+                status('/predict', b'not json'),
+                status('/predict', json.dumps({**payloads[0], 'model': 'missing'}).encode()),
+                status('/predict', json.dumps({'model': 'ridge', 'rows': []}).encode()),
+                status('/predict', json.dumps({**payloads[0], 'model': 'broken'}).encode())
+            ]
+            if codes == [200, 404, 400, 400, 400, 500]:
+                results.add_pass("HTTP status codes (200/404/400/400/400/500)")
+            else:
+                results.add_fail("HTTP status codes", str(codes))
+        finally:
+            server.stop()
+    
+    except Exception as e:
+        results.add_fail("Inference server", str(e))
+    
+    return results
+
+
+def test_tree_evaluator() -> TestResults:
+    """Test exact parity of the flat tree evaluator with native predict."""
+    results = TestResults()
+    logger.info("\n🌳 Testing Flat Tree Evaluator...")
+    
+    try:
+        from tree_evaluator import export_trees
+        from benchmark_tree_evaluator import make_inputs
+        from model_utils import load_model
+        
+        X = make_inputs(2000, seed=7)
+        model_path = Path(__file__).parent.parent / '02_Model_Development' / 'Trained_Models'
+        
+        for model_file in ['random_forest_model.pkl', 'xgboost_model.pkl']:
+            if not (model_path / model_file).exists():
+                continue
+            model = load_model(str(model_path / model_file))
+            flat = export_trees(model)
+            name = model_file.replace('_model.pkl', '')
+            
+            native = model.predict(X)
+            if np.array_equal(flat.predict(X), native) and np.array_equal(flat.predict(X[5]), native[5:6]):
+                results.add_pass(f"{name} exact parity ({flat.n_trees} trees, {len(X)} rows with NaN)")
+            else:
+                results.add_fail(f"{name} exact parity",
+                                 f"Max diff {np.abs(flat.predict(X) - native).max():.2e}")
+        
+        try:
+            export_trees(load_model(str(model_path / 'linear_regression_model.pkl')))
+            results.add_fail("non-tree model rejected", "No error raised")
+        except (ValueError, FileNotFoundError):
+            results.add_pass("non-tree model rejected")
+    
+    except Exception as e:
+        results.add_fail("Flat tree evaluator", str(e))
+    
+    return results
+
+
+def test_mmap_artifact() -> TestResults:
+    """Test the memory-mapped model artifact round trip."""
+    results = TestResults()
+    logger.info("\n🗺️  Testing Memory-Mapped Model Artifacts...")
+    
+    try:
+        import tempfile
+        from model_utils import save_model, load_model
+        from benchmark_tree_evaluator import make_inputs
+        
+        X = make_inputs(500, seed=11)
+        model_path = Path(__file__).parent.parent / '02_Model_Development' / 'Trained_Models'
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for model_file in ['random_forest_model.pkl', 'xgboost_model.pkl',
+                               'linear_regression_model.pkl']:
+                if not (model_path / model_file).exists():
+                    continue
+                model = load_model(str(model_path / model_file))
+                name = model_file.replace('_model.pkl', '')
+                artifact = Path(temp_dir) / name
+                save_model(model, str(artifact), model_type='mmap')
+                loaded = load_model(str(artifact))
+                
+                flat = getattr(loaded, 'flat', None)
+                inputs = X if flat is not None else np.nan_to_num(X)
+                if not np.array_equal(loaded.predict(inputs), model.predict(inputs)):
+                    results.add_fail(f"{name} round trip", "Predictions differ")
+                    continue
+                
+                # Arrays must be read-only views of the mapped files, not copies
+                arrays = flat.arrays.values() if flat is not None else [loaded.coef_]
+                if all(isinstance(a.base, np.memmap) or not a.flags.writeable for a in arrays):
+                    results.add_pass(f"{name} round trip ({type(loaded).__name__}, memory-mapped)")
+                else:
+                    results.add_fail(f"{name} round trip", "Arrays were copied into memory")
+                
+                # Tree artifacts hold the ensemble twice (flat arrays + estimator);
+                # predict must only touch the flat part
+                if flat is not None:
+                    import json
+                    from tree_evaluator import export_trees
+                    sizes = json.loads((artifact / 'manifest.json').read_text())['sizes']
+                    save_model(export_trees(model), str(artifact) + '_flat', model_type='mmap')
+                    flat_only = json.loads((Path(str(artifact) + '_flat') / 'manifest.json').read_text())
+                    if loaded._estimator is None and flat_only['sizes'] == \
+                            {'flat_bytes': sizes['flat_bytes'], 'estimator_bytes': 0}:
+                        results.add_pass(f"{name} size: {sizes['flat_bytes'] / 1e6:.2f} MB flat + "
+                                         f"{sizes['estimator_bytes'] / 1e6:.2f} MB estimator "
+                                         f"(predict reads the flat part only)")
+                    else:
+                        results.add_fail(f"{name} artifact size", f"{sizes}, predict loaded the estimator")
+                
+                # The loaded model still answers as the estimator it was saved from
+                if (loaded.n_features_in_ == model.n_features_in_
+                        and repr(loaded.get_params()) == repr(model.get_params())
+                        and np.array_equal(loaded.feature_importances_ if flat is not None else loaded.coef_,
+                                           model.feature_importances_ if flat is not None else model.coef_)):
+                    results.add_pass(f"{name} estimator attributes")
+                else:
+                    results.add_fail(f"{name} estimator attributes", "Differ from the saved model")
+                
+                if name == 'xgboost':
+                    from modeling import update_xgboost_model
+                    rng = np.random.default_rng(0)
+                    X_new = np.nan_to_num(X[:200])
+                    y_new = model.predict(X_new) + rng.normal(0, 1, len(X_new))
+                    updated, info = update_xgboost_model(str(artifact), X_new, y_new, n_rounds=5)
+                    if info['action'] == 'updated' and \
+                            updated.get_booster().num_boosted_rounds() == info['rounds_before'] + 5:
+                        results.add_pass("warm start from an mmap artifact")
+                    else:
+                        results.add_fail("warm start from an mmap artifact", str(info))
+    
+    except Exception as e:
+        results.add_fail("Memory-mapped artifacts", str(e))
+    
+    return results
+
+
+def test_online_feature_state() -> TestResults:
+    """Test that streaming feature updates match the batch functions."""
+    results = TestResults()
+    logger.info("\n🌊 Testing Online Feature State...")
+    
+    try:
+        from feature_engineering import (
+            OnlineFeatureState, create_lag_features, create_diff_features,
+            create_rolling_features, create_ewm_features
+        )
+        
+        # Random walk with gaps and a constant stretch
+        rng = np.random.default_rng(7)
+        values = rng.normal(0, 1, 500).cumsum() + 50
+        values[rng.random(500) < 0.03] = np.nan
+        values[100:120] = 42.0
+        df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=500, freq='D'),
+            'congestion_index': values
+        })
+        
+        batch = create_lag_features(df, 'congestion_index', [1, 7, 14, 30])
+        batch = create_diff_features(batch, 'congestion_index', [1, 7])
+        batch = create_rolling_features(batch, 'congestion_index', [7, 14, 30])
+        batch = create_ewm_features(batch, 'congestion_index', [7, 14])
+        
+        state = OnlineFeatureState()
+        streamed = np.array([
+            state.update(ts, val) for ts, val in zip(df['date'], df['congestion_index'])
+        ])
+        expected = batch[state.feature_names].to_numpy()
+        
+        mismatched = [
+            name for j, name in enumerate(state.feature_names)
+            if not np.allclose(streamed[:, j], expected[:, j],
+                               rtol=1e-7, atol=1e-6, equal_nan=True)
+        ]
+        if not mismatched:
+            results.add_pass(f"online features match batch ({len(state.feature_names)} features)")
+        else:
+            results.add_fail("online features match batch", f"Mismatch in {mismatched}")
+        
+        # Out-of-order timestamps are rejected
+        try:
+            state.update('2020-01-01', 1.0)
+            results.add_fail("out-of-order update", "No error raised")
+        except ValueError:
+            results.add_pass("out-of-order update rejected")
+    
+    except Exception as e:
+        results.add_fail("Online feature state", str(e))
+    
+    return results
+
+
+def test_feature_store() -> TestResults:
+    """Test feature store hits, partial reuse and eviction."""
+    results = TestResults()
+    logger.info("\n🗄️ Testing Feature Store...")
+    
+    try:
+        from feature_store import FeatureStore
+        from feature_engineering import create_model_features
+        import tempfile
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / 'traffic.csv'
+            rng = np.random.default_rng(3)
+            pd.DataFrame({
+                'date': pd.date_range('2024-01-01', periods=150, freq='D').astype(str),
+                'congestion_index': rng.normal(0, 1, 150).cumsum() + 50
+            }).to_csv(source, index=False)
+            
+            def load():
+                return pd.read_csv(source)
+            
+            def fail():
+                raise AssertionError("Source reloaded despite cached inputs")
+            
+            store = FeatureStore(Path(temp_dir) / 'store', max_entries=2)
+            
+            # Miss, then exact hit without reloading the source
+            expected = create_model_features(load())
+            store.get_model_features(load, [source])
+            cached = store.get_model_features(fail, [source])
+            pd.testing.assert_frame_equal(cached, expected)
+            results.add_pass("exact hit matches create_model_features")
+            
+            # Partial hit: new lag/window computed, rest reused
+            kwargs = {'lag_periods': [1, 3], 'rolling_windows': [7, 21]}
+            expected = create_model_features(load(), **kwargs)
+            cached = store.get_model_features(fail, [source], **kwargs)
+            pd.testing.assert_frame_equal(cached, expected)
+            results.add_pass("partial hit matches create_model_features")
+            
+            # LRU eviction keeps at most max_entries
+            store.get_model_features(fail, [source], lag_periods=[2])
+            n_entries = len(store.list_entries())
+            if n_entries == 2:
+                results.add_pass("LRU eviction (2 entries kept)")
+            else:
+                results.add_fail("LRU eviction", f"{n_entries} entries kept")
+            
+            if store.purge() == 2 and store.list_entries().empty:
+                results.add_pass("purge")
+            else:
+                results.add_fail("purge", "Entries left after purge")
+            
+            # A filtered frame of the same file and a dated holiday list get
+            # their own entries instead of the cached features
+            from calendar_table import load_thai_holidays
+            filtered = load().iloc[20:].reset_index(drop=True)
+            holidays = load_thai_holidays(Path(__file__).parent.parent / '08_Configuration' / 'thai_holidays.csv')
+            store.get_model_features(load(), [source])
+            pd.testing.assert_frame_equal(store.get_model_features(filtered, [source]),
+                                          create_model_features(filtered))
+            pd.testing.assert_frame_equal(store.get_model_features(load(), [source], holidays=holidays),
+                                          create_model_features(load(), holidays=holidays))
+            results.add_pass("keys follow frame content and holidays")
+    
+    except Exception as e:
+        results.add_fail("Feature store", str(e))
+    
+    return results
+
+
 def test_model_utils() -> TestResults:
     """Test model utilities module."""
     results = TestResults()
@@ -399,7 +1568,27 @@ def run_all_tests() -> Dict[str, TestResults]:
         ('Model Files', test_model_files),
         ('Model Performance', test_model_performance),
         ('Evaluation Functions', test_evaluation_functions),
+        ('Sequence Windows', test_sequence_windows),
+        ('XGBoost Warm-Start Update', test_xgboost_update),
+        ('Successive Halving Search', test_halving_search),
+        ('TPE Search', test_tpe_search),
+        ('Tuning Checkpoints', test_tuning_checkpoints),
+        ('CPU Budget Scheduler', test_cpu_budget),
+        ('Fold Cache', test_fold_cache),
         ('Feature Engineering', test_feature_engineering),
+        ('Calendar Table', test_calendar_table),
+        ('Rolling Statistics Kernel', test_rolling_stats),
+        ('Shared T2/T3 Files', test_shared_files),
+        ('Panel Features', test_panel_features),
+        ('Fused Feature Builder', test_fused_feature_builder),
+        ('Feature Graph', test_feature_graph),
+        ('Online Feature State', test_online_feature_state),
+        ('Multi-Horizon Forecaster', test_multi_horizon_forecaster),
+        ('Recursive Forecaster', test_recursive_forecaster),
+        ('Inference Server', test_inference_server),
+        ('Flat Tree Evaluator', test_tree_evaluator),
+        ('Memory-Mapped Artifacts', test_mmap_artifact),
+        ('Feature Store', test_feature_store),
         ('Model Utilities', test_model_utils),
     ]
     
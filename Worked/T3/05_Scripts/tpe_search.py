@@ -0,0 +1,653 @@
+"""
+TPE Hyperparameter Search for Bangkok Traffic Flow Optimization Project
+
+Sequential model-based optimization with a Tree-structured Parzen
+Estimator (TPE), implemented here without an external service:
+
+    - The search space is read from the existing param-grid definitions
+      (get_*_param_grid in hyperparameter_tuning.py): scipy randint/uniform
+      distributions become integer/float ranges, lists become categoricals.
+    - Trials are stored in a local SQLite file. Any number of worker
+      processes can run the same study asynchronously: each one asks for a
+      new trial (sampled from the trials finished so far, with running
+      trials counted as bad ones so workers spread out), evaluates it and
+      reports the result.
+    - An interrupted study resumes from its file: finished trials are kept,
+      trials left running by dead workers are retried, and only the
+      remaining budget is evaluated. Trials whose objective raised count
+      toward the budget, so a failure that repeats cannot loop forever.
+
+TPE (Bergstra et al., 2011): the finished trials are split into the best
+gamma share and the rest, each parameter gets a Parzen density l(x) over
+the good trials and g(x) over the others, and the next value is the one
+among n_ei_candidates draws from l(x) that maximises l(x) / g(x).
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import os
+import json
+import socket
+import sqlite3
+import logging
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Tuple, Optional, Any, Callable, Union
+
+from scipy.stats import truncnorm, rv_discrete, rv_continuous
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# SEARCH SPACE
+# ============================================================================
+
+def space_from_param_grid(param_grid: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Convert a param grid into a TPE search space.
+    
+    Args:
+        param_grid: Dictionary of parameter name to a list of choices or a
+            frozen scipy distribution (randint, uniform, loguniform)
+    
+    Returns:
+        Dictionary of parameter name to dimension spec:
+        {'type': 'int' | 'float', 'low', 'high', 'log'} or
+        {'type': 'categorical', 'choices'}
+    """
+    space = {}
+    for name, values in param_grid.items():
+        if isinstance(values, (list, tuple)):
+            space[name] = {'type': 'categorical', 'choices': list(values)}
+            continue
+        
+        dist = getattr(values, 'dist', None)
+        low, high = values.support() if dist is not None else (None, None)
+        if isinstance(dist, rv_discrete):
+            space[name] = {'type': 'int', 'low': int(low), 'high': int(high), 'log': False}
+        elif isinstance(dist, rv_continuous) and np.isfinite(low) and np.isfinite(high):
+            log = dist.name in ('loguniform', 'reciprocal')
+            space[name] = {'type': 'float', 'low': float(low), 'high': float(high), 'log': log}
+        else:
+            raise ValueError(f"Unsupported search dimension for {name}: {values!r}")
+    return space
+
+
+def _to_python(value: Any) -> Any:
+    """NumPy scalars to plain Python for JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# ============================================================================
+# TPE SAMPLER
+# ============================================================================
+
+class TPESampler:
+    """
+    Independent TPE sampler over a search space.
+    """
+    
+    def __init__(
+        self,
+        space: Dict[str, Dict[str, Any]],
+        n_startup_trials: int = 10,
+        n_ei_candidates: int = 24,
+        gamma: float = 0.1,
+        seed: int = 42
+    ):
+        """
+        Initialize sampler.
+        
+        Args:
+            space: Search space from space_from_param_grid
+            n_startup_trials: Random trials before TPE takes over
+            n_ei_candidates: Draws from l(x) scored per parameter
+            gamma: Share of trials treated as good (at most 25 trials)
+            seed: Random seed; trial n uses the stream (seed, n)
+        """
+        self.space = space
+        self.n_startup_trials = n_startup_trials
+        self.n_ei_candidates = n_ei_candidates
+        self.gamma = gamma
+        self.seed = seed
+    
+    def sample(
+        self,
+        history: List[Tuple[Dict[str, Any], float]],
+        trial_number: int
+    ) -> Dict[str, Any]:
+        """
+        Next parameters given the (params, loss) history.
+        
+        Args:
+            history: Finished trials as (params, loss), lower loss is better
+            trial_number: Number of the new trial (seeds its random stream)
+        
+        Returns:
+            Parameter dictionary
+        """
+        rng = np.random.default_rng([self.seed, trial_number])
+        if len(history) < self.n_startup_trials:
+            return {name: self._sample_prior(dim, rng) for name, dim in self.space.items()}
+        
+        losses = np.array([loss for _, loss in history])
+        n_below = min(int(np.ceil(self.gamma * len(history))), 25)
+        order = np.argsort(losses, kind='stable')
+        below = [history[i][0] for i in order[:n_below]]
+        above = [history[i][0] for i in order[n_below:]]
+        
+        params = {}
+        for name, dim in self.space.items():
+            if dim['type'] == 'categorical':
+                params[name] = self._sample_categorical(
+                    dim, [p[name] for p in below], [p[name] for p in above], rng
+                )
+            else:
+                params[name] = self._sample_numeric(
+                    dim, [p[name] for p in below], [p[name] for p in above], rng
+                )
+        return params
+    
+    def _sample_prior(self, dim: Dict[str, Any], rng: np.random.Generator) -> Any:
+        if dim['type'] == 'categorical':
+            return dim['choices'][rng.integers(len(dim['choices']))]
+        if dim['type'] == 'int':
+            return int(rng.integers(dim['low'], dim['high'] + 1))
+        if dim['log']:
+            return float(np.exp(rng.uniform(np.log(dim['low']), np.log(dim['high']))))
+        return float(rng.uniform(dim['low'], dim['high']))
+    
+    def _sample_categorical(
+        self,
+        dim: Dict[str, Any],
+        below: List[Any],
+        above: List[Any],
+        rng: np.random.Generator
+    ) -> Any:
+        choices = dim['choices']
+        
+        def probs(values: List[Any]) -> np.ndarray:
+            # One prior count per choice keeps unseen choices reachable
+            counts = np.ones(len(choices))
+            for value in values:
+                counts[choices.index(value)] += 1
+            return counts / counts.sum()
+        
+        p_below, p_above = probs(below), probs(above)
+        candidates = rng.choice(len(choices), size=self.n_ei_candidates, p=p_below)
+        best = candidates[np.argmax(np.log(p_below[candidates]) - np.log(p_above[candidates]))]
+        return choices[best]
+    
+    def _sample_numeric(
+        self,
+        dim: Dict[str, Any],
+        below: List[float],
+        above: List[float],
+        rng: np.random.Generator
+    ) -> Union[int, float]:
+        # Integers are continuous on [low - 0.5, high + 0.5], then rounded
+        is_int = dim['type'] == 'int'
+        low, high = (dim['low'] - 0.5, dim['high'] + 0.5) if is_int else (dim['low'], dim['high'])
+        transform = np.log if dim['log'] else (lambda x: x)
+        low, high = transform(low), transform(high)
+        
+        mus_below, sigmas_below = self._parzen(transform(np.asarray(below, dtype=float)), low, high)
+        mus_above, sigmas_above = self._parzen(transform(np.asarray(above, dtype=float)), low, high)
+        
+        # Draws from l(x): pick a component, then its truncated normal
+        component = rng.integers(len(mus_below), size=self.n_ei_candidates)
+        mu, sigma = mus_below[component], sigmas_below[component]
+        candidates = truncnorm.rvs((low - mu) / sigma, (high - mu) / sigma, loc=mu, scale=sigma,
+                                   random_state=rng)
+        
+        score = (self._log_density(candidates, mus_below, sigmas_below, low, high)
+                 - self._log_density(candidates, mus_above, sigmas_above, low, high))
+        value = candidates[np.argmax(score)]
+        
+        if dim['log']:
+            value = np.exp(value)
+        if is_int:
+            return int(np.clip(np.round(value), dim['low'], dim['high']))
+        return float(np.clip(value, dim['low'], dim['high']))
+    
+    @staticmethod
+    def _parzen(obs: np.ndarray, low: float, high: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Kernel centres and bandwidths: one per observation plus a wide prior."""
+        mus = np.sort(np.append(obs, (low + high) / 2))
+        # Bandwidth: distance to the farther neighbour (range edges at the ends)
+        edges = np.concatenate([[low], mus, [high]])
+        sigmas = np.maximum(mus - edges[:-2], edges[2:] - mus)
+        sigmas = np.clip(sigmas, (high - low) / min(100, len(mus)), high - low)
+        
+        prior = np.argmin(np.abs(mus - (low + high) / 2))
+        sigmas[prior] = high - low
+        return mus, sigmas
+    
+    @staticmethod
+    def _log_density(
+        x: np.ndarray,
+        mus: np.ndarray,
+        sigmas: np.ndarray,
+        low: float,
+        high: float
+    ) -> np.ndarray:
+        """Log density of the equally weighted truncated-normal mixture at x."""
+        a, b = (low - mus) / sigmas, (high - mus) / sigmas
+        log_pdf = truncnorm.logpdf(x[:, None], a, b, loc=mus, scale=sigmas)
+        peak = log_pdf.max(axis=1)
+        return peak + np.log(np.exp(log_pdf - peak[:, None]).mean(axis=1))
+
+
+# ============================================================================
+# TRIAL STORAGE
+# ============================================================================
+
+class Study:
+    """
+    TPE study whose trials live in a SQLite file shared by all its workers.
+    """
+    
+    def __init__(
+        self,
+        storage: Union[str, Path],
+        study_name: str,
+        param_grid: Dict[str, Any],
+        **sampler_kwargs
+    ):
+        """
+        Open (or create) a study.
+        
+        Args:
+            storage: SQLite file path; reopening it resumes the study
+            study_name: Study name (several studies can share one file)
+            param_grid: Param grid, see space_from_param_grid
+            **sampler_kwargs: TPESampler options (n_startup_trials, gamma, seed, ...)
+        """
+        self.storage = str(storage)
+        self.study_name = study_name
+        self.space = space_from_param_grid(param_grid)
+        self.sampler = TPESampler(self.space, **sampler_kwargs)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        
+        with self._connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS studies (
+                name TEXT PRIMARY KEY, space TEXT NOT NULL, created TEXT)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS trials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, study TEXT NOT NULL, number INTEGER NOT NULL,
+                state TEXT NOT NULL, params TEXT NOT NULL, value REAL, info TEXT,
+                worker TEXT, started TEXT, finished TEXT, UNIQUE (study, number))""")
+            space_json = json.dumps(self.space, sort_keys=True, default=_to_python)
+            conn.execute("INSERT OR IGNORE INTO studies VALUES (?, ?, ?)",
+                         (study_name, space_json, datetime.now().isoformat()))
+            stored = conn.execute("SELECT space FROM studies WHERE name = ?",
+                                  (study_name,)).fetchone()[0]
+        if stored != space_json:
+            raise ValueError(f"Study '{study_name}' in {self.storage} has a different search space")
+    
+    @contextmanager
+    def _connect(self):
+        # Autocommit; WAL lets readers run while a worker writes
+        conn = sqlite3.connect(self.storage, timeout=60, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+    
+    def recover(self) -> int:
+        """
+        Mark trials left running by dead workers on this host as interrupted.
+        
+        Returns:
+            Number of recovered trials (they do not count toward the budget,
+            so their slots are sampled again)
+        """
+        host = socket.gethostname()
+        stale = []
+        with self._connect() as conn:
+            for trial_id, worker in conn.execute(
+                "SELECT id, worker FROM trials WHERE study = ? AND state = 'RUNNING'",
+                (self.study_name,)
+            ):
+                worker_host, pid = worker.rsplit(':', 1)
+                if worker_host == host and not _pid_alive(int(pid)):
+                    stale.append(trial_id)
+            conn.executemany("UPDATE trials SET state = 'INTERRUPTED', info = ? WHERE id = ?",
+                             [(json.dumps({'error': 'worker died'}), i) for i in stale])
+        if stale:
+            logger.info(f"Recovered {len(stale)} interrupted trials of '{self.study_name}'")
+        return len(stale)
+    
+    def ask(self, n_trials: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Reserve the next trial, or None once n_trials are complete, failed or running.
+        
+        Args:
+            n_trials: Budget of the whole study (all workers, all sessions)
+        
+        Returns:
+            (trial_id, params) or None
+        """
+        with self._connect() as conn:
+            # One writer at a time: sampling and reserving are atomic
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT state, params, value FROM trials "
+                    "WHERE study = ? AND state != 'INTERRUPTED'",
+                    (self.study_name,)
+                ).fetchall()
+                if len(rows) >= n_trials:
+                    conn.execute("COMMIT")
+                    return None
+                
+                history = [(json.loads(p), v) for s, p, v in rows if s == 'COMPLETE']
+                # Constant liar: running trials count as the worst result so far
+                worst = max((v for _, v in history), default=0.0)
+                history += [(json.loads(p), worst) for s, p, _ in rows if s == 'RUNNING']
+                
+                number = conn.execute("SELECT COUNT(*) FROM trials WHERE study = ?",
+                                      (self.study_name,)).fetchone()[0]
+                params = self.sampler.sample(history, number)
+                cursor = conn.execute(
+                    "INSERT INTO trials (study, number, state, params, worker, started) "
+                    "VALUES (?, ?, 'RUNNING', ?, ?, ?)",
+                    (self.study_name, number, json.dumps(params, default=_to_python),
+                     self.worker_id, datetime.now().isoformat())
+                )
+                conn.execute("COMMIT")
+                return cursor.lastrowid, params
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def tell(
+        self,
+        trial_id: int,
+        value: Optional[float],
+        info: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Record a finished trial (value None marks it failed).
+        
+        Args:
+            trial_id: Id from ask
+            value: Loss (lower is better)
+            info: Extra JSON-serialisable results
+        """
+        state = 'COMPLETE' if value is not None and np.isfinite(value) else 'FAILED'
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE trials SET state = ?, value = ?, info = ?, finished = ? WHERE id = ?",
+                (state, None if state == 'FAILED' else float(value),
+                 json.dumps(info or {}, default=_to_python), datetime.now().isoformat(), trial_id)
+            )
+    
+    def optimize(
+        self,
+        objective: Callable[[Dict[str, Any]], Union[float, Tuple[float, Dict]]],
+        n_trials: int
+    ) -> None:
+        """
+        Run trials in this process until the study has n_trials.
+        
+        Other processes may call optimize on the same storage and study at
+        the same time; they share the budget. A trial whose objective raises
+        is recorded as failed and uses up its slot of the budget.
+        
+        Args:
+            objective: params -> loss, or (loss, info)
+            n_trials: Budget of the whole study
+        
+        Raises:
+            RuntimeError: If the budget is used up and no trial completed
+        """
+        self.recover()
+        while True:
+            reserved = self.ask(n_trials)
+            if reserved is None:
+                break
+            trial_id, params = reserved
+            try:
+                result = objective(params)
+            except Exception as e:
+                logger.warning(f"Trial {trial_id} failed: {e}")
+                self.tell(trial_id, None, {'error': str(e)})
+                continue
+            value, info = result if isinstance(result, tuple) else (result, None)
+            self.tell(trial_id, value, info)
+        
+        with self._connect() as conn:
+            states = dict(conn.execute(
+                "SELECT state, COUNT(*) FROM trials WHERE study = ? GROUP BY state",
+                (self.study_name,)
+            ).fetchall())
+            last_error = conn.execute(
+                "SELECT info FROM trials WHERE study = ? AND state = 'FAILED' "
+                "ORDER BY id DESC LIMIT 1", (self.study_name,)
+            ).fetchone()
+        if not states.get('COMPLETE') and not states.get('RUNNING') and states.get('FAILED'):
+            error = json.loads(last_error[0] or '{}').get('error')
+            raise RuntimeError(f"All {states['FAILED']} trials of study '{self.study_name}' "
+                               f"failed; last error: {error}")
+    
+    def trials_dataframe(self) -> pd.DataFrame:
+        """All trials of the study, one row each, parameters expanded."""
+        with self._connect() as conn:
+            trials = pd.read_sql_query(
+                "SELECT number, state, params, value, info, worker, started, finished "
+                "FROM trials WHERE study = ? ORDER BY number", conn, params=(self.study_name,)
+            )
+        params = pd.DataFrame([json.loads(p) for p in trials['params']], index=trials.index)
+        trials['params'] = trials['params'].map(json.loads)
+        trials['info'] = trials['info'].map(lambda i: json.loads(i) if i else {})
+        return pd.concat([trials, params.add_prefix('param_')], axis=1)
+    
+    @property
+    def best_trial(self) -> pd.Series:
+        """Completed trial with the lowest loss."""
+        trials = self.trials_dataframe()
+        complete = trials[trials['state'] == 'COMPLETE']
+        if complete.empty:
+            raise ValueError(f"Study '{self.study_name}' has no completed trials")
+        return complete.loc[complete['value'].idxmin()]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# ============================================================================
+# SEARCH ESTIMATOR
+# ============================================================================
+
+def _cv_objective(
+    estimator: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    cv: Any,
+    scoring: str,
+    cache: Optional[Any] = None
+) -> Callable[[Dict[str, Any]], Tuple[float, Dict]]:
+    from sklearn.base import clone
+    from sklearn.model_selection import cross_val_score
+    
+    def objective(params: Dict[str, Any]) -> Tuple[float, Dict]:
+        if cache is not None:
+            scores = np.array([cache.score(estimator, params, i) for i in range(cache.n_splits)])
+        else:
+            model = clone(estimator).set_params(**params)
+            scores = cross_val_score(model, X, y, cv=cv, scoring=scoring)
+        return -float(np.mean(scores)), {'scores': scores.tolist()}
+    
+    return objective
+
+
+def _run_worker(
+    storage: str,
+    study_name: str,
+    param_grid: Dict[str, Any],
+    sampler_kwargs: Dict[str, Any],
+    estimator: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    cv: Any,
+    scoring: str,
+    n_trials: int,
+    cache: Optional[Any] = None
+) -> None:
+    """One asynchronous worker process of TPESearchCV."""
+    study = Study(storage, study_name, param_grid, **sampler_kwargs)
+    study.optimize(_cv_objective(estimator, X, y, cv, scoring, cache), n_trials)
+
+
+class TPESearchCV:
+    """
+    TPE hyperparameter search with the interface of RandomizedSearchCV.
+    
+    After fit, exposes best_params_, best_score_ (greater is better, as in
+    sklearn), best_estimator_ and cv_results_.
+    """
+    
+    def __init__(
+        self,
+        estimator: Any,
+        param_distributions: Dict[str, Any],
+        n_iter: int = 50,
+        cv: Any = None,
+        scoring: str = 'neg_root_mean_squared_error',
+        n_jobs: int = 1,
+        verbose: int = 0,
+        refit: bool = True,
+        storage: Optional[str] = None,
+        study_name: Optional[str] = None,
+        n_startup_trials: int = 10,
+        random_state: int = 42,
+        fold_cache: bool = False
+    ):
+        """
+        Initialize search.
+        
+        Args:
+            estimator: Base estimator
+            param_distributions: Param grid (lists and scipy distributions)
+            n_iter: Trial budget of the study, counting trials of earlier sessions
+            cv: Cross-validator
+            scoring: Scoring metric (greater is better)
+            n_jobs: Asynchronous worker processes
+            verbose: Verbosity level
+            refit: Refit the best parameters on the whole data
+            storage: SQLite file of the trials (None: temporary, not resumable)
+            study_name: Study name in storage (default: estimator class name)
+            n_startup_trials: Random trials before TPE takes over
+            random_state: Sampler seed
+            fold_cache: Score trials on a fold_cache.FoldCache (RMSE scoring),
+                built once and shared with the worker processes
+        """
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.refit = refit
+        self.storage = storage
+        self.study_name = study_name or type(estimator).__name__
+        self.sampler_kwargs = {'n_startup_trials': n_startup_trials, 'seed': random_state}
+        self.fold_cache = fold_cache
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'TPESearchCV':
+        """
+        Run (or resume) the study, then refit the best parameters.
+        
+        Args:
+            X: Training features
+            y: Training targets
+        
+        Returns:
+            Self
+        """
+        from joblib import Parallel, delayed, effective_n_jobs
+        from sklearn.base import clone
+        
+        temp_dir = None
+        cache = None
+        storage = self.storage
+        if storage is None:
+            temp_dir = tempfile.TemporaryDirectory()
+            storage = str(Path(temp_dir.name) / 'trials.db')
+        
+        try:
+            if self.fold_cache:
+                from fold_cache import FoldCache
+                cache = FoldCache(X, y, self.cv)
+            study = Study(storage, self.study_name, self.param_distributions,
+                          **self.sampler_kwargs)
+            n_workers = min(effective_n_jobs(self.n_jobs), self.n_iter)
+            if self.verbose:
+                logger.info(f"TPE study '{self.study_name}': {self.n_iter} trials, "
+                            f"{n_workers} workers, storage {storage}")
+            
+            if n_workers > 1:
+                args = (storage, self.study_name, self.param_distributions, self.sampler_kwargs,
+                        self.estimator, X, y, self.cv, self.scoring, self.n_iter, cache)
+                Parallel(n_jobs=n_workers)(delayed(_run_worker)(*args) for _ in range(n_workers))
+            else:
+                study.optimize(_cv_objective(self.estimator, X, y, self.cv, self.scoring, cache),
+                               self.n_iter)
+            
+            self.study_ = study
+            self.cv_results_ = self._cv_results(study.trials_dataframe())
+        finally:
+            if cache is not None:
+                cache.close()
+            if temp_dir is not None:
+                temp_dir.cleanup()
+        
+        best = int(np.argmax(np.nan_to_num(self.cv_results_['mean_test_score'], nan=-np.inf)))
+        self.best_index_ = best
+        self.best_params_ = self.cv_results_['params'][best]
+        self.best_score_ = self.cv_results_['mean_test_score'][best]
+        
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+            self.best_estimator_.fit(X, y)
+        return self
+    
+    def _cv_results(self, trials: pd.DataFrame) -> Dict[str, Any]:
+        """Completed trials in the cv_results_ layout of the sklearn searches."""
+        trials = trials[trials['state'] == 'COMPLETE'].reset_index(drop=True)
+        if trials.empty:
+            raise ValueError("No TPE trial completed")
+        
+        scores = np.array([info['scores'] for info in trials['info']])
+        mean = scores.mean(axis=1)
+        results = {
+            'params': list(trials['params']),
+            'mean_test_score': mean,
+            'std_test_score': scores.std(axis=1),
+            'rank_test_score': pd.Series(-mean).rank(method='min').astype(int).to_numpy(),
+            'trial_number': trials['number'].to_numpy()
+        }
+        for i in range(scores.shape[1]):
+            results[f'split{i}_test_score'] = scores[:, i]
+        for name in self.param_distributions:
+            results[f'param_{name}'] = trials[f'param_{name}'].to_numpy()
+        return results
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict with the refitted best estimator."""
+        return self.best_estimator_.predict(X)
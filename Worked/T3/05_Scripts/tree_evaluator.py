@@ -0,0 +1,334 @@
+"""
+Flat Tree Evaluator for Bangkok Traffic Flow Optimization Project
+
+RandomForestRegressor.predict and XGBRegressor.predict carry a fixed
+per-call overhead (input validation, thread pools, DMatrix construction)
+that dominates single-row and small-batch requests. This module exports a
+trained tree ensemble into flat node arrays and evaluates all trees at once
+in NumPy:
+
+- every node of every tree lives in one set of arrays: feature, threshold,
+  left, right, value and default_left (direction for missing values)
+- leaves point to themselves, so all trees can be advanced level by level
+  for max_depth steps with a handful of vectorised gathers, without
+  tracking which rows have already reached a leaf
+
+Predictions match the native ones exactly: split comparisons use the same
+precision and operator as each library (sklearn: float32 input, x <=
+threshold; XGBoost: float32, x < split) and leaf values are accumulated in
+the same order and dtype.
+
+Author: Data Science Team
+Date: November 2025
+"""
+
+import json
+import numpy as np
+import logging
+from typing import Any, Dict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FLAT_TREE_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'default_left', 'roots')
+
+
+# ============================================================================
+# FLAT TREE ENSEMBLE
+# ============================================================================
+
+class FlatTreeEnsemble:
+    """
+    Tree ensemble stored as flat node arrays with a vectorised predict.
+    
+    Build one with export_trees(model) (or from_sklearn / from_xgboost).
+    """
+    
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        max_depth: int,
+        n_features: int,
+        base_score: float = 0.0,
+        aggregation: str = 'mean',
+        strict: bool = False
+    ):
+        """
+        Initialize from exported arrays.
+        
+        Args:
+            arrays: Node arrays named as in FLAT_TREE_ARRAYS; roots holds the
+                position of each tree's root node. The derived 'children'
+                array is built when absent
+            max_depth: Deepest root-to-leaf path over all trees
+            n_features: Number of model input columns
+            base_score: Value added to the tree total (XGBoost base margin)
+            aggregation: 'mean' (random forest) or 'sum' (gradient boosting)
+            strict: Split rule x < threshold (XGBoost) instead of x <= threshold
+        """
+        missing = set(FLAT_TREE_ARRAYS) - set(arrays)
+        if missing:
+            raise ValueError(f"Missing tree arrays: {sorted(missing)}")
+        if aggregation not in ('mean', 'sum'):
+            raise ValueError(f"Unknown aggregation '{aggregation}'. Use 'mean' or 'sum'")
+        
+        self.arrays = arrays
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.base_score = base_score
+        self.aggregation = aggregation
+        self.strict = strict
+        # Children interleaved as [right, left], so a boolean picks the branch
+        if 'children' not in arrays:
+            arrays['children'] = np.stack([arrays['right'], arrays['left']], axis=1).ravel().astype(np.int64)
+    
+    @property
+    def n_trees(self) -> int:
+        return len(self.arrays['roots'])
+    
+    @property
+    def n_nodes(self) -> int:
+        return len(self.arrays['feature'])
+    
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def from_sklearn(cls, model: Any) -> 'FlatTreeEnsemble':
+        """Export a fitted RandomForestRegressor / ExtraTreesRegressor."""
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Only single-output tree ensembles are supported")
+        
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.r_[0, np.cumsum(sizes)[:-1]]
+        parts = {name: [] for name in FLAT_TREE_ARRAYS if name != 'roots'}
+        for tree, offset in zip(trees, offsets):
+            is_leaf = tree.children_left == -1
+            own = np.arange(tree.node_count) + offset
+            parts['feature'].append(np.where(is_leaf, 0, tree.feature))
+            parts['threshold'].append(np.where(is_leaf, 0.0, tree.threshold))
+            parts['left'].append(np.where(is_leaf, own, tree.children_left + offset))
+            parts['right'].append(np.where(is_leaf, own, tree.children_right + offset))
+            parts['value'].append(tree.value[:, 0, 0])
+            missing_left = getattr(tree, 'missing_go_to_left', None)
+            parts['default_left'].append(
+                np.zeros(tree.node_count, dtype=bool) if missing_left is None else missing_left.astype(bool)
+            )
+        
+        arrays = _pack(parts, offsets, value_dtype=np.float64, threshold_dtype=np.float64)
+        return cls(arrays, max(tree.max_depth for tree in trees), model.n_features_in_,
+                   base_score=0.0, aggregation='mean', strict=False)
+    
+    @classmethod
+    def from_xgboost(cls, model: Any) -> 'FlatTreeEnsemble':
+        """Export a fitted XGBRegressor (or Booster) with a gbtree booster."""
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+        
+        objective = learner['objective']['name']
+        if objective not in ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror'):
+            raise ValueError(f"Unsupported XGBoost objective '{objective}' (identity link only)")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError("Only the gbtree booster is supported")
+        
+        trees = learner['gradient_booster']['model']['trees']
+        n_rounds = _xgboost_rounds(model, len(trees))
+        trees = trees[:n_rounds]
+        
+        sizes = np.array([len(tree['left_children']) for tree in trees])
+        offsets = np.r_[0, np.cumsum(sizes)[:-1]]
+        parts = {name: [] for name in FLAT_TREE_ARRAYS if name != 'roots'}
+        depth = 0
+        for tree, offset in zip(trees, offsets):
+            left = np.array(tree['left_children'], dtype=np.int64)
+            right = np.array(tree['right_children'], dtype=np.int64)
+            split = np.array(tree['split_conditions'], dtype=np.float32)
+            is_leaf = left == -1
+            own = np.arange(len(left)) + offset
+            parts['feature'].append(np.where(is_leaf, 0, np.array(tree['split_indices'])))
+            parts['threshold'].append(np.where(is_leaf, np.float32(0), split))
+            parts['left'].append(np.where(is_leaf, own, left + offset))
+            parts['right'].append(np.where(is_leaf, own, right + offset))
+            # Leaf values are stored in split_conditions
+            parts['value'].append(np.where(is_leaf, split, np.float32(0)))
+            parts['default_left'].append(np.array(tree['default_left'], dtype=bool))
+            depth = max(depth, _tree_depth(left, right))
+        
+        arrays = _pack(parts, offsets, value_dtype=np.float32, threshold_dtype=np.float32)
+        base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+        return cls(arrays, depth, int(learner['learner_model_param']['num_feature']),
+                   base_score=base_score, aggregation='sum', strict=True)
+    
+    # ------------------------------------------------------------------
+    # Predict
+    # ------------------------------------------------------------------
+    
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf node reached in every tree.
+        
+        Args:
+            X: Features of shape (n_samples, n_features)
+        
+        Returns:
+            Array of shape (n_samples, n_trees) with global node positions
+        """
+        a = self.arrays
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if self.aggregation == 'mean':
+            X = X.astype(np.float64)    # sklearn compares float32 input to float64 thresholds
+        
+        children = a['children']
+        flat_X = X.ravel()
+        row_base = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+        has_nan = np.isnan(X).any()
+        
+        node = np.broadcast_to(a['roots'], (len(X), self.n_trees)).astype(np.int64)
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_base + a['feature'].take(node))
+            threshold = a['threshold'].take(node)
+            go_left = x < threshold if self.strict else x <= threshold
+            if has_nan:
+                go_left |= np.isnan(x) & a['default_left'].take(node)
+            node = children.take(2 * node + go_left)
+        return node
+    
+    def predict(self, X: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """
+        Predict with the exported ensemble.
+        
+        Args:
+            X: Features of shape (n_samples, n_features)
+            chunk_size: Rows evaluated together (bounds the n_rows x n_trees work arrays)
+        
+        Returns:
+            Predictions (float64 for sklearn, float32 for XGBoost, as natively)
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.empty(len(X), dtype=self.arrays['value'].dtype)
+        for start in range(0, len(X), chunk_size):
+            values = self.arrays['value'][self.leaves(X[start:start + chunk_size])]
+            if self.aggregation == 'mean':
+                # sklearn adds the trees one by one, then divides
+                out[start:start + chunk_size] = np.cumsum(values, axis=1)[:, -1] / self.n_trees
+            else:
+                # XGBoost accumulates in float32, starting from the base margin
+                base = np.full((len(values), 1), self.base_score, dtype=np.float32)
+                out[start:start + chunk_size] = np.cumsum(np.hstack([base, values]), axis=1)[:, -1]
+        return out
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Scalar settings needed to rebuild the ensemble from its arrays."""
+        return {'max_depth': self.max_depth, 'n_features': self.n_features,
+                'base_score': self.base_score, 'aggregation': self.aggregation,
+                'strict': self.strict}
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> 'FlatTreeEnsemble':
+        """Rebuild from arrays and metadata, e.g. memory-mapped from a saved artifact."""
+        return cls(dict(arrays), **metadata)
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _pack(parts: Dict[str, list], offsets: np.ndarray, value_dtype, threshold_dtype) -> Dict[str, np.ndarray]:
+    """Concatenate per-tree arrays into compact global arrays."""
+    n_nodes = sum(len(part) for part in parts['feature'])
+    index_dtype = np.int32 if n_nodes < 2 ** 31 else np.int64
+    return {
+        'feature': np.concatenate(parts['feature']).astype(np.int32),
+        'threshold': np.concatenate(parts['threshold']).astype(threshold_dtype),
+        'left': np.concatenate(parts['left']).astype(index_dtype),
+        'right': np.concatenate(parts['right']).astype(index_dtype),
+        'value': np.concatenate(parts['value']).astype(value_dtype),
+        'default_left': np.concatenate(parts['default_left']).astype(bool),
+        'roots': np.asarray(offsets, dtype=index_dtype)
+    }
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Depth of a tree given child arrays (-1 for leaves), root at 0."""
+    depth = np.zeros(len(left), dtype=np.int64)
+    # XGBoost stores children after their parents
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def _xgboost_rounds(model: Any, n_trees: int) -> int:
+    """Trees XGBRegressor.predict uses: up to best_iteration after early stopping."""
+    try:
+        return min(n_trees, int(model.best_iteration) + 1)
+    except (AttributeError, TypeError, ValueError):
+        return n_trees
+
+
+def export_trees(model: Any) -> FlatTreeEnsemble:
+    """
+    Export a fitted tree ensemble to flat arrays.
+    
+    Args:
+        model: RandomForestRegressor / ExtraTreesRegressor or XGBRegressor
+    
+    Returns:
+        FlatTreeEnsemble with predictions identical to model.predict
+    """
+    if isinstance(model, FlatTreeEnsemble):
+        return model
+    if isinstance(getattr(model, 'flat', None), FlatTreeEnsemble):
+        # Opened mmap artifact (model_utils.MappedTreeModel)
+        return model.flat
+    if hasattr(model, 'get_booster'):
+        return FlatTreeEnsemble.from_xgboost(model)
+    if hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        return FlatTreeEnsemble.from_sklearn(model)
+    raise ValueError(f"Cannot export {type(model).__name__}: not a supported tree ensemble")
+
+
+def load_flat_model(filepath: str) -> FlatTreeEnsemble:
+    """
+    Load a pickled model (as saved in Trained_Models) and export its trees.
+    
+    Args:
+        filepath: Path to the .pkl file
+    
+    Returns:
+        FlatTreeEnsemble
+    """
+    from model_utils import load_model
+    
+    flat = export_trees(load_model(filepath))
+    logger.info(f"Exported {flat.n_trees} trees ({flat.n_nodes} nodes, depth {flat.max_depth}) "
+                f"from {filepath}")
+    return flat
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == "__main__":
+    logger.info("Tree evaluator module loaded successfully")
+    
+    # Example usage
+    print("""
+    Example Usage:
+    --------------
+    from tree_evaluator import load_flat_model
+    
+    flat = load_flat_model('../02_Model_Development/Trained_Models/random_forest_model.pkl')
+    predictions = flat.predict(X)    # identical to model.predict(X)
+    """)